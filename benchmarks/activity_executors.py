@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Compare the activity executors on a CPU-bound sync activity.
+
+Sync activities are dispatched by the SDK with `loop.run_in_executor`, this
+benchmark does the same with the executors built by `WorkerFactory`, so it runs
+without a Temporal server:
+
+    python benchmarks/activity_executors.py --tasks 64 --size 300000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import time
+
+from temporalloop.config import Config, WorkerConfig
+from temporalloop.worker import WorkerFactory
+
+
+def cpu_bound(size: int) -> str:
+    digest = b""
+    for i in range(size):
+        digest = hashlib.sha256(digest + i.to_bytes(8, "little")).digest()
+    return digest.hex()
+
+
+async def run(kind: str, tasks: int, size: int, workers: int) -> float:
+    config = Config(config_logging=False)
+    worker_config = WorkerConfig(
+        name=kind, activity_executor=kind, activity_executor_workers=workers, max_concurrent_activities=tasks
+    )
+    worker_config.load(config)
+    executor = WorkerFactory(config).activity_executor(worker_config)
+    loop = asyncio.get_running_loop()
+    try:
+        # warm up the pool, process workers are started lazily
+        await asyncio.gather(*[loop.run_in_executor(executor, cpu_bound, 1) for _ in range(workers or 1)])
+        start = time.perf_counter()
+        await asyncio.gather(*[loop.run_in_executor(executor, cpu_bound, size) for _ in range(tasks)])
+        return time.perf_counter() - start
+    finally:
+        executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=32, help="number of activities")
+    parser.add_argument("--size", type=int, default=200_000, help="hash iterations per activity")
+    parser.add_argument("--workers", type=int, default=0, help="pool size, 0 uses the executor default")
+    parser.add_argument("--executors", nargs="+", default=["thread", "process"])
+    args = parser.parse_args()
+
+    print(f"{'executor':<40} {'total (s)':>10} {'activities/s':>14}")
+    for kind in args.executors:
+        elapsed = asyncio.run(run(kind, args.tasks, args.size, args.workers))
+        print(f"{kind:<40} {elapsed:>10.3f} {args.tasks / elapsed:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Payload size and encode/decode throughput of JSON vs msgpack for models.
+
+Runs without a Temporal server, requires msgpack:
+
+    python benchmarks/binary_encoding.py --points 10000
+"""
+
+import argparse
+import asyncio
+import datetime
+import time
+
+from pydantic import BaseModel
+from temporalio.converter import DataConverter
+from temporalloop.converters.pydantic import pydantic_data_converter, pydantic_msgpack_data_converter
+
+
+class Series(BaseModel):
+    name: str
+    start: datetime.datetime
+    timestamps: list[int]
+    values: list[float]
+    labels: dict[str, str]
+
+
+def series(points: int) -> Series:
+    return Series(
+        name="cpu.usage",
+        start=datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+        timestamps=[1_700_000_000 + i * 15 for i in range(points)],
+        values=[(i % 1000) / 7 for i in range(points)],
+        labels={"host": "worker-1", "region": "eu-west-1"},
+    )
+
+
+async def bench(converter: DataConverter, value: Series, iterations: int) -> tuple[int, float, float]:
+    payloads = await converter.encode([value])
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await converter.encode([value])
+    encode = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await converter.decode(payloads, [Series])
+    decode = time.perf_counter() - start
+    return len(payloads[0].data), iterations / encode, iterations / decode
+
+
+async def run(args: argparse.Namespace) -> None:
+    print(f"{'points':>8} {'encoding':<10} {'bytes':>10} {'encode/s':>10} {'decode/s':>10}")
+    for points in (10, args.points // 10, args.points):
+        value = series(points)
+        iterations = max(args.iterations * 10 // points, 5)
+        for name, converter in (("json", pydantic_data_converter), ("msgpack", pydantic_msgpack_data_converter)):
+            size, encode, decode = await bench(converter, value, iterations)
+            print(f"{points:>8} {name:<10} {size:>10} {encode:>10.0f} {decode:>10.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=1000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
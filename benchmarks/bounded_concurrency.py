@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Peak memory of gather_with_concurrency vs map_with_concurrency.
+
+`gather_with_concurrency` needs every coroutine created up front and keeps all
+the results; `map_with_concurrency` pulls the items from a generator and keeps
+at most `n` in flight, its peak memory stays flat as the input grows. Runs
+without a Temporal server:
+
+    python benchmarks/bounded_concurrency.py --sizes 10000 100000 500000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from temporalloop.utils import gather_with_concurrency, map_with_concurrency
+
+
+async def work(item: int) -> int:
+    await asyncio.sleep(0)
+    return item * 2
+
+
+async def run_gather(size: int, concurrency: int) -> int:
+    results = await gather_with_concurrency(concurrency, *(work(i) for i in range(size)))
+    return sum(results)
+
+
+async def run_map(size: int, concurrency: int) -> int:
+    total = 0
+    async for result in map_with_concurrency(work, range(size), concurrency, ordered=False):
+        total += result  # type: ignore[operator]
+    return total
+
+
+def measure(fn, size: int, concurrency: int) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    asyncio.run(fn(size, concurrency))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'items':>8}  {'runner':<22}  {'seconds':>8}  {'peak MiB':>9}")
+    for size in args.sizes:
+        for name, fn in (("gather_with_concurrency", run_gather), ("map_with_concurrency", run_map)):
+            elapsed, peak = measure(fn, size, args.concurrency)
+            print(f"{size:>8}  {name:<22}  {elapsed:>8.2f}  {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Cost of the codec thread hop, and event loop stalls with and without it.
+
+For each payload size, encodes payloads with the compression codec inline and
+offloaded to the codec thread pool, while a ticker task measures the event
+loop lag. Runs without a Temporal server:
+
+    python benchmarks/codec_offload.py --iterations 200
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from temporalio.api.common.v1 import Payload
+from temporalloop.converters.compression import CompressionCodec
+
+
+async def ticker(stop: asyncio.Event, lags: list[float], interval: float = 0.001) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def measure(codec: CompressionCodec, payload: Payload, iterations: int, concurrency: int) -> tuple[float, float]:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    tick = asyncio.create_task(ticker(stop, lags))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await asyncio.gather(*[codec.encode([payload]) for _ in range(concurrency)])
+    per_payload = (time.perf_counter() - start) / (iterations * concurrency)
+    stop.set()
+    await tick
+    return per_payload * 1e6, max(lags) * 1000
+
+
+async def run(args: argparse.Namespace) -> None:
+    print(f"{'size':>10} {'mode':<8} {'us/payload':>12} {'max loop lag (ms)':>18}")
+    for size in (1024, 64 * 1024, 1024 * 1024, 8 * 1024 * 1024):
+        # half random, half repeated: compressible but not trivially
+        data = os.urandom(size // 2) + b"a" * (size // 2)
+        payload = Payload(metadata={"encoding": b"binary/plain"}, data=data)
+        iterations = max(args.iterations * 1024 // size, 3)
+        for mode, offload_threshold in (("inline", None), ("offload", 0)):
+            codec = CompressionCodec("zlib", threshold=0, level=1, offload_threshold=offload_threshold)
+            per_payload, lag = await measure(codec, payload, iterations, args.concurrency)
+            print(f"{size:>10} {mode:<8} {per_payload:>12.1f} {lag:>18.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
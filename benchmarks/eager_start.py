@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Start-to-first-activity latency with and without eager dispatch.
+
+Runs a worker in this process and starts workflows executing a single
+activity, once with eager workflow start and eager activity execution, once
+with both disabled. Requires a Temporal server:
+
+    temporal server start-dev &
+    python benchmarks/eager_start.py --host localhost:7233 --iterations 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from temporalio import activity, workflow
+
+with workflow.unsafe.imports_passed_through():
+    from temporalloop.client import CLIENT_POOL, start_workflow
+    from temporalloop.config import Config, WorkerConfig
+
+
+@activity.defn
+async def first_activity() -> int:
+    return time.time_ns()
+
+
+@workflow.defn
+class EagerBenchWorkflow:
+    @workflow.run
+    async def run(self) -> int:
+        return await workflow.execute_activity(first_activity, start_to_close_timeout=timedelta(seconds=10))
+
+
+async def measure(host: str, namespace: str, iterations: int, eager: bool) -> list[float]:
+    queue = f"eager-bench-{uuid.uuid4()}"
+    config = Config(host=host, namespace=namespace, config_logging=False)
+    worker_config = WorkerConfig(
+        name="eager-bench",
+        queue=queue,
+        workflows=[EagerBenchWorkflow],
+        activities=[first_activity],
+        disable_eager_activity_execution=not eager,
+    )
+    worker_config.load(config)
+    worker = await worker_config.factory(config).new_worker(worker_config)
+    latencies = []
+    async with worker:
+        client = await CLIENT_POOL.get(host, namespace)
+        for _ in range(iterations):
+            start = time.time_ns()
+            handle = await start_workflow(
+                client, EagerBenchWorkflow.run, id=f"eager-bench-{uuid.uuid4()}", task_queue=queue, eager=eager
+            )
+            activity_started = await handle.result()
+            latencies.append((activity_started - start) / 1e6)
+    return latencies
+
+
+async def run(args: argparse.Namespace) -> None:
+    print(f"{'mode':<10} {'p50 (ms)':>10} {'p90 (ms)':>10} {'mean (ms)':>10}")
+    for eager in (False, True):
+        latencies = await measure(args.host, args.namespace, args.iterations, eager)
+        deciles = statistics.quantiles(latencies, n=10)
+        print(
+            f"{'eager' if eager else 'no-eager':<10} {statistics.median(latencies):>10.2f}"
+            f" {deciles[8]:>10.2f} {statistics.mean(latencies):>10.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost:7233")
+    parser.add_argument("--namespace", default="default")
+    parser.add_argument("--iterations", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
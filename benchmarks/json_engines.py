@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Encode/decode throughput of the JSON engines of the pydantic converter.
+
+Runs without a Temporal server and checks that every engine writes the same
+bytes as the stdlib one:
+
+    python benchmarks/json_engines.py --iterations 2000
+"""
+
+import argparse
+import datetime
+import time
+import uuid
+from typing import Any
+
+from temporalloop.converters.jsonengine import JSON_ENGINES, JSONEngine
+
+
+def payload(items: int) -> dict[str, Any]:
+    now = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+    return {
+        "id": str(uuid.UUID(int=items)),
+        "created_at": now.isoformat(),
+        "items": [
+            {
+                "sku": f"sku-{i}",
+                "name": f"item é {i}",
+                "price": i * 1.25,
+                "quantity": i % 7,
+                "tags": ["a", "b", "c"][: i % 4],
+                "meta": {"position": i, "enabled": i % 2 == 0, "note": None},
+            }
+            for i in range(items)
+        ],
+    }
+
+
+SIZES = {"small": 1, "medium": 50, "large": 5000}
+
+
+def bench(engine: JSONEngine, value: Any, iterations: int) -> tuple[float, float]:
+    data = engine.dumps(value)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        engine.dumps(value)
+    encode = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(iterations):
+        engine.loads(data)
+    decode = time.perf_counter() - start
+    return encode / iterations * 1e6, decode / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+    engines = []
+    for name, engine_class in JSON_ENGINES.items():
+        try:
+            engines.append(engine_class())
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+    reference = JSON_ENGINES["json"]()
+    print(f"{'payload':<8} {'bytes':>8} {'engine':<8} {'encode (us)':>12} {'decode (us)':>12} {'identical':>10}")
+    for size, items in SIZES.items():
+        value = payload(items)
+        expected = reference.dumps(value)
+        # large payloads are expensive, keep the total time comparable
+        iterations = max(args.iterations // items, 10)
+        for engine in engines:
+            encode, decode = bench(engine, value, iterations)
+            identical = engine.dumps(value) == expected
+            print(f"{size:<8} {len(expected):>8} {engine.name:<8} {encode:>12.1f} {decode:>12.1f} {identical!s:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,53 @@
-from temporalio.client import Client
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, cast
 
+from temporalio.client import Client, WorkflowHandle
+from temporalio.converter import DataConverter
+from temporalio.runtime import Runtime
+
+from temporalloop.converters.codecs import CODEC_CONVERTERS
 from temporalloop.converters.pydantic import pydantic_data_converter
+from temporalloop.importer import cached_import_from_string
+
+logger = logging.getLogger("temporalloop.info")
 
 TEMPORAL_CLIENT: Client | None = None
 
+ClientKey = tuple[str, str, int, int, int]
+
+
+def client_converter(
+    converter: DataConverter | str | None = None, codec: dict[str, Any] | None = None
+) -> DataConverter:
+    """Data converter of the clients: the worker converter (pydantic by default) with
+    the same codec settings, so that payloads are readable on both sides"""
+    if isinstance(converter, str):
+        converter = cached_import_from_string(converter)
+    return cast(DataConverter, CODEC_CONVERTERS.get(converter or pydantic_data_converter, codec))
 
-async def tclient(host: str, namespace: str) -> Client:
-    return await GTClient(host, namespace).client()
+
+async def tclient(
+    host: str, namespace: str, *, converter: DataConverter | str | None = None, codec: dict[str, Any] | None = None
+) -> Client:
+    return await GTClient(host, namespace, converter=converter, codec=codec).client()
 
 
 class TClient:
-    def __init__(self, host: str, namespace: str) -> None:
+    def __init__(
+        self,
+        host: str,
+        namespace: str,
+        *,
+        converter: DataConverter | str | None = None,
+        codec: dict[str, Any] | None = None,
+    ) -> None:
         self.host = host
         self.namespace = namespace
+        self.converter = converter
+        self.codec = codec
         self._client = None
 
     def set_client(self, client: Client) -> None:
@@ -24,16 +59,150 @@ class TClient:
                 self.host,
                 namespace=self.namespace,
                 lazy=True,
-                data_converter=pydantic_data_converter,
+                data_converter=client_converter(self.converter, self.codec),
             )
         return self._client
 
 
 class GTClient(TClient):
-    def __new__(cls, host: str, namespace: str):
+    def __new__(
+        cls,
+        host: str,
+        namespace: str,
+        *,
+        converter: DataConverter | str | None = None,
+        codec: dict[str, Any] | None = None,
+    ):
         if not hasattr(cls, "instance") or cls.instance is None:
-            cls.instance = TClient(host, namespace)
+            cls.instance = TClient(host, namespace, converter=converter, codec=codec)
         return cls.instance
 
     def reinit(self) -> None:
         self.instance = None
+
+
+class ClientPool:
+    """Process-wide pool of connected clients.
+
+    Clients are deduplicated by (host, namespace, data converter, runtime): workers
+    sharing those settings share one gRPC connection. With `channels > 1`, up to
+    `channels` connections are opened for a key and handed out round-robin.
+    Concurrent requests for the same connection wait on a single connect.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[ClientKey, asyncio.Future[Client]] = {}
+        self._counters: dict[tuple[str, str, int, int], itertools.count] = {}
+        # keep a reference on the converters/runtimes, their id() is part of the key
+        self._refs: dict[int, Any] = {}
+        self.connect_latencies: dict[ClientKey, float] = {}
+
+    def _key(
+        self, host: str, namespace: str, data_converter: DataConverter | None, runtime: Runtime | None, channels: int
+    ) -> ClientKey:
+        base = (host, namespace, id(data_converter), id(runtime))
+        self._refs[id(data_converter)] = data_converter
+        self._refs[id(runtime)] = runtime
+        counter = self._counters.setdefault(base, itertools.count())
+        return (*base, next(counter) % max(channels, 1))
+
+    async def get(
+        self,
+        host: str,
+        namespace: str,
+        *,
+        data_converter: DataConverter | None = None,
+        runtime: Runtime | None = None,
+        channels: int = 1,
+    ) -> Client:
+        key = self._key(host, namespace, data_converter, runtime, channels)
+        future = self._clients.get(key)
+        if future is None or (future.done() and future.exception() is not None):
+            future = asyncio.ensure_future(self._connect(key, host, namespace, data_converter, runtime))
+            self._clients[key] = future
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            if self._clients.get(key) is future:
+                del self._clients[key]
+            raise
+
+    async def _connect(
+        self,
+        key: ClientKey,
+        host: str,
+        namespace: str,
+        data_converter: DataConverter | None,
+        runtime: Runtime | None,
+    ) -> Client:
+        kwargs: dict[str, Any] = {"namespace": namespace}
+        if runtime is not None:
+            kwargs["runtime"] = runtime
+        if data_converter is not None:
+            kwargs["data_converter"] = data_converter
+        start = time.perf_counter()
+        client = await Client.connect(host, **kwargs)
+        latency = time.perf_counter() - start
+        self.connect_latencies[key] = latency
+        logger.info("[Client][connect][%s][namespace:%s][channel:%s] %.3fs", host, namespace, key[-1], latency)
+        (runtime or Runtime.default()).metric_meter.create_histogram_float(
+            "temporalloop_client_connect_latency", "Time to connect a client to the Temporal frontend", "ms"
+        ).record(latency * 1000, {"namespace": namespace})
+        return client
+
+    def clear(self) -> None:
+        self._clients.clear()
+        self._counters.clear()
+        self._refs.clear()
+        self.connect_latencies.clear()
+
+
+CLIENT_POOL = ClientPool()
+
+
+class LocalWorkers:
+    """Task queues polled by the workers of this process, with the client they use"""
+
+    def __init__(self) -> None:
+        self._clients: dict[tuple[str, str], Client] = {}
+
+    def register(self, client: Client, task_queue: str) -> None:
+        self._clients[(client.namespace, task_queue)] = client
+
+    def unregister(self, client: Client, task_queue: str) -> None:
+        if self._clients.get((client.namespace, task_queue)) is client:
+            del self._clients[(client.namespace, task_queue)]
+
+    def client_for(self, namespace: str, task_queue: str) -> Client | None:
+        return self._clients.get((namespace, task_queue))
+
+
+LOCAL_WORKERS = LocalWorkers()
+
+
+async def start_workflow(
+    client: Client,
+    workflow: Any,
+    *args: Any,
+    id: str,  # pylint: disable=redefined-builtin
+    task_queue: str,
+    eager: bool = True,
+    **kwargs: Any,
+) -> WorkflowHandle[Any, Any]:
+    """Start a workflow, eagerly when a worker of this process polls `task_queue`.
+
+    With eager start the server returns the first workflow task in the start
+    response, saving the poll round-trip. The workflow must then be started
+    through the client of the local worker.
+    """
+    local_client = LOCAL_WORKERS.client_for(client.namespace, task_queue) if eager else None
+    if local_client is not None:
+        client = local_client
+    return await client.start_workflow(
+        workflow,
+        args=list(args),
+        id=id,
+        task_queue=task_queue,
+        request_eager_start=local_client is not None,
+        **kwargs,
+    )
@@ -8,6 +8,8 @@ import click
 import temporalloop
 from temporalloop.config import LOG_LEVELS, LOGGING_CONFIG, Config, WorkerConfig
 from temporalloop.config_loader import load_config_from_yaml
+from temporalloop.profiling import STARTUP_PROFILER
+from temporalloop.supervisor import Supervisor
 from temporalloop.worker import Looper
 
 LEVEL_CHOICES = click.Choice(list(LOG_LEVELS.keys()))
@@ -32,6 +34,13 @@ def print_version(ctx: click.Context, param: click.Parameter, value: bool) -> No
 
 
 def run(config: Config) -> None:
+    if config.profile_startup:
+        STARTUP_PROFILER.enable()
+    if not config.loaded:
+        config.load()
+    if config.max_processes > 1:
+        Supervisor(config=config).run()
+        return
     looper = Looper(config=config)
     asyncio.run(looper.run())
 
@@ -93,6 +102,25 @@ def run(config: Config) -> None:
     multiple=True,
     help="Interceptor class to add, python.module:InterceptorClass. repeat the option -i to add more interceptors",
 )
+@click.option(
+    "--processes",
+    "-p",
+    type=int,
+    default=None,
+    help="Number of worker processes to fork, workers can override it with `processes`. [default: 1]",
+)
+@click.option(
+    "--profile-startup",
+    is_flag=True,
+    default=False,
+    help="Report the time spent per import, pre_init hook, client connect and worker construction.",
+)
+@click.option(
+    "--parallel-imports",
+    is_flag=True,
+    default=False,
+    help="Import the activities and workflows modules concurrently.",
+)
 @click.option(
     "--log-config",
     type=click.Path(exists=True),
@@ -132,6 +160,9 @@ def main(
     activity: list[str],
     workflow: list[str],
     interceptor: list[str],
+    processes: int | None,
+    profile_startup: bool,
+    parallel_imports: bool,
 ) -> None:
     if config:
         _config = load_config_from_yaml(config)
@@ -145,6 +176,8 @@ def main(
             _config.log_config = log_config
         if use_colors is not None:
             _config.use_colors = use_colors
+        if processes:
+            _config.processes = processes
     else:
         worker_config = WorkerConfig(
             name="default-worker",
@@ -160,7 +193,12 @@ def main(
             use_colors=use_colors,
             log_config=LOGGING_CONFIG if log_config is None else log_config,
             log_level=log_level,
+            processes=processes or 1,
         )
+    if profile_startup:
+        _config.profile_startup = True
+    if parallel_imports:
+        _config.parallel_imports = True
     run(_config)
 
 
@@ -1,21 +1,73 @@
 #!/usr/bin/env python3
 import asyncio
+import sys
 
 import click
 import yaml
+from temporalio.client import Client
+from temporalio.service import RPCError
 
+from temporalloop import schedule_forecast
 from temporalloop.client import tclient
 from temporalloop.config import Config
 from temporalloop.config_loader import TemporalScheduleSchema, load_config_from_yaml
-from temporalloop.schedule import TemporalScheduler
+from temporalloop.runtime import metrics_runtime
+from temporalloop.schedule import SchedulePlan, TemporalScheduler
+from temporalloop.schedule_watch import ScheduleWatcher
+from temporalloop.utils import time_interval
+from temporalloop.worker import HANDLED_SIGNALS
 
 
-async def run(config: Config):
-    client = await tclient(config.host, config.namespace)
-    sched = TemporalScheduler(client, config.schedules)
+async def connect(config: Config) -> Client:
+    """Connect now: the client is lazy, a wrong host would only fail on the first RPC"""
+    try:
+        client = await tclient(config.host, config.namespace, converter=config.converter, codec=config.codec)
+        await client.service_client.check_health()
+    except RPCError as exc:
+        raise click.ClickException(f"Failed to connect to {config.host}: {exc.status.name} {exc}") from exc
+    except (RuntimeError, ValueError) as exc:
+        raise click.ClickException(f"Failed to connect to {config.host}: {exc}") from exc
+    return client
+
+
+async def run(config: Config, concurrency: int = 10, rate_limit: float = 0, max_attempts: int = 5) -> SchedulePlan:
+    client = await connect(config)
+    sched = TemporalScheduler(
+        client, config.schedules, concurrency=concurrency, rate_limit=rate_limit, max_attempts=max_attempts
+    )
     return await sched.sync_schedules()
 
 
+# pylint: disable=too-many-arguments
+async def watch_schedules(
+    config: Config,
+    path: str,
+    *,
+    poll_interval: float,
+    resync_interval: float,
+    metric_bind_address: str | None,
+    **scheduler_kwargs,
+) -> None:
+    client = await connect(config)
+    meter = metrics_runtime(config, metric_bind_address).metric_meter if metric_bind_address else None
+    watcher = ScheduleWatcher(
+        client,
+        path,
+        poll_interval=poll_interval,
+        resync_interval=resync_interval,
+        metric_meter=meter,
+        **scheduler_kwargs,
+    )
+    loop = asyncio.get_running_loop()
+    for sig in HANDLED_SIGNALS:
+        loop.add_signal_handler(sig, watcher.stop)
+    try:
+        await watcher.run()
+    finally:
+        for sig in HANDLED_SIGNALS:
+            loop.remove_signal_handler(sig)
+
+
 # pylint: disable=no-value-for-parameter
 # pylint: disable=too-many-arguments
 @click.command(context_settings={"auto_envvar_prefix": "TEMPORALRUNNER"})
@@ -49,11 +101,89 @@ async def run(config: Config):
     default=None,
     help="Yaml file with the schedules ",
 )
+@click.option(
+    "--concurrency",
+    type=int,
+    default=10,
+    help="Maximum number of schedule operations running at once",
+    show_default=True,
+)
+@click.option(
+    "--rate-limit",
+    type=float,
+    default=0,
+    help="Maximum number of RPCs started per second, 0 for no limit",
+    show_default=True,
+)
+@click.option(
+    "--max-attempts",
+    type=int,
+    default=5,
+    help="Attempts per operation on retryable errors (RESOURCE_EXHAUSTED, UNAVAILABLE...)",
+    show_default=True,
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Keep running: reconcile the schedules when the file changes and resync them periodically",
+)
+@click.option(
+    "--poll-interval",
+    type=float,
+    default=5.0,
+    help="[watch] Seconds between two checks of the schedules file",
+    show_default=True,
+)
+@click.option(
+    "--resync-interval",
+    type=float,
+    default=300.0,
+    help="[watch] Seconds between two full syncs, detecting drift",
+    show_default=True,
+)
+@click.option(
+    "--metric-bind-address",
+    type=str,
+    default=None,
+    help="[watch] Serve the Prometheus metrics on this address, e.g. 0.0.0.0:9000",
+)
+@click.option(
+    "--forecast",
+    is_flag=True,
+    default=False,
+    help="Offline, no server: report the workflow starts per task queue and flag the unserved or saturated queues",
+)
+@click.option(
+    "--window",
+    type=str,
+    default="24h",
+    help="[forecast] Time window to expand the schedules over",
+    show_default=True,
+)
+@click.option(
+    "--bucket",
+    type=str,
+    default="1m",
+    help="[forecast] Period over which the peak starts are counted",
+    show_default=True,
+)
 def scheduler(
     config: str,
     host: str,
     namespace: str,
     schedules_file: str | None,
+    *,
+    concurrency: int,
+    rate_limit: float,
+    max_attempts: int,
+    watch: bool,
+    poll_interval: float,
+    resync_interval: float,
+    metric_bind_address: str | None,
+    forecast: bool,
+    window: str,
+    bucket: str,
 ) -> None:
     _config = load_config_from_yaml(config)
     if namespace:
@@ -67,4 +197,33 @@ def scheduler(
                 key: TemporalScheduleSchema.model_validate(val)
                 for key, val in yaml.safe_load(f.read())["schedules"].items()
             }
-    asyncio.run(run(_config))
+    if forecast:
+        report = schedule_forecast.forecast(_config, time_interval(window), time_interval(bucket))
+        click.echo(report.table())
+        if report.issues:
+            sys.exit(1)
+        return
+    if watch:
+        if not metric_bind_address and _config.enable_metrics:
+            metric_bind_address = _config.metric_bind_address
+        asyncio.run(
+            watch_schedules(
+                _config,
+                schedules_file or config,
+                poll_interval=poll_interval,
+                resync_interval=resync_interval,
+                metric_bind_address=metric_bind_address,
+                concurrency=concurrency,
+                rate_limit=rate_limit,
+                max_attempts=max_attempts,
+            )
+        )
+        return
+    try:
+        plan = asyncio.run(run(_config, concurrency, rate_limit, max_attempts))
+    except RPCError as exc:
+        click.echo(f"Failed to list the schedules: {exc.status.name} {exc}", err=True)
+        sys.exit(1)
+    if plan.failed:
+        click.echo(plan.table(), err=True)
+        sys.exit(1)
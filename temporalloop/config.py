@@ -10,7 +10,8 @@ import yaml
 from temporalio.converter import DataConverter
 from temporalio.worker import Interceptor
 
-from temporalloop.importer import ImportFromStringError, import_from_string
+from temporalloop.converters.codecs import CODEC_CONVERTERS
+from temporalloop.importer import ImportFromStringError, cached_import_from_string, import_modules
 from temporalloop.worker import WorkerFactory, WorkerFactoryType
 
 LOG_LEVELS: dict[str, int] = {
@@ -52,6 +53,59 @@ LOGGING_CONFIG: dict[str, Any] = {
 
 logger: logging.Logger = logging.getLogger("temporalloop.error")
 
+# Used when a setting is set neither on the worker, nor globally, nor by the profile.
+# Settings absent from here are left to the SDK defaults.
+WORKER_DEFAULTS: dict[str, Any] = {
+    "max_concurrent_workflow_tasks": 100,
+    "max_concurrent_activities": 100,
+    "graceful_shutdown_timeout": 10.0,
+}
+
+# Consistent sets of Worker settings, selected with `profile`
+WORKER_PROFILES: dict[str, dict[str, Any]] = {
+    "default": {},
+    # more pollers and cached workflows, tasks are picked up as soon as possible
+    "latency": {
+        "max_cached_workflows": 2000,
+        "max_concurrent_workflow_tasks": 200,
+        "max_concurrent_activities": 200,
+        "max_concurrent_local_activities": 200,
+        "max_concurrent_workflow_task_polls": 10,
+        "max_concurrent_activity_task_polls": 10,
+        "nonsticky_to_sticky_poll_ratio": 0.2,
+    },
+    # many slots and pollers, favor the non-sticky queue to spread the load
+    "throughput": {
+        "max_cached_workflows": 5000,
+        "max_concurrent_workflow_tasks": 500,
+        "max_concurrent_activities": 500,
+        "max_concurrent_local_activities": 500,
+        "max_concurrent_workflow_task_polls": 20,
+        "max_concurrent_activity_task_polls": 20,
+        "nonsticky_to_sticky_poll_ratio": 0.5,
+        "graceful_shutdown_timeout": 30.0,
+    },
+    # small workflow cache and few slots to bound the memory usage
+    "low-memory": {
+        "max_cached_workflows": 100,
+        "max_concurrent_workflow_tasks": 20,
+        "max_concurrent_activities": 20,
+        "max_concurrent_local_activities": 20,
+        "max_concurrent_workflow_task_polls": 2,
+        "max_concurrent_activity_task_polls": 2,
+    },
+}
+
+# Settings of the profiles and defaults: unset when None, an explicit 0 is kept
+PROFILE_SETTINGS: frozenset[str] = frozenset(WORKER_DEFAULTS).union(*WORKER_PROFILES.values())
+
+
+def as_dict(value: Any) -> dict[str, Any] | None:
+    """Accept settings given either as a dict or as a pydantic model"""
+    if value is None or isinstance(value, dict):
+        return value
+    return value.model_dump()
+
 
 def merge_loggers(logging_config: dict[str, Any]) -> dict[str, Any]:
     if "loggers" not in logging_config:
@@ -69,6 +123,31 @@ def merge_loggers(logging_config: dict[str, Any]) -> dict[str, Any]:
 
 # pylint: disable=too-many-arguments,too-many-instance-attributes,dangerous-default-value,invalid-name,too-many-locals
 class WorkerConfig:
+    # Settings inherited from the global Config when unset on the worker
+    MERGED_SETTINGS: tuple[str, ...] = (
+        "max_concurrent_workflow_tasks",
+        "max_concurrent_activities",
+        "metric_bind_address",
+        "enable_metrics",
+        "processes",
+        "client_channels",
+        "activity_executor",
+        "activity_executor_workers",
+        "tuner",
+        "codec",
+        "profile",
+        "pre_init_concurrent",
+        "pre_init_in_thread",
+        "max_cached_workflows",
+        "max_concurrent_local_activities",
+        "max_concurrent_workflow_task_polls",
+        "max_concurrent_activity_task_polls",
+        "nonsticky_to_sticky_poll_ratio",
+        "max_activities_per_second",
+        "max_task_queue_activities_per_second",
+        "graceful_shutdown_timeout",
+    )
+
     def __init__(
         self,
         *,
@@ -83,12 +162,29 @@ class WorkerConfig:
         converter: DataConverter | str | None = None,
         pre_init: Sequence[Callable[..., Any] | str] = [],
         behavior: str = "merge",
-        max_concurrent_workflow_tasks: int = 0,
-        max_concurrent_activities: int = 0,
+        max_concurrent_workflow_tasks: int | None = None,
+        max_concurrent_activities: int | None = None,
         metric_bind_address: str = "",
         enable_metrics: bool = False,
         debug_mode: bool = False,
-        disable_eager_activity_execution: bool = True,
+        disable_eager_activity_execution: bool | None = None,
+        processes: int = 0,
+        client_channels: int = 0,
+        activity_executor: str = "",
+        activity_executor_workers: int = 0,
+        tuner: Any = None,
+        codec: Any = None,
+        profile: str = "",
+        max_cached_workflows: int | None = None,
+        max_concurrent_local_activities: int | None = None,
+        max_concurrent_workflow_task_polls: int | None = None,
+        max_concurrent_activity_task_polls: int | None = None,
+        nonsticky_to_sticky_poll_ratio: float | None = None,
+        max_activities_per_second: float | None = None,
+        max_task_queue_activities_per_second: float | None = None,
+        graceful_shutdown_timeout: float | None = None,
+        pre_init_concurrent: bool = False,
+        pre_init_in_thread: bool = False,
     ) -> None:
         self.name = name
         self.host: str = host
@@ -115,6 +211,32 @@ class WorkerConfig:
         self.disable_eager_activity_execution = disable_eager_activity_execution
         self.metric_bind_address = metric_bind_address
         self.enable_metrics = enable_metrics
+        self.processes = processes
+        self.client_channels = client_channels
+        self.activity_executor = activity_executor
+        self.activity_executor_workers = activity_executor_workers
+        self.tuner: dict[str, Any] | None = as_dict(tuner)
+        self.codec: dict[str, Any] | None = as_dict(codec)
+        self.profile = profile
+        self.max_cached_workflows = max_cached_workflows
+        self.max_concurrent_local_activities = max_concurrent_local_activities
+        self.max_concurrent_workflow_task_polls = max_concurrent_workflow_task_polls
+        self.max_concurrent_activity_task_polls = max_concurrent_activity_task_polls
+        self.nonsticky_to_sticky_poll_ratio = nonsticky_to_sticky_poll_ratio
+        self.max_activities_per_second = max_activities_per_second
+        self.max_task_queue_activities_per_second = max_task_queue_activities_per_second
+        self.graceful_shutdown_timeout = graceful_shutdown_timeout
+        self.pre_init_concurrent = pre_init_concurrent
+        self.pre_init_in_thread = pre_init_in_thread
+
+    @property
+    def max_activity_slots(self) -> int:
+        """Upper bound of concurrently running activities"""
+        if self.tuner and self.tuner.get("mode") == "resource_based":
+            maximum = (self.tuner.get("activity") or {}).get("maximum_slots")
+            if maximum:
+                return maximum
+        return self.max_concurrent_activities
 
     def _merge(self, config: "Config") -> None:
         if not self.host:
@@ -129,26 +251,59 @@ class WorkerConfig:
             self._interceptors = config.interceptors
         if not self._pre_init:
             self._pre_init = config.pre_init
-        if not self.max_concurrent_workflow_tasks:
-            self.max_concurrent_workflow_tasks = config.max_concurrent_workflow_tasks
-        if not self.max_concurrent_activities:
-            self.max_concurrent_activities = config.max_concurrent_activities
-        if not self.metric_bind_address:
-            self.metric_bind_address = config.metric_bind_address
-        if not self.enable_metrics:
-            self.enable_metrics = config.enable_metrics
+        for attr in self.MERGED_SETTINGS:
+            if self._unset(attr):
+                setattr(self, attr, getattr(config, attr))
+        if self.disable_eager_activity_execution is None:
+            self.disable_eager_activity_execution = config.disable_eager_activity_execution
 
-    def load(self, global_config: Optional["Config"] = None) -> None:
-        assert not self.loaded
+    def _unset(self, attr: str) -> bool:
+        value = getattr(self, attr)
+        return value is None if attr in PROFILE_SETTINGS else not value
+
+    def _fill(self, values: dict[str, Any]) -> None:
+        for attr, value in values.items():
+            if getattr(self, attr) is None:
+                setattr(self, attr, value)
+
+    def _profile_values(self) -> dict[str, Any]:
+        if self.profile and self.profile not in WORKER_PROFILES:
+            raise ValueError(f"Unknown worker profile {self.profile}, expected one of {list(WORKER_PROFILES)}")
+        return WORKER_PROFILES.get(self.profile, {})
+
+    def resolve(self, global_config: Optional["Config"] = None) -> None:
+        """Settle the settings without importing anything. Precedence: worker setting,
+        worker profile, global setting, global profile, defaults"""
+        self._fill(self._profile_values())
         if self.behavior == "merge" and global_config is not None:
             self._merge(global_config)
+            # profile inherited from the global config
+            self._fill(self._profile_values())
+        self._fill(WORKER_DEFAULTS)
+        self._check_tuner()
+
+    def _check_tuner(self) -> None:
+        """The thread pool running the activities is sized after the tuner maximum slots"""
+        if not self.tuner or self.tuner.get("mode") != "resource_based":
+            return
+        if (self.activity_executor or "thread") != "thread" or self.activity_executor_workers:
+            return
+        if not (self.tuner.get("activity") or {}).get("maximum_slots"):
+            raise ValueError(
+                f"Worker {self.name}: the resource_based tuner needs tuner.activity.maximum_slots"
+                " to size the activity threads, or set activity_executor_workers"
+            )
+
+    def load(self, global_config: Optional["Config"] = None) -> None:
+        assert not self.loaded
+        self.resolve(global_config)
 
         self.activities = self._load_functions(self._activities)
         self.workflows = self._load_functions(self._workflows)
         self.interceptors = self._load_functions(self._interceptors)
-        self.converter = cast(DataConverter, self._load_function(self._converter))
+        self.converter = CODEC_CONVERTERS.get(cast(DataConverter, self._load_function(self._converter)), self.codec)
         self.factory = self._load_function(self._factory)
-        self.pre_init = self._load_function(self._pre_init)
+        self.pre_init = list(self._load_functions(self._pre_init))
         self.loaded = True
 
     def _load_functions(self, functions: Sequence[Any]) -> Sequence[Any]:
@@ -157,7 +312,7 @@ class WorkerConfig:
     def _load_function(self, function: Any) -> Any:
         if isinstance(function, str):
             try:
-                function = import_from_string(function)
+                function = cached_import_from_string(function)
             except ImportFromStringError as e:
                 logger.error(e)
                 sys.exit(1)
@@ -177,14 +332,38 @@ class Config:
         converter: DataConverter | str | None = None,
         use_colors: bool | None = None,
         workers: Sequence[WorkerConfig | dict[str, Any]] = [],
-        max_concurrent_activities: int = 100,
-        max_concurrent_workflow_tasks: int = 100,
+        max_concurrent_activities: int | None = None,
+        max_concurrent_workflow_tasks: int | None = None,
         metric_bind_address: str = "0.0.0.0:9000",
         limit_concurrency: int | None = None,
         pre_init: list[str] | None = None,
         enable_metrics: bool = False,
         config_logging: bool = True,
         schedules: dict[str, Any] | None = None,
+        processes: int = 1,
+        client_channels: int = 1,
+        metric_prefix: str | None = None,
+        metric_global_tags: dict[str, str] | None = None,
+        metric_histogram_buckets: dict[str, list[float]] | None = None,
+        activity_executor: str = "thread",
+        activity_executor_workers: int = 0,
+        tuner: Any = None,
+        codec: Any = None,
+        profile: str = "",
+        max_cached_workflows: int | None = None,
+        max_concurrent_local_activities: int | None = None,
+        max_concurrent_workflow_task_polls: int | None = None,
+        max_concurrent_activity_task_polls: int | None = None,
+        nonsticky_to_sticky_poll_ratio: float | None = None,
+        max_activities_per_second: float | None = None,
+        max_task_queue_activities_per_second: float | None = None,
+        graceful_shutdown_timeout: float | None = None,
+        disable_eager_activity_execution: bool = True,
+        drain_timeout: float | None = None,
+        parallel_imports: bool = False,
+        profile_startup: bool = False,
+        pre_init_concurrent: bool = False,
+        pre_init_in_thread: bool = False,
     ):
         self.host = host
         self.namespace: str = namespace
@@ -208,6 +387,32 @@ class Config:
         self.loaded = False
         self.enable_metrics = enable_metrics
         self.metric_bind_address = metric_bind_address
+        self.processes = processes
+        self.client_channels = client_channels
+        self.metric_prefix = metric_prefix
+        self.metric_global_tags = metric_global_tags or {}
+        self.metric_histogram_buckets = metric_histogram_buckets or {}
+        self.activity_executor = activity_executor
+        self.activity_executor_workers = activity_executor_workers
+        self.tuner: dict[str, Any] | None = as_dict(tuner)
+        self.codec: dict[str, Any] | None = as_dict(codec)
+        self.profile = profile
+        self.max_cached_workflows = max_cached_workflows
+        self.max_concurrent_local_activities = max_concurrent_local_activities
+        self.max_concurrent_workflow_task_polls = max_concurrent_workflow_task_polls
+        self.max_concurrent_activity_task_polls = max_concurrent_activity_task_polls
+        self.nonsticky_to_sticky_poll_ratio = nonsticky_to_sticky_poll_ratio
+        self.max_activities_per_second = max_activities_per_second
+        self.max_task_queue_activities_per_second = max_task_queue_activities_per_second
+        self.graceful_shutdown_timeout = graceful_shutdown_timeout
+        self.disable_eager_activity_execution = disable_eager_activity_execution
+        self.drain_timeout = drain_timeout
+        self.parallel_imports = parallel_imports
+        self.profile_startup = profile_startup
+        self.pre_init_concurrent = pre_init_concurrent
+        self.pre_init_in_thread = pre_init_in_thread
+        # Set in the forked children by the Supervisor
+        self.process_index: int | None = None
         if config_logging:
             self.configure_logging()
 
@@ -241,15 +446,44 @@ class Config:
             logging.getLogger("root").setLevel(log_level)
             logging.getLogger("temporalloop.worker").setLevel(log_level)
 
-    def load(self) -> None:
-        assert not self.loaded
+    def build_workers(self) -> list[WorkerConfig]:
+        workers = []
         for worker in self._workers:
             w = worker
             if isinstance(w, dict):
                 w = WorkerConfig(**w)
-            if isinstance(w, WorkerConfig):
-                w.load(self)
-            else:
+            if not isinstance(w, WorkerConfig):
                 raise ValueError("Invalid worker configuration")
+            workers.append(w)
+        return workers
+
+    def load(self) -> None:
+        assert not self.loaded
+        workers = self.build_workers()
+        if self.parallel_imports:
+            import_modules(self.import_strings(workers))
+        for w in workers:
+            w.load(self)
             self.workers.append(w)
         self.loaded = True
+
+    def import_strings(self, workers: Sequence[WorkerConfig]) -> list[str]:
+        """Every import string referenced by the global and the workers config"""
+        values: list[Any] = [self.factory, self.converter, *self.interceptors, *self.pre_init]
+        for w in workers:
+            values.extend([w._factory, w._converter, *w._activities, *w._workflows, *w._interceptors, *w._pre_init])  # pylint: disable=protected-access
+        return [v for v in values if isinstance(v, str)]
+
+    @property
+    def drain_deadline(self) -> float:
+        """Seconds given to the workers to drain on shutdown, by default a bit more
+        than the longest graceful_shutdown_timeout"""
+        if self.drain_timeout:
+            return self.drain_timeout
+        timeouts = [w.graceful_shutdown_timeout or 0 for w in self.workers]
+        return max([*timeouts, WORKER_DEFAULTS["graceful_shutdown_timeout"]]) + 5
+
+    @property
+    def max_processes(self) -> int:
+        """Number of worker processes to fork, 1 means the workers run in the current process"""
+        return max([self.processes] + [w.processes for w in self.workers if w.processes])
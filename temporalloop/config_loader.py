@@ -20,8 +20,12 @@ class LoggingConfigSchema(BaseConfig):
 
 
 class TemporalInterval(BaseConfig):
+    """Fires every `every`, shifted by `offset`. With `stagger` and no offset, the offset
+    is derived from the workflow id: schedules sharing an interval are spread across it"""
+
     every: str = Field(default="86400s")
     offset: str | None = Field(default=None)
+    stagger: bool = Field(default=False)
 
     def every_timedelta(self) -> timedelta:
         return time_interval(self.every)
@@ -37,11 +41,79 @@ class TemporalScheduleSchema(BaseConfig):
     workflow: str = Field(...)
     input_schema: str = Field(default="")
     task_queue: str = Field(default="connyex-queue")
-    interval: TemporalInterval = Field(default_factory=TemporalInterval)
+    # without `interval` nor `cron`, the schedule fires daily
+    interval: TemporalInterval | None = Field(default=None)
+    # cron expressions, e.g. "0 3 * * MON-FRI", evaluated in `time_zone` (UTC by default)
+    cron: list[str] = Field(default_factory=list)
+    time_zone: str | None = Field(default=None)
+    # random delay added to each start, e.g. "5m"
+    jitter: str | None = Field(default=None)
+    overlap: Literal["skip", "buffer_one", "buffer_all", "cancel_other", "terminate_other", "allow_all"] = Field(
+        default="buffer_one"
+    )
+    # how late a missed start (server down...) is still run
+    catchup_window: str | None = Field(default=None)
     comment: str = Field(default="")
     payload: dict[str, Any] = Field(default_factory=dict)
     state: Literal["created", "paused", "deleted"] = Field(default="created")
 
+    def intervals(self) -> list[TemporalInterval]:
+        if self.interval is not None:
+            return [self.interval]
+        return [] if self.cron else [TemporalInterval()]
+
+
+class ResourceSlotSchema(BaseConfig):
+    minimum_slots: int | None = Field(default=None)
+    maximum_slots: int | None = Field(default=None)
+    ramp_throttle_ms: int | None = Field(default=None)
+
+
+class TunerConfigSchema(BaseConfig):
+    """Slot tuning: `fixed` uses max_concurrent_*, `resource_based` sizes the slots
+    to reach the target CPU and memory usage (ratios between 0 and 1)"""
+
+    mode: Literal["fixed", "resource_based"] = Field(default="fixed")
+    target_cpu_usage: float = Field(default=0.8)
+    target_memory_usage: float = Field(default=0.8)
+    workflow: ResourceSlotSchema | None = Field(default=None)
+    activity: ResourceSlotSchema | None = Field(default=None)
+    local_activity: ResourceSlotSchema | None = Field(default=None)
+
+
+class ClaimCheckConfigSchema(BaseConfig):
+    """Offload the large payloads to a blob store, the history keeps a reference"""
+
+    store: Literal["file", "s3"] = Field(default="file")
+    # payloads larger than this (bytes, after compression) are offloaded
+    threshold: int = Field(default=256 * 1024)
+    # file store
+    path: str = Field(default="")
+    # s3 store
+    bucket: str = Field(default="")
+    prefix: str = Field(default="")
+    endpoint_url: str | None = Field(default=None)
+    region_name: str | None = Field(default=None)
+    # in-process LRU of the recent blobs
+    cache_bytes: int = Field(default=64 * 1024 * 1024)
+    # blobs larger than this are memory-mapped on read
+    mmap_threshold: int = Field(default=1024 * 1024)
+
+
+class CodecConfigSchema(BaseConfig):
+    """Payload codec applied on top of the converter"""
+
+    # "none", "auto" (zstd when available, else zlib), "zstd" or "zlib"
+    compression: Literal["none", "auto", "zstd", "zlib"] = Field(default="none")
+    # payloads smaller than this (bytes) are not compressed
+    compression_threshold: int = Field(default=16 * 1024)
+    compression_level: int | None = Field(default=None)
+    claim_check: ClaimCheckConfigSchema | None = Field(default=None)
+    # payloads larger than this (bytes) are processed in the codec thread pool, 0: always inline
+    offload_threshold: int = Field(default=256 * 1024)
+    # size of the codec thread pool, shared by the workers of the process
+    offload_workers: int = Field(default=0)
+
 
 class WorkerConfigSchema(BaseConfig):
     interceptors: list[str] | None = Field(default=None)
@@ -52,12 +124,31 @@ class WorkerConfigSchema(BaseConfig):
     converter: str | None = Field(default=None)
     factory: str | None = Field(default=None)
     pre_init: list[str] | None = Field(default=None)
-    max_concurrent_activities: int = Field(default=100)
-    max_concurrent_workflow_tasks: int = Field(default=100)
+    pre_init_concurrent: bool = Field(default=False)
+    pre_init_in_thread: bool = Field(default=False)
+    max_concurrent_activities: int | None = Field(default=None)
+    max_concurrent_workflow_tasks: int | None = Field(default=None)
     debug_mode: bool = Field(default=False)
-    disable_eager_activity_execution: bool = Field(default=True)  # pylint: disable=invalid-name
+    # unset: inherit the global setting
+    disable_eager_activity_execution: bool | None = Field(default=None)  # pylint: disable=invalid-name
     metric_bind_address: str = Field(default="0.0.0.0:9000")
     enable_metrics: bool = Field(default=False)
+    processes: int = Field(default=0)
+    client_channels: int = Field(default=0)
+    # "thread", "process" or "module:factory" called with the WorkerConfig
+    activity_executor: str = Field(default="")
+    activity_executor_workers: int = Field(default=0)
+    tuner: TunerConfigSchema | None = Field(default=None)
+    codec: CodecConfigSchema | None = Field(default=None)
+    profile: Literal["", "default", "latency", "throughput", "low-memory"] = Field(default="")
+    max_cached_workflows: int | None = Field(default=None)
+    max_concurrent_local_activities: int | None = Field(default=None)
+    max_concurrent_workflow_task_polls: int | None = Field(default=None)
+    max_concurrent_activity_task_polls: int | None = Field(default=None)
+    nonsticky_to_sticky_poll_ratio: float | None = Field(default=None)
+    max_activities_per_second: float | None = Field(default=None)
+    max_task_queue_activities_per_second: float | None = Field(default=None)
+    graceful_shutdown_timeout: float | None = Field(default=None)
 
 
 class TemporalConfigSchema(BaseConfig):
@@ -68,11 +159,40 @@ class TemporalConfigSchema(BaseConfig):
     converter: str | None = Field(default=None)
     default_factory: str = Field(default="temporalloop.worker:WorkerFactory")
     pre_init: list[str] = Field(default_factory=list)
-    max_concurrent_activities: int = Field(default=100)
-    max_concurrent_workflow_tasks: int = Field(default=100)
+    # run the independent pre_init hooks concurrently, sync hooks in a thread
+    pre_init_concurrent: bool = Field(default=False)
+    pre_init_in_thread: bool = Field(default=False)
+    max_concurrent_activities: int | None = Field(default=None)
+    max_concurrent_workflow_tasks: int | None = Field(default=None)
     disable_eager_activity_execution: bool = Field(default=True)  # pylint: disable=invalid-name
+    # seconds to drain the workers on shutdown, defaults to the longest graceful_shutdown_timeout + 5s
+    drain_timeout: float | None = Field(default=None)
+    # import the activities/workflows modules concurrently at startup
+    parallel_imports: bool = Field(default=False)
+    profile_startup: bool = Field(default=False)
     metric_bind_address: str = Field(default="0.0.0.0:9000")
     enable_metrics: bool = Field(default=False)
+    processes: int = Field(default=1)
+    # Number of gRPC connections shared by the workers using the same host/namespace
+    client_channels: int = Field(default=1)
+    # Settings of the process-wide metrics runtime, shared by all workers
+    metric_prefix: str | None = Field(default=None)
+    metric_global_tags: dict[str, str] = Field(default_factory=dict)
+    metric_histogram_buckets: dict[str, list[float]] = Field(default_factory=dict)
+    activity_executor: str = Field(default="thread")
+    activity_executor_workers: int = Field(default=0)
+    tuner: TunerConfigSchema | None = Field(default=None)
+    codec: CodecConfigSchema | None = Field(default=None)
+    # Worker settings left unset (null) come from the profile, then the defaults
+    profile: Literal["", "default", "latency", "throughput", "low-memory"] = Field(default="")
+    max_cached_workflows: int | None = Field(default=None)
+    max_concurrent_local_activities: int | None = Field(default=None)
+    max_concurrent_workflow_task_polls: int | None = Field(default=None)
+    max_concurrent_activity_task_polls: int | None = Field(default=None)
+    nonsticky_to_sticky_poll_ratio: float | None = Field(default=None)
+    max_activities_per_second: float | None = Field(default=None)
+    max_task_queue_activities_per_second: float | None = Field(default=None)
+    graceful_shutdown_timeout: float | None = Field(default=None)  # seconds
 
 
 class ConfigSchema(BaseConfig):
@@ -119,4 +239,32 @@ def config_from_dict(config_dict: dict[str, Any]) -> Config:
         interceptors=config.temporalio.interceptors,
         pre_init=config.temporalio.pre_init,
         schedules=config.schedules,
+        processes=config.temporalio.processes,
+        client_channels=config.temporalio.client_channels,
+        enable_metrics=config.temporalio.enable_metrics,
+        metric_bind_address=config.temporalio.metric_bind_address,
+        metric_prefix=config.temporalio.metric_prefix,
+        metric_global_tags=config.temporalio.metric_global_tags,
+        metric_histogram_buckets=config.temporalio.metric_histogram_buckets,
+        activity_executor=config.temporalio.activity_executor,
+        activity_executor_workers=config.temporalio.activity_executor_workers,
+        tuner=config.temporalio.tuner,
+        codec=config.temporalio.codec,
+        profile=config.temporalio.profile,
+        max_concurrent_activities=config.temporalio.max_concurrent_activities,
+        max_concurrent_workflow_tasks=config.temporalio.max_concurrent_workflow_tasks,
+        max_cached_workflows=config.temporalio.max_cached_workflows,
+        max_concurrent_local_activities=config.temporalio.max_concurrent_local_activities,
+        max_concurrent_workflow_task_polls=config.temporalio.max_concurrent_workflow_task_polls,
+        max_concurrent_activity_task_polls=config.temporalio.max_concurrent_activity_task_polls,
+        nonsticky_to_sticky_poll_ratio=config.temporalio.nonsticky_to_sticky_poll_ratio,
+        max_activities_per_second=config.temporalio.max_activities_per_second,
+        max_task_queue_activities_per_second=config.temporalio.max_task_queue_activities_per_second,
+        graceful_shutdown_timeout=config.temporalio.graceful_shutdown_timeout,
+        disable_eager_activity_execution=config.temporalio.disable_eager_activity_execution,
+        drain_timeout=config.temporalio.drain_timeout,
+        parallel_imports=config.temporalio.parallel_imports,
+        profile_startup=config.temporalio.profile_startup,
+        pre_init_concurrent=config.temporalio.pre_init_concurrent,
+        pre_init_in_thread=config.temporalio.pre_init_in_thread,
     )
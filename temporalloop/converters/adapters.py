@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import dataclasses
+import typing
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic.dataclasses import is_pydantic_dataclass
+
+
+def is_pydantic_type(hint: Any, seen: frozenset[Any] = frozenset()) -> bool:
+    """True if `hint` is, contains or is a dataclass holding a pydantic model"""
+    if isinstance(hint, type):
+        if issubclass(hint, BaseModel) or is_pydantic_dataclass(hint):
+            return True
+        if dataclasses.is_dataclass(hint) and hint not in seen:
+            try:
+                hints = typing.get_type_hints(hint)
+            except NameError:
+                return False
+            return any(is_pydantic_type(h, seen | {hint}) for h in hints.values())
+        return False
+    return any(is_pydantic_type(arg, seen) for arg in typing.get_args(hint))
+
+
+class TypeAdapterCache:
+    """Build one pydantic TypeAdapter per type, kept for the life of the process"""
+
+    def __init__(self) -> None:
+        self.adapters: dict[Any, TypeAdapter[Any]] = {}
+        self.pydantic_types: dict[Any, bool] = {}
+
+    def get(self, hint: Any) -> TypeAdapter[Any]:
+        try:
+            return self.adapters[hint]
+        except KeyError:
+            adapter = self.adapters[hint] = TypeAdapter(hint)
+            return adapter
+        except TypeError:
+            # unhashable hint, e.g. Annotated with unhashable metadata
+            return TypeAdapter(hint)
+
+    def is_pydantic(self, hint: Any) -> bool:
+        try:
+            return self.pydantic_types[hint]
+        except KeyError:
+            result = self.pydantic_types[hint] = is_pydantic_type(hint)
+            return result
+        except TypeError:
+            return is_pydantic_type(hint)
+
+
+TYPE_ADAPTERS = TypeAdapterCache()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""msgpack encoding for pydantic models.
+
+Models are serialized by pydantic (JSON-compatible values) and packed with
+msgpack: numbers stay binary, large numeric arrays are smaller and faster to
+decode than JSON text. The payloads are tagged `binary/msgpack`, JSON payloads
+keep decoding with the JSON converter.
+"""
+
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import EncodingPayloadConverter
+from temporalloop.converters.adapters import TYPE_ADAPTERS
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None  # type: ignore[assignment]
+
+MSGPACK_ENCODING = "binary/msgpack"
+# Class attribute selecting the payload encoding of a model
+ENCODING_ATTR = "__temporalloop_encoding__"
+
+ModelType = TypeVar("ModelType", bound=type[BaseModel])  # pylint: disable=invalid-name
+
+
+def msgpack_encoded(model: ModelType) -> ModelType:  # noqa: UP047
+    """Class decorator: encode the model with msgpack instead of JSON"""
+    setattr(model, ENCODING_ATTR, MSGPACK_ENCODING)
+    return model
+
+
+class MsgpackPayloadConverter(EncodingPayloadConverter):
+    """Encode pydantic models with msgpack.
+
+    Only the models marked with :py:func:`msgpack_encoded` are converted, or all
+    models with `all_models`. Other values are left to the next converter.
+    """
+
+    def __init__(self, all_models: bool = False) -> None:
+        self.all_models = all_models
+
+    @property
+    def encoding(self) -> str:
+        return MSGPACK_ENCODING
+
+    def to_payload(self, value: Any) -> Payload | None:
+        if msgpack is None or not isinstance(value, BaseModel):
+            return None
+        if not self.all_models and getattr(value, ENCODING_ATTR, None) != MSGPACK_ENCODING:
+            return None
+        return Payload(
+            metadata={"encoding": MSGPACK_ENCODING.encode()},
+            data=msgpack.packb(value.__pydantic_serializer__.to_python(value, mode="json")),
+        )
+
+    def from_payload(self, payload: Payload, type_hint: type | None = None) -> Any:
+        if msgpack is None:
+            raise RuntimeError("Payload encoded with msgpack, pip install temporalloop[msgpack]")
+        obj = msgpack.unpackb(payload.data)
+        if type_hint is not None:
+            obj = TYPE_ADAPTERS.get(type_hint).validate_python(obj)
+        return obj
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Claim-check payload codec.
+
+Payloads larger than a threshold are stored in a blob store, the workflow
+history only keeps a `binary/claim-check` payload referencing the blob. Blobs
+are content-addressed (sha256 of the serialized payload): storing the same
+payload twice writes it once. Recently read or written blobs are kept in a
+bounded in-process LRU, big blobs are read through a memory map.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from temporalio.api.common.v1 import Payload
+from temporalloop.converters.offload import PayloadCodecBase
+from temporalloop.runtime import process_metric_meter
+
+try:
+    import boto3
+except ImportError:  # pragma: no cover
+    boto3 = None  # type: ignore[assignment]
+
+CLAIM_CHECK_ENCODING = b"binary/claim-check"
+DEFAULT_THRESHOLD = 256 * 1024
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_MMAP_THRESHOLD = 1024 * 1024
+# sha256 hex digest: never a path or an object key outside of the store
+BLOB_KEY = re.compile(r"[0-9a-f]{64}")
+
+# bytes, or a memoryview over a memory-mapped blob
+Blob = bytes | memoryview
+
+
+def map_file(file: Any) -> memoryview:
+    """Memory-map a whole file. The mapping outlives the file descriptor and is
+    released once the returned view is garbage collected."""
+    return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def check_key(key: str) -> str:
+    if not isinstance(key, str) or BLOB_KEY.fullmatch(key) is None:
+        raise ValueError(f"Invalid claim-check blob key {key!r}")
+    return key
+
+
+class BlobStore:
+    """Stores the blobs by key. Methods are blocking, the codec calls them in its thread pool"""
+
+    name: str = ""
+
+    def put(self, key: str, data: bytes) -> bool:
+        """Store the blob, return False if it already existed"""
+        raise NotImplementedError
+
+    def get(self, key: str) -> Blob:
+        raise NotImplementedError
+
+
+class FileSystemBlobStore(BlobStore):
+    """Blobs stored as files under `path/<key[:2]>/<key>`"""
+
+    name = "file"
+
+    def __init__(self, path: str, mmap_threshold: int = DEFAULT_MMAP_THRESHOLD) -> None:
+        if not path:
+            raise ValueError("The file claim-check store needs a path")
+        self.path = Path(path)
+        self.mmap_threshold = mmap_threshold
+
+    def blob_path(self, key: str) -> Path:
+        check_key(key)
+        return self.path / key[:2] / key
+
+    def put(self, key: str, data: bytes) -> bool:
+        path = self.blob_path(key)
+        if path.exists():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write then rename: readers never see a partial blob
+        tmp = path.with_name(f".{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        return True
+
+    def get(self, key: str) -> Blob:
+        with open(self.blob_path(key), "rb") as file:
+            if os.fstat(file.fileno()).st_size >= self.mmap_threshold:
+                return map_file(file)
+            return file.read()
+
+
+class S3BlobStore(BlobStore):
+    """Blobs stored in an S3-compatible bucket (AWS, MinIO, Ceph...) under `prefix/<key>`.
+
+    Big objects are streamed to a temporary file and memory-mapped instead of
+    being held in memory.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str | None = None,
+        region_name: str | None = None,
+        mmap_threshold: int = DEFAULT_MMAP_THRESHOLD,
+    ) -> None:
+        if boto3 is None:
+            raise ImportError("boto3 is not installed, pip install temporalloop[s3]")
+        if not bucket:
+            raise ValueError("The s3 claim-check store needs a bucket")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.mmap_threshold = mmap_threshold
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region_name)
+
+    def object_key(self, key: str) -> str:
+        check_key(key)
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put(self, key: str, data: bytes) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+            return False
+        except self.client.exceptions.ClientError as err:
+            if err.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                raise
+        self.client.put_object(Bucket=self.bucket, Key=self.object_key(key), Body=data)
+        return True
+
+    def get(self, key: str) -> Blob:
+        response = self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))
+        body = response["Body"]
+        if response.get("ContentLength", 0) < self.mmap_threshold:
+            return body.read()
+        with tempfile.TemporaryFile() as file:
+            for chunk in body.iter_chunks(1024 * 1024):
+                file.write(chunk)
+            file.flush()
+            return map_file(file)
+
+
+class BlobCache:
+    """LRU of blobs bounded by their total size"""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._blobs: OrderedDict[str, Blob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Blob | None:
+        with self._lock:
+            blob = self._blobs.get(key)
+            if blob is not None:
+                self._blobs.move_to_end(key)
+            return blob
+
+    def put(self, key: str, blob: Blob) -> None:
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._blobs:
+                self._blobs.move_to_end(key)
+                return
+            self._blobs[key] = blob
+            self.size += len(blob)
+            while self.size > self.max_bytes:
+                _, evicted = self._blobs.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class ClaimCheckCodec(PayloadCodecBase):
+    """Offload the payloads larger than `threshold` bytes to `store`.
+
+    The blob store I/O always runs in the codec thread pool.
+    """
+
+    def __init__(
+        self,
+        store: BlobStore,
+        threshold: int = DEFAULT_THRESHOLD,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        verify: bool = True,
+    ) -> None:
+        self.store = store
+        self.threshold = threshold
+        self.cache = BlobCache(cache_bytes)
+        self.verify = verify
+        self._blobs: Any = None
+
+    def metrics(self) -> Any:
+        # created lazily: the process metrics runtime is set up by the first worker
+        if self._blobs is None:
+            self._blobs = (
+                process_metric_meter()
+                .with_additional_attributes({"store": self.store.name})
+                .create_counter("temporalloop_claim_check_blobs", "Blobs handled by the claim-check codec")
+            )
+        return self._blobs
+
+    def offload(self, payload: Payload, encode: bool) -> bool:
+        if encode:
+            return payload.ByteSize() >= self.threshold
+        return payload.metadata.get("encoding") == CLAIM_CHECK_ENCODING
+
+    def encode_payload(self, payload: Payload) -> Payload:
+        data = payload.SerializeToString()
+        if len(data) < self.threshold:
+            return payload
+        key = hashlib.sha256(data).hexdigest()
+        if self.cache.get(key) is not None:
+            outcome = "cached"
+        elif self.store.put(key, data):
+            outcome = "stored"
+        else:
+            outcome = "deduplicated"
+        self.cache.put(key, data)
+        self.metrics().add(1, {"operation": "encode", "outcome": outcome})
+        return Payload(
+            metadata={"encoding": CLAIM_CHECK_ENCODING, "claim-check-store": self.store.name.encode()},
+            data=json.dumps({"key": key, "size": len(data)}).encode(),
+        )
+
+    def decode_payload(self, payload: Payload) -> Payload:
+        if payload.metadata.get("encoding") != CLAIM_CHECK_ENCODING:
+            return payload
+        key = check_key(json.loads(payload.data).get("key"))
+        data = self.cache.get(key)
+        if data is None:
+            data = self.store.get(key)
+            if self.verify and hashlib.sha256(data).hexdigest() != key:
+                raise RuntimeError(f"Claim-check blob {key} is corrupted")
+            self.cache.put(key, data)
+            self.metrics().add(1, {"operation": "decode", "outcome": "fetched"})
+        else:
+            self.metrics().add(1, {"operation": "decode", "outcome": "cached"})
+        decoded = Payload()
+        decoded.ParseFromString(data)
+        return decoded
+
+
+def new_blob_store(settings: dict[str, Any]) -> BlobStore:
+    mmap_threshold = settings.get("mmap_threshold") or DEFAULT_MMAP_THRESHOLD
+    if settings.get("store", "file") == "file":
+        return FileSystemBlobStore(settings["path"], mmap_threshold=mmap_threshold)
+    if settings["store"] == "s3":
+        return S3BlobStore(
+            settings["bucket"],
+            prefix=settings.get("prefix") or "",
+            endpoint_url=settings.get("endpoint_url"),
+            region_name=settings.get("region_name"),
+            mmap_threshold=mmap_threshold,
+        )
+    raise ValueError(f"Unknown claim-check store {settings['store']}, expected one of ['file', 's3']")
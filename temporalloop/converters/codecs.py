@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+import dataclasses
+import json
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter, PayloadCodec
+from temporalloop.converters import claimcheck
+from temporalloop.converters.claimcheck import ClaimCheckCodec, new_blob_store
+from temporalloop.converters.compression import DEFAULT_THRESHOLD, CompressionCodec
+from temporalloop.converters.offload import CODEC_EXECUTOR, DEFAULT_OFFLOAD_THRESHOLD
+
+
+class CodecChain(PayloadCodec):
+    """Apply the codecs in order on encode, in reverse order on decode"""
+
+    def __init__(self, codecs: Sequence[PayloadCodec]) -> None:
+        self.codecs = list(codecs)
+
+    async def encode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        for codec in self.codecs:
+            payloads = await codec.encode(payloads)
+        return list(payloads)
+
+    async def decode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        for codec in reversed(self.codecs):
+            payloads = await codec.decode(payloads)
+        return list(payloads)
+
+
+def has_codec(codec: dict[str, Any] | None) -> bool:
+    return bool(codec) and (codec.get("compression", "none") != "none" or bool(codec.get("claim_check")))
+
+
+def new_payload_codec(codec: dict[str, Any] | None) -> PayloadCodec | None:
+    """Build the payload codec described by the `codec` settings.
+
+    Payloads are compressed first, the claim-check then offloads the (compressed)
+    payloads still above its threshold.
+    """
+    if not codec or not has_codec(codec):
+        return None
+    offload_threshold = codec.get("offload_threshold", DEFAULT_OFFLOAD_THRESHOLD) or None
+    if codec.get("offload_workers"):
+        CODEC_EXECUTOR.configure(codec["offload_workers"])
+    codecs: list[PayloadCodec] = []
+    if codec.get("compression", "none") != "none":
+        codecs.append(
+            CompressionCodec(
+                algorithm=codec["compression"],
+                threshold=codec.get("compression_threshold") or DEFAULT_THRESHOLD,
+                level=codec.get("compression_level"),
+                offload_threshold=offload_threshold,
+            )
+        )
+    if claim_check := codec.get("claim_check"):
+        codecs.append(
+            ClaimCheckCodec(
+                new_blob_store(claim_check),
+                threshold=claim_check.get("threshold") or claimcheck.DEFAULT_THRESHOLD,
+                cache_bytes=claim_check.get("cache_bytes") or claimcheck.DEFAULT_CACHE_BYTES,
+            )
+        )
+    return codecs[0] if len(codecs) == 1 else CodecChain(codecs)
+
+
+class CodecConverters:
+    """Data converters with a codec, one per (converter, codec settings).
+
+    Workers sharing the same settings get the same DataConverter instance, and
+    therefore the same pooled client.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._converters: dict[tuple[int, str], DataConverter] = {}
+
+    def get(self, converter: DataConverter | None, codec: dict[str, Any] | None) -> DataConverter | None:
+        if not has_codec(codec):
+            return converter
+        base = converter or DataConverter.default
+        key = (id(base), json.dumps(codec, sort_keys=True))
+        with self._lock:
+            if key not in self._converters:
+                self._converters[key] = dataclasses.replace(base, payload_codec=new_payload_codec(codec))
+            return self._converters[key]
+
+
+CODEC_CONVERTERS = CodecConverters()
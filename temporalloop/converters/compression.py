@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Payload codec compressing the payloads above a size threshold.
+
+The whole serialized payload (metadata included) is compressed and wrapped in
+a payload with the `binary/zstd` or `binary/zlib` encoding. Smaller payloads,
+and payloads that do not shrink, are left untouched: decoding passes every other
+encoding through, so enabling the codec is compatible with existing histories.
+"""
+
+import time
+import zlib
+from typing import Any
+
+from temporalio.api.common.v1 import Payload
+from temporalloop.converters.offload import DEFAULT_OFFLOAD_THRESHOLD, PayloadCodecBase
+from temporalloop.runtime import process_metric_meter
+
+try:
+    from compression import zstd  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    try:
+        from backports import zstd  # type: ignore[import-not-found,no-redef]
+    except ImportError:
+        zstd = None  # type: ignore[assignment]
+
+ZSTD_ENCODING = b"binary/zstd"
+ZLIB_ENCODING = b"binary/zlib"
+DEFAULT_THRESHOLD = 16 * 1024
+
+
+class CompressionCodec(PayloadCodecBase):
+    """Compress the payloads larger than `threshold` bytes.
+
+    `algorithm` is `zstd`, `zlib` or `auto` (zstd when available: python 3.14 or
+    `pip install temporalloop[zstd]`, zlib otherwise). `level` defaults to the
+    algorithm default. Payloads above `offload_threshold` bytes are (de)compressed
+    in the codec thread pool.
+    """
+
+    def __init__(
+        self,
+        algorithm: str = "auto",
+        threshold: int = DEFAULT_THRESHOLD,
+        level: int | None = None,
+        offload_threshold: int | None = DEFAULT_OFFLOAD_THRESHOLD,
+    ) -> None:
+        if algorithm == "auto":
+            algorithm = "zstd" if zstd is not None else "zlib"
+        if algorithm not in ("zstd", "zlib"):
+            raise ValueError(f"Unknown compression {algorithm}, expected one of ['auto', 'zstd', 'zlib']")
+        if algorithm == "zstd" and zstd is None:
+            raise ImportError("zstd is not available, pip install temporalloop[zstd]")
+        self.algorithm = algorithm
+        self.encoding = ZSTD_ENCODING if algorithm == "zstd" else ZLIB_ENCODING
+        self.threshold = threshold
+        self.level = level
+        self.offload_threshold = offload_threshold
+        self._metrics: tuple[Any, Any, Any] | None = None
+
+    def metrics(self) -> tuple[Any, Any, Any]:
+        # created lazily: the process metrics runtime is set up by the first worker
+        if self._metrics is None:
+            meter = process_metric_meter().with_additional_attributes({"codec": self.algorithm})
+            self._metrics = (
+                meter.create_histogram_float(
+                    "temporalloop_codec_compression_ratio", "Compressed size / original size of the payloads"
+                ),
+                meter.create_histogram_float(
+                    "temporalloop_codec_duration", "Time spent compressing/decompressing a payload", "ms"
+                ),
+                meter.create_counter("temporalloop_codec_payloads", "Payloads seen by the compression codec"),
+            )
+        return self._metrics
+
+    def compress(self, data: bytes) -> bytes:
+        if self.algorithm == "zstd":
+            return zstd.compress(data) if self.level is None else zstd.compress(data, level=self.level)
+        return zlib.compress(data) if self.level is None else zlib.compress(data, self.level)
+
+    def encode_payload(self, payload: Payload) -> Payload:
+        data = payload.SerializeToString()
+        ratio, duration, payloads = self.metrics()
+        if len(data) < self.threshold:
+            payloads.add(1, {"operation": "encode", "outcome": "below_threshold"})
+            return payload
+        start = time.perf_counter()
+        compressed = self.compress(data)
+        duration.record((time.perf_counter() - start) * 1000, {"operation": "encode"})
+        ratio.record(len(compressed) / len(data))
+        if len(compressed) >= len(data):
+            payloads.add(1, {"operation": "encode", "outcome": "incompressible"})
+            return payload
+        payloads.add(1, {"operation": "encode", "outcome": "compressed"})
+        return Payload(metadata={"encoding": self.encoding}, data=compressed)
+
+    def decode_payload(self, payload: Payload) -> Payload:
+        encoding = payload.metadata.get("encoding")
+        if encoding not in (ZSTD_ENCODING, ZLIB_ENCODING):
+            return payload
+        _, duration, payloads = self.metrics()
+        start = time.perf_counter()
+        if encoding == ZSTD_ENCODING:
+            if zstd is None:
+                raise RuntimeError("Payload compressed with zstd, pip install temporalloop[zstd]")
+            data = zstd.decompress(payload.data)
+        else:
+            data = zlib.decompress(payload.data)
+        duration.record((time.perf_counter() - start) * 1000, {"operation": "decode"})
+        payloads.add(1, {"operation": "decode", "outcome": "decompressed"})
+        return Payload.FromString(data)
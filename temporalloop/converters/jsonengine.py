@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""JSON engines used by the pydantic payload converter.
+
+Every engine writes the `json/plain` bytes of `json.dumps(value)`, the
+encoding of temporalloop before the engines were added: workers using different
+engines can exchange payloads, and the payloads of a workflow history do not
+change when an engine is installed or removed. Values unknown to JSON go
+through temporalio's AdvancedJSONEncoder.
+
+orjson cannot write these bytes (no `", "` separators, UTF-8 instead of
+`\\uXXXX` escapes, `NaN` encoded as `null`), the orjson engine only decodes with
+it. Documents orjson would read differently from the stdlib (`NaN`,
+`Infinity`, out of range floats, integers beyond 64 bits) are decoded by the
+stdlib.
+
+msgspec is not offered: it encodes datetimes natively with a `Z` suffix,
+breaking the byte-for-byte compatibility with the other engines.
+"""
+
+import json
+import os
+import string
+from collections.abc import Callable
+from typing import Any
+
+from temporalio.converter import AdvancedJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+# orjson reads integers beyond 64 bits as floats: documents with a run of 19 digits
+# or more go to the stdlib. Found by mapping every digit to 0, faster than a regex.
+_DIGITS = bytes(ord("0") if chr(i) in string.digits else ord(" ") for i in range(256))
+_LONG_NUMBER = b"0" * 19
+
+
+def json_default(value: Any) -> Any:
+    """Fallback for values unknown to JSON: datetimes, dataclasses, sets, UUIDs..."""
+    return AdvancedJSONEncoder().default(value)
+
+
+class JSONEngine:
+    name: str = ""
+
+    def dumps(self, value: Any, default: Callable[[Any], Any] = json_default) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class StdlibJSONEngine(JSONEngine):
+    name = "json"
+
+    def dumps(self, value: Any, default: Callable[[Any], Any] = json_default) -> bytes:
+        return json.dumps(value, default=default).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonJSONEngine(StdlibJSONEngine):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed, pip install temporalloop[fast]")
+
+    def loads(self, data: bytes) -> Any:
+        if _LONG_NUMBER not in data.translate(_DIGITS):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        # NaN, Infinity, 1e400... or invalid: the stdlib decides
+        return json.loads(data)
+
+
+JSON_ENGINES: dict[str, type[JSONEngine]] = {
+    "json": StdlibJSONEngine,
+    "orjson": OrjsonJSONEngine,
+}
+
+
+def get_json_engine(name: str = "auto") -> JSONEngine:
+    """Return the engine `name`, `auto` picks orjson when installed"""
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name not in JSON_ENGINES:
+        raise ValueError(f"Unknown JSON engine {name}, expected one of {['auto', *JSON_ENGINES]}")
+    return JSON_ENGINES[name]()
+
+
+DEFAULT_JSON_ENGINE: JSONEngine = get_json_engine(os.environ.get("TEMPORALLOOP_JSON_ENGINE", "auto"))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Run the heavy payload codec work off the event loop.
+
+Compressing, hashing or fetching a multi-MB payload on the event loop stalls the
+pollers and heartbeats of every other activity of the worker. Codecs built on
+:py:class:`PayloadCodecBase` process such payloads in a dedicated thread pool,
+separate from the activity executor; small payloads stay inline where the
+thread hop would cost more than the work.
+"""
+
+import asyncio
+import os
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import PayloadCodec
+
+DEFAULT_OFFLOAD_THRESHOLD = 256 * 1024
+
+
+class CodecExecutor:
+    """Process-wide thread pool of the codecs, created on first use"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.executor: ThreadPoolExecutor | None = None
+        self.max_workers = min(4, os.cpu_count() or 1)
+
+    def get(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="temporalloop-codec")
+            return self.executor
+
+    def configure(self, max_workers: int) -> None:
+        """Set the pool size, only effective before its first use"""
+        with self._lock:
+            if self.executor is None:
+                self.max_workers = max_workers
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+                self.executor = None
+
+
+CODEC_EXECUTOR = CodecExecutor()
+
+
+class PayloadCodecBase(PayloadCodec):
+    """Codec implemented by blocking per-payload methods.
+
+    Payloads for which :py:meth:`offload` is true are processed in
+    `CODEC_EXECUTOR`, concurrently; the others inline. `offload_threshold=None`
+    keeps everything inline.
+    """
+
+    offload_threshold: int | None = DEFAULT_OFFLOAD_THRESHOLD
+
+    def encode_payload(self, payload: Payload) -> Payload:
+        raise NotImplementedError
+
+    def decode_payload(self, payload: Payload) -> Payload:
+        raise NotImplementedError
+
+    def offload(self, payload: Payload, encode: bool) -> bool:
+        _ = encode
+        return self.offload_threshold is not None and len(payload.data) >= self.offload_threshold
+
+    async def _apply(
+        self, fn: Callable[[Payload], Payload], payloads: Sequence[Payload], encode: bool
+    ) -> list[Payload]:
+        offloaded = [i for i, p in enumerate(payloads) if self.offload(p, encode)]
+        if not offloaded:
+            return [fn(p) for p in payloads]
+        loop = asyncio.get_running_loop()
+        executor = CODEC_EXECUTOR.get()
+        futures = {i: loop.run_in_executor(executor, fn, payloads[i]) for i in offloaded}
+        results = [None if i in futures else fn(p) for i, p in enumerate(payloads)]
+        for i, result in zip(futures, await asyncio.gather(*futures.values()), strict=True):
+            results[i] = result
+        return results  # type: ignore[return-value]
+
+    async def encode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        return await self._apply(self.encode_payload, payloads, encode=True)
+
+    async def decode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        return await self._apply(self.decode_payload, payloads, encode=False)
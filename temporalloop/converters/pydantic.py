@@ -1,24 +1,50 @@
 #!/usr/bin/env python3
 
-import json
 from typing import Any
 
+from pydantic import BaseModel
+from pydantic.dataclasses import is_pydantic_dataclass
 from temporalio.api.common.v1 import Payload
 from temporalio.converter import (
     CompositePayloadConverter,
     DataConverter,
     DefaultPayloadConverter,
+    EncodingPayloadConverter,
     JSONPlainPayloadConverter,
+    value_to_type,
 )
+from temporalloop.converters.adapters import TYPE_ADAPTERS
+from temporalloop.converters.binary import MsgpackPayloadConverter
+from temporalloop.converters.jsonengine import DEFAULT_JSON_ENGINE, JSONEngine, json_default
+
+
+class _PydanticDefault:
+    """JSON `default` flagging the pydantic values, encoded by a TypeAdapter instead"""
+
+    def __init__(self) -> None:
+        self.found = False
+
+    def __call__(self, value: Any) -> Any:
+        if isinstance(value, BaseModel) or is_pydantic_dataclass(type(value)):
+            self.found = True
+            raise TypeError(f"{type(value)} is a pydantic value")
+        return json_default(value)
 
 
 class PydanticJSONPayloadConverter(JSONPlainPayloadConverter):
     """Pydantic JSON payload converter.
 
     This extends the :py:class:`JSONPlainPayloadConverter` to override
-    :py:meth:`to_payload` using the Pydantic encoder.
+    :py:meth:`to_payload` using the Pydantic encoder. Other values are encoded
+    and all payloads decoded with the JSON engine (orjson when installed).
+    Values holding pydantic models (lists, dicts, dataclasses...) and type hints
+    referencing them go through a cached TypeAdapter, in pydantic-core.
     """
 
+    def __init__(self, engine: JSONEngine | None = None) -> None:
+        super().__init__()
+        self.engine = engine or DEFAULT_JSON_ENGINE
+
     def to_payload(self, value: Any) -> Payload | None:
         """Convert all values with Pydantic encoder or fail.
 
@@ -33,26 +59,58 @@ class PydanticJSONPayloadConverter(JSONPlainPayloadConverter):
                 data=value.model_dump_json().encode(),
             )
 
+        default = _PydanticDefault()
+        try:
+            data = self.engine.dumps(value, default=default)
+        except TypeError:
+            if not default.found:
+                raise
+            data = TYPE_ADAPTERS.get(type(value)).dump_json(value)
         return Payload(
             metadata={"encoding": self.encoding.encode()},
-            data=json.dumps(value).encode(),
+            data=data,
         )
 
+    def from_payload(self, payload: Payload, type_hint: type | None = None) -> Any:
+        if type_hint is not None and TYPE_ADAPTERS.is_pydantic(type_hint):
+            return TYPE_ADAPTERS.get(type_hint).validate_json(payload.data)
+        try:
+            obj = self.engine.loads(payload.data)
+        except ValueError as err:
+            raise RuntimeError("Failed parsing") from err
+        if type_hint:
+            obj = value_to_type(type_hint, obj, self._custom_type_converters)
+        return obj
+
 
 # pyre-ignore[13]:
 class PydanticPayloadConverter(CompositePayloadConverter):
     """Payload converter that replaces Temporal JSON conversion with Pydantic
     JSON conversion.
+
+    Models marked with :py:func:`msgpack_encoded` are encoded with msgpack, all
+    models are with `msgpack_models`.
     """
 
+    msgpack_models: bool = False
+
     def __init__(self) -> None:
-        super().__init__(
-            *(
-                (c if not isinstance(c, JSONPlainPayloadConverter) else PydanticJSONPayloadConverter())
-                for c in DefaultPayloadConverter.default_encoding_payload_converters
-            )
-        )
+        converters: list[EncodingPayloadConverter] = []
+        for c in DefaultPayloadConverter.default_encoding_payload_converters:
+            if isinstance(c, JSONPlainPayloadConverter):
+                converters.extend([MsgpackPayloadConverter(self.msgpack_models), PydanticJSONPayloadConverter()])
+            else:
+                converters.append(c)
+        super().__init__(*converters)
+
+
+# pyre-ignore[13]:
+class PydanticMsgpackPayloadConverter(PydanticPayloadConverter):
+    msgpack_models = True
 
 
 pydantic_data_converter = DataConverter(payload_converter_class=PydanticPayloadConverter)
 """Data converter using Pydantic JSON conversion."""
+
+pydantic_msgpack_data_converter = DataConverter(payload_converter_class=PydanticMsgpackPayloadConverter)
+"""Data converter encoding all Pydantic models with msgpack, other values with JSON."""
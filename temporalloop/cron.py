@@ -0,0 +1,62 @@
+"""Cron expressions, parsed like the Temporal server does."""
+
+import re
+from datetime import datetime
+
+CRON_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+WEEKDAYS = ["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"]
+CRON_NAMES = {name: str(i) for i, name in enumerate(MONTHS, start=1)} | {
+    name: str(i) for i, name in enumerate(WEEKDAYS)
+}
+# (minimum, maximum) of minute, hour, day of month, month, day of week
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def cron_field(expr: str, low: int, high: int) -> set[int]:
+    values: set[int] = set()
+    for part in re.sub("[A-Z]{3}", lambda m: CRON_NAMES[m.group()], expr.upper()).split(","):
+        rng, _, step = part.partition("/")
+        if rng in ("*", "?"):
+            start, end = low, high
+        elif "-" in rng:
+            start, end = (int(v) for v in rng.split("-"))
+        else:
+            start = int(rng)
+            end = high if step else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Invalid cron field {expr}")
+        values.update(range(start, end + 1, int(step or 1)))
+    return values
+
+
+class CronExpression:
+    """5-field cron expression, names and @aliases included, matched like Temporal:
+    day of month and day of week restricted together must both match"""
+
+    def __init__(self, expr: str) -> None:
+        fields = CRON_ALIASES.get(expr.strip(), expr).split()
+        if len(fields) != 5:
+            raise ValueError(f"Unsupported cron expression {expr}, expected 5 fields")
+        self.minutes, self.hours, self.days, self.months, dow = (
+            cron_field(f, low, high) for f, (low, high) in zip(fields, CRON_FIELDS, strict=True)
+        )
+        self.weekdays = {d % 7 for d in dow}
+
+    def match(self, when: datetime) -> bool:
+        # Temporal requires both day fields to match, not either (unlike Vixie cron)
+        return (
+            when.minute in self.minutes
+            and when.hour in self.hours
+            and when.month in self.months
+            and when.day in self.days
+            and (when.isoweekday() % 7) in self.weekdays
+        )
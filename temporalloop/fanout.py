@@ -0,0 +1,109 @@
+"""Workflow-safe fan-out over a sliding window, with continue-as-new.
+
+Only the `window` outstanding tasks are scheduled at once, completions are
+handled in a deterministic order (`workflow.wait`). When the history gets too
+long, no new task is started, the outstanding ones are drained and the
+workflow continues as new from the checkpoint.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from temporalio import workflow
+
+DEFAULT_MAX_HISTORY_LENGTH = 10_000
+DEFAULT_MAX_HISTORY_SIZE = 20 * 1024 * 1024
+
+
+@dataclass
+class FanOutState:
+    """Checkpoint carried over continue-as-new: items before `cursor` are done"""
+
+    cursor: int = 0
+    completed: int = 0
+    runs: int = 1
+
+
+class FanOut[T, R]:
+    """Run `fn(item)` for the items of a sequence, at most `window` at a time.
+
+    `fn` starts an activity or a child workflow, e.g.
+    `lambda item: workflow.execute_activity(process, item, start_to_close_timeout=...)`.
+    `items` must be the same on every run and replay (workflow input, `range`...).
+    Results are passed to `on_result(index, result)` as they complete, none are
+    kept. The first error cancels the outstanding tasks and is raised.
+
+    Once the history passes `max_history_length` events or `max_history_size`
+    bytes, or the server suggests it, the workflow continues as new with the
+    argument returned by `next_run(state)`. Without `next_run`, :py:meth:`run`
+    returns the unfinished state instead.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[T], Awaitable[R]],
+        window: int = 10,
+        *,
+        next_run: Callable[[FanOutState], Any] | None = None,
+        max_history_length: int = DEFAULT_MAX_HISTORY_LENGTH,
+        max_history_size: int = DEFAULT_MAX_HISTORY_SIZE,
+    ) -> None:
+        self.fn = fn
+        self.window = window
+        self.next_run = next_run
+        self.max_history_length = max_history_length
+        self.max_history_size = max_history_size
+
+    def should_continue_as_new(self) -> bool:
+        info = workflow.info()
+        return (
+            info.is_continue_as_new_suggested()
+            or info.get_current_history_length() >= self.max_history_length
+            or info.get_current_history_size() >= self.max_history_size
+        )
+
+    async def run(
+        self,
+        items: Sequence[T],
+        state: FanOutState | None = None,
+        on_result: Callable[[int, R], None] | None = None,
+    ) -> FanOutState:
+        state = state or FanOutState()
+        pending: dict[asyncio.Task, int] = {}
+        done_ahead: set[int] = set()
+        index = state.cursor
+        stopping = False
+        try:
+            while True:
+                while not stopping and index < len(items) and len(pending) < self.window:
+                    pending[asyncio.create_task(self._call(items[index]))] = index
+                    index += 1
+                if not pending:
+                    break
+                done, _ = await workflow.wait(list(pending), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    position = pending.pop(task)
+                    result = task.result()
+                    if on_result is not None:
+                        on_result(position, result)
+                    done_ahead.add(position)
+                    state.completed += 1
+                while state.cursor in done_ahead:
+                    done_ahead.remove(state.cursor)
+                    state.cursor += 1
+                stopping = stopping or self.should_continue_as_new()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if state.cursor < len(items) and self.next_run is not None:
+            workflow.logger.info("Fan-out continues as new at %s/%s", state.cursor, len(items))
+            await workflow.wait_condition(workflow.all_handlers_finished)
+            next_state = FanOutState(cursor=state.cursor, completed=state.completed, runs=state.runs + 1)
+            workflow.continue_as_new(self.next_run(next_state))
+        return state
+
+    async def _call(self, item: T) -> R:
+        return await self.fn(item)
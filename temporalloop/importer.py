@@ -27,9 +27,15 @@
 # CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import contextlib
 import importlib
+import sys
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+from temporalloop.profiling import STARTUP_PROFILER
+
 
 class ImportFromStringError(Exception):
     pass
@@ -61,3 +67,37 @@ def import_from_string(import_str: Any) -> Any:
         raise ImportFromStringError(message.format(attrs_str=attrs_str, module_str=module_str)) from exc
 
     return instance
+
+
+IMPORT_CACHE: dict[str, Any] = {}
+
+
+def cached_import_from_string(import_str: Any) -> Any:
+    """import_from_string memoized per import string, for the lifetime of the process"""
+    if not isinstance(import_str, str):
+        return import_str
+    if import_str not in IMPORT_CACHE:
+        with STARTUP_PROFILER.measure("import", import_str):
+            IMPORT_CACHE[import_str] = import_from_string(import_str)
+    return IMPORT_CACHE[import_str]
+
+
+def _prefetch_module(module_str: str) -> None:
+    # errors are reported by import_from_string when the attribute is loaded
+    with STARTUP_PROFILER.measure("import-module", module_str), contextlib.suppress(Exception):
+        importlib.import_module(module_str)
+
+
+def import_modules(import_strs: Iterable[Any], max_workers: int = 8) -> None:
+    """Import the modules of `import_strs` concurrently.
+
+    Each module is imported under its own import lock, independent modules load
+    in parallel (mostly I/O and native extensions), the attributes are then
+    resolved from sys.modules.
+    """
+    modules = {s.partition(":")[0] for s in import_strs if isinstance(s, str)}
+    modules = sorted(m for m in modules if m and m not in sys.modules)
+    if not modules:
+        return
+    with ThreadPoolExecutor(min(max_workers, len(modules)), thread_name_prefix="temporalloop-import") as pool:
+        list(pool.map(_prefetch_module, modules))
@@ -0,0 +1,74 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+from temporalio.exceptions import CancelledError
+from temporalio.worker import (
+    ActivityInboundInterceptor,
+    ExecuteActivityInput,
+    Interceptor,
+)
+
+
+@dataclass
+class InflightTracker:
+    """Count the activities running on a worker and their outcome once draining.
+
+    Workflow tasks are not counted: they are short, the worker completes the
+    running ones on shutdown, and an interrupted one is retried by the server.
+    """
+
+    name: str
+    in_flight: int = 0
+    draining: bool = False
+    at_drain: int = 0
+    finished: int = 0
+    abandoned: int = 0
+    activity_types: dict[str, int] = field(default_factory=dict)
+
+    def start_drain(self) -> None:
+        self.draining = True
+        self.at_drain = self.in_flight
+
+    def started(self, activity_type: str) -> None:
+        self.in_flight += 1
+        self.activity_types[activity_type] = self.activity_types.get(activity_type, 0) + 1
+
+    def done(self, activity_type: str, cancelled: bool) -> None:
+        self.in_flight -= 1
+        self.activity_types[activity_type] -= 1
+        if not self.activity_types[activity_type]:
+            del self.activity_types[activity_type]
+        if self.draining:
+            if cancelled:
+                self.abandoned += 1
+            else:
+                self.finished += 1
+
+
+class _InflightActivityInboundInterceptor(ActivityInboundInterceptor):
+    def __init__(self, next: ActivityInboundInterceptor, tracker: InflightTracker) -> None:
+        super().__init__(next)
+        self.tracker = tracker
+
+    async def execute_activity(self, input: ExecuteActivityInput) -> Any:
+        activity_type = input.fn.__qualname__
+        self.tracker.started(activity_type)
+        cancelled = False
+        try:
+            return await super().execute_activity(input)
+        except (asyncio.CancelledError, CancelledError):
+            cancelled = True
+            raise
+        finally:
+            self.tracker.done(activity_type, cancelled)
+
+
+class InflightInterceptor(Interceptor):
+    """Track in-flight activities, used by the Looper to report the drain on shutdown"""
+
+    def __init__(self, tracker: InflightTracker) -> None:
+        self.tracker = tracker
+
+    def intercept_activity(self, next: ActivityInboundInterceptor) -> ActivityInboundInterceptor:
+        return _InflightActivityInboundInterceptor(super().intercept_activity(next), self.tracker)
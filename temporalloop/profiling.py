@@ -0,0 +1,65 @@
+import contextlib
+import logging
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+logger = logging.getLogger("temporalloop.info")
+
+
+@dataclass
+class StartupTiming:
+    category: str
+    name: str
+    duration: float
+
+
+@dataclass
+class StartupProfiler:
+    """Collect the time spent in each step of the worker boot.
+
+    Steps are grouped by category: `import` (per import string), `import-module`
+    (parallel module prefetch), `pre_init`, `connect` and `worker` construction.
+    Disabled by default, enabled by `looper --profile-startup`.
+    """
+
+    enabled: bool = False
+    timings: list[StartupTiming] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def enable(self) -> None:
+        self.enabled = True
+        self.timings = []
+        self.started_at = time.perf_counter()
+
+    @contextlib.contextmanager
+    def measure(self, category: str, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append(StartupTiming(category, name, time.perf_counter() - start))
+
+    def report(self, limit: int = 20) -> str:
+        total = time.perf_counter() - self.started_at
+        lines = [f"Startup profile, {total:.3f}s since start"]
+        categories: dict[str, float] = {}
+        for timing in self.timings:
+            categories[timing.category] = categories.get(timing.category, 0.0) + timing.duration
+        lines.append(f"  {'category':<15} {'total (s)':>10}")
+        for category, duration in sorted(categories.items(), key=lambda x: -x[1]):
+            lines.append(f"  {category:<15} {duration:>10.3f}")
+        lines.append(f"  {'category':<15} {'time (s)':>10}  name")
+        for timing in sorted(self.timings, key=lambda x: -x.duration)[:limit]:
+            lines.append(f"  {timing.category:<15} {timing.duration:>10.3f}  {timing.name}")
+        return "\n".join(lines)
+
+    def log_report(self) -> None:
+        if self.enabled:
+            logger.info(self.report())
+
+
+STARTUP_PROFILER = StartupProfiler()
@@ -0,0 +1,78 @@
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from temporalio.common import MetricMeter
+from temporalio.runtime import PrometheusConfig, Runtime, TelemetryConfig
+
+if TYPE_CHECKING:
+    from temporalloop.config import Config, WorkerConfig
+
+logger = logging.getLogger("temporalloop.info")
+
+
+class MetricsRuntime:
+    """Process-wide Runtime exporting Prometheus metrics.
+
+    The runtime is created on the first call, with the global metric settings of
+    `config`, and shared by every worker and client of the process afterward.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.runtime: Runtime | None = None
+        self.bind_address = ""
+
+    def get(self, config: "Config", bind_address: str) -> Runtime:
+        with self._lock:
+            if self.runtime is None:
+                global_tags = dict(config.metric_global_tags)
+                if config.process_index is not None:
+                    global_tags["process"] = str(config.process_index)
+                self.runtime = Runtime(
+                    telemetry=TelemetryConfig(
+                        metrics=PrometheusConfig(
+                            bind_address=bind_address,
+                            histogram_bucket_overrides=config.metric_histogram_buckets or None,
+                        ),
+                        global_tags=global_tags,
+                        metric_prefix=config.metric_prefix,
+                    )
+                )
+                self.bind_address = bind_address
+                logger.info("[Runtime] Serving metrics on %s", bind_address)
+            elif bind_address != self.bind_address:
+                logger.warning(
+                    "[Runtime] metrics are already served on %s, ignoring bind address %s",
+                    self.bind_address,
+                    bind_address,
+                )
+            return self.runtime
+
+    def reset(self) -> None:
+        with self._lock:
+            self.runtime = None
+            self.bind_address = ""
+
+
+METRICS_RUNTIME = MetricsRuntime()
+
+
+def metrics_runtime(config: "Config", bind_address: str) -> Runtime:
+    return METRICS_RUNTIME.get(config, bind_address)
+
+
+def worker_metric_meter(runtime: Runtime | None, config: "WorkerConfig") -> MetricMeter:
+    """Metric meter labeled with the worker name and task queue.
+
+    Temporal's own worker metrics already carry `task_queue`/`namespace`, this
+    meter is used for the metrics emitted by temporalloop.
+    """
+    return (runtime or Runtime.default()).metric_meter.with_additional_attributes(
+        {"worker": config.name, "task_queue": config.queue}
+    )
+
+
+def process_metric_meter() -> MetricMeter:
+    """Meter of the process metrics runtime, the SDK default runtime before it is set up"""
+    return (METRICS_RUNTIME.runtime or Runtime.default()).metric_meter
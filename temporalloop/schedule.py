@@ -1,15 +1,27 @@
 import asyncio
+import hashlib
+import json
 import logging
-from dataclasses import dataclass
+import math
+import random
+import re
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
 from typing import Any, Literal
 
 from temporalio.client import (
     Schedule,
     ScheduleActionStartWorkflow,
-    ScheduleHandle,
+    ScheduleAlreadyRunningError,
+    ScheduleCalendarSpec,
     ScheduleIntervalSpec,
+    ScheduleListActionStartWorkflow,
+    ScheduleListDescription,
+    ScheduleListSchedule,
     ScheduleOverlapPolicy,
     SchedulePolicy,
+    ScheduleRange,
     ScheduleSpec,
     ScheduleState,
     ScheduleUpdate,
@@ -17,25 +29,249 @@ from temporalio.client import (
 from temporalio.service import RPCError, RPCStatusCode
 
 from temporalloop.config import Config
-from temporalloop.config_loader import TemporalScheduleSchema
+from temporalloop.config_loader import TemporalInterval, TemporalScheduleSchema
+from temporalloop.cron import CronExpression
 from temporalloop.importer import ImportFromStringError, import_from_string
+from temporalloop.utils import RateLimiter, gather_with_concurrency, time_interval
 
 logger = logging.getLogger(__name__)
 
+# The fingerprint of the schedule definition is kept in the schedule note, which
+# list_schedules returns: unchanged schedules are detected without describe()
+FINGERPRINT_REGEX = re.compile(r"\[temporalloop:(?P<fingerprint>[0-9a-f]+)\]")
+LIST_PAGE_SIZE = 1000
+
+# RPCs done by the former describe-then-act sync, per (state, exists)
+NAIVE_RPCS: dict[tuple[str, bool], int] = {
+    ("created", True): 3,  # describe + update (describe + update)
+    ("created", False): 3,  # describe + describe + create
+    ("paused", True): 2,  # describe + pause
+    ("paused", False): 3,  # describe + describe + create
+    ("deleted", True): 2,  # describe + delete
+    ("deleted", False): 1,  # describe
+}
+
+ScheduleAction = Literal["create", "update", "pause", "unpause", "delete", "noop"]
+
+# Transient errors, typically the frontend rate limits: retried with a backoff
+RETRYABLE_STATUSES = {
+    RPCStatusCode.RESOURCE_EXHAUSTED,
+    RPCStatusCode.UNAVAILABLE,
+    RPCStatusCode.DEADLINE_EXCEEDED,
+    RPCStatusCode.ABORTED,
+}
+
+# RPCs done by each action of the plan
+ACTION_RPCS: dict[str, int] = {"create": 1, "update": 2, "pause": 1, "unpause": 1, "delete": 1, "noop": 0}
+
+
+def schedule_fingerprint(schedule: TemporalScheduleSchema) -> str:
+    """Hash of the schedule definition, its state excluded"""
+    definition = json.dumps(schedule.model_dump(mode="json", exclude={"state"}), sort_keys=True)
+    return hashlib.sha256(definition.encode()).hexdigest()[:16]
+
+
+def schedule_note(comment: str, fingerprint: str) -> str:
+    return f"{comment} [temporalloop:{fingerprint}]".strip()
+
+
+def note_fingerprint(note: str | None) -> str | None:
+    match = FINGERPRINT_REGEX.search(note or "")
+    return match.group("fingerprint") if match else None
+
+
+def stagger_offset(wid: str, every: timedelta) -> timedelta:
+    """Offset in [0, every) derived from the workflow id, whole seconds.
+
+    Stable across syncs and independent of the other schedules: adding a
+    schedule never moves the existing ones.
+    """
+    seconds = int(every.total_seconds())
+    if seconds <= 1:
+        return timedelta()
+    return timedelta(seconds=int.from_bytes(hashlib.sha256(wid.encode()).digest()[:8]) % seconds)
+
+
+def interval_spec(wid: str, interval: TemporalInterval) -> ScheduleIntervalSpec:
+    every = interval.every_timedelta()
+    offset = interval.offset_timedelta()
+    if offset is None and interval.stagger:
+        offset = stagger_offset(wid, every)
+    return ScheduleIntervalSpec(every=every, offset=offset)
+
+
+def schedule_spec(schedule: TemporalScheduleSchema) -> ScheduleSpec:
+    return ScheduleSpec(
+        intervals=[interval_spec(schedule.workflow_id, i) for i in schedule.intervals()],
+        cron_expressions=schedule.cron,
+        jitter=time_interval(schedule.jitter) if schedule.jitter else None,
+        time_zone_name=schedule.time_zone,
+    )
+
+
+def schedule_policy(schedule: TemporalScheduleSchema) -> SchedulePolicy:
+    policy = SchedulePolicy(overlap=ScheduleOverlapPolicy[schedule.overlap.upper()])
+    if schedule.catchup_window:
+        policy.catchup_window = time_interval(schedule.catchup_window)
+    return policy
+
+
+def range_values(ranges: Sequence[ScheduleRange]) -> frozenset[int]:
+    return frozenset(v for r in ranges for v in range(r.start, max(r.end, r.start) + 1, r.step or 1))
+
+
+def calendar_key(calendar: ScheduleCalendarSpec) -> tuple:
+    return (
+        range_values(calendar.second),
+        range_values(calendar.minute),
+        range_values(calendar.hour),
+        range_values(calendar.day_of_month),
+        range_values(calendar.month),
+        range_values(calendar.year) or None,  # empty: every year
+        frozenset(d % 7 for d in range_values(calendar.day_of_week)),
+    )
+
+
+def cron_key(expr: str) -> tuple | str:
+    try:
+        cron = CronExpression(expr)
+    except (KeyError, ValueError):
+        return expr
+    return (
+        frozenset({0}),
+        frozenset(cron.minutes),
+        frozenset(cron.hours),
+        frozenset(cron.days),
+        frozenset(cron.months),
+        None,
+        frozenset(cron.weekdays),
+    )
+
+
+def spec_key(spec: ScheduleSpec) -> tuple:
+    """Comparable form of a spec.
+
+    The server stores the cron expressions as calendars and the missing
+    offsets as zero: both sides are expanded to the matched values.
+    """
+    return (
+        sorted((i.every, i.offset or timedelta()) for i in spec.intervals),
+        {calendar_key(c) for c in spec.calendars} | {cron_key(c) for c in spec.cron_expressions},
+        {calendar_key(c) for c in spec.skip},
+        spec.start_at,
+        spec.end_at,
+        spec.jitter or timedelta(),
+        spec.time_zone_name or None,
+    )
+
 
 @dataclass
 class ScheduleDefinition:
     schedule: Schedule | None = None
     state: Literal["created", "deleted", "paused"] = "created"
     wid: str = ""
+    fingerprint: str = ""
+    note: str = ""
+
+
+def schedule_change(definition: ScheduleDefinition, live: ScheduleListSchedule) -> str | None:
+    """Why the listed schedule differs from its definition, None if it does not"""
+    if definition.schedule is None:
+        return None
+    if note_fingerprint(live.state.note) != definition.fingerprint:
+        return "definition changed"
+    # edits made outside of the config keep the note
+    if spec_key(live.spec) != spec_key(definition.schedule.spec):
+        return "spec changed"
+    action = definition.schedule.action
+    if (
+        not isinstance(live.action, ScheduleListActionStartWorkflow)
+        or not isinstance(action, ScheduleActionStartWorkflow)
+        or live.action.workflow != action.workflow
+    ):
+        return "workflow changed"
+    return None
 
 
+@dataclass
+class SchedulePlanItem:
+    wid: str
+    action: ScheduleAction
+    reason: str
+    naive_rpcs: int = 0
+    # set once applied: "ok" or "failed"
+    outcome: str = ""
+    attempts: int = 0
+    error: str = ""
+
+    @property
+    def rpcs(self) -> int:
+        return ACTION_RPCS[self.action]
+
+
+@dataclass
+class SchedulePlan:
+    items: list[SchedulePlanItem] = field(default_factory=list)
+    list_rpcs: int = 1
+
+    @property
+    def rpcs(self) -> int:
+        return self.list_rpcs + sum(i.rpcs for i in self.items)
+
+    @property
+    def naive_rpcs(self) -> int:
+        return sum(i.naive_rpcs for i in self.items)
+
+    @property
+    def changes(self) -> list[SchedulePlanItem]:
+        return [i for i in self.items if i.action != "noop"]
+
+    @property
+    def failed(self) -> list[SchedulePlanItem]:
+        return [i for i in self.items if i.outcome == "failed"]
+
+    def table(self) -> str:
+        width = max([len(i.wid) for i in self.items] + [8])
+        lines = [f"{'schedule':<{width}}  {'action':<8}  {'outcome':<8}  {'attempts':>8}  reason"]
+        lines.extend(
+            f"{i.wid:<{width}}  {i.action:<8}  {i.outcome or '-':<8}  {i.attempts:>8}  {i.error or i.reason}"
+            for i in self.items
+        )
+        lines.append(
+            f"{len(self.changes)} change(s), {len(self.failed)} failed, {self.rpcs} RPC(s) planned instead of"
+            f" {self.naive_rpcs}, {self.naive_rpcs - self.rpcs} saved"
+        )
+        return "\n".join(lines)
+
+
+# pylint: disable=too-many-instance-attributes
 class TemporalScheduler:
+    """Reconcile the schedules of the config with the server.
+
+    At most `concurrency` operations run at once, and no more than `rate_limit`
+    RPC attempts per second are started (0: unlimited). Retryable errors are
+    retried up to `max_attempts` times with an exponential backoff.
+    """
+
     def __init__(
-        self, client, schedules_entries: dict[str, TemporalScheduleSchema], config: Config | None = None
+        self,
+        client,
+        schedules_entries: dict[str, TemporalScheduleSchema],
+        config: Config | None = None,
+        *,
+        concurrency: int = 10,
+        rate_limit: float = 0,
+        max_attempts: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
     ) -> None:
         self.client = client
         self.config = config
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
         self.schedules: dict[str, ScheduleDefinition] = {}
         self.prep_schedules(schedules_entries)
 
@@ -74,81 +310,128 @@ class TemporalScheduler:
                     id=wid,
                     task_queue=schedule.task_queue,
                 ),
-                policy=SchedulePolicy(overlap=ScheduleOverlapPolicy.BUFFER_ONE),
-                spec=ScheduleSpec(
-                    intervals=[
-                        ScheduleIntervalSpec(
-                            every=schedule.interval.every_timedelta(),
-                            offset=schedule.interval.offset_timedelta(),
-                        ),
-                    ],
-                ),
+                policy=schedule_policy(schedule),
+                spec=schedule_spec(schedule),
                 state=ScheduleState(note=schedule.comment, paused=pause),
             )
-        self.schedules[schedule.workflow_id] = ScheduleDefinition(schedule=sch, state=schedule.state, wid=wid)
+        fingerprint = schedule_fingerprint(schedule)
+        note = schedule_note(schedule.comment, fingerprint)
+        if sch is not None:
+            sch.state.note = note
+        self.schedules[schedule.workflow_id] = ScheduleDefinition(
+            schedule=sch, state=schedule.state, wid=wid, fingerprint=fingerprint, note=note
+        )
 
     def prep_schedules(self, schedules: dict[str, TemporalScheduleSchema]) -> None:
         for wid, schedule in schedules.items():
             self.prep_schedule(wid, schedule)
 
-    async def get_schedule_handle(self, wid: str) -> ScheduleHandle | None:
-        """Get schedule by workflow id
-        Returns None if schedule is not found
-        """
-        try:
-            handle = self.client.get_schedule_handle(wid)
-            _ = await handle.describe()
-            return handle
-        except RPCError as exc:
-            if exc.status in [RPCStatusCode.NOT_FOUND]:
-                logger.info("Schedule %s is absent", wid)
-                return None
-            logger.error("unexpected error: %s", exc)
-            raise exc
-
-    async def created_schedule(self, wid: str, schedule: Schedule) -> ScheduleHandle:
-        """Create or Update existing schedule"""
-        handle = await self.get_schedule_handle(wid)
-        if handle is None:
-            logger.info("[%s] Creating schedule", wid)
-            return await self.client.create_schedule(id=wid, schedule=schedule)
-        logger.info("[%s] Updating schedule", wid)
-        await handle.update(lambda _: ScheduleUpdate(schedule=schedule))
-        return handle
-
-    async def paused_schedule(self, wid: str, schedule) -> ScheduleHandle:
-        """Pause schedule if exists, otherwise creates it and pause it"""
-        handle = await self.get_schedule_handle(wid)
-        if handle is not None:
-            logger.info("[%s] Pausing schedule", wid)
-            await handle.pause()
-        else:
-            logger.info("[%s] Pause, Schedule is absent", wid)
-            handle = await self.created_schedule(wid, schedule)
-        return handle
-
-    async def deleted_schedule(self, wid: str) -> bool:
-        """Delete schedule if exists"""
-        handle = await self.get_schedule_handle(wid)
-        if handle is not None:
-            logger.info("[%s] Deleting schedule", wid)
+    async def live_schedules(self) -> tuple[dict[str, ScheduleListDescription], int]:
+        """List the existing schedules, return them by id with the number of list RPCs"""
+
+        async def list_all() -> dict[str, ScheduleListDescription]:
+            iterator = await self.client.list_schedules(page_size=LIST_PAGE_SIZE)
+            return {description.id: description async for description in iterator}
+
+        live = await self.with_retry("list", list_all)
+        return live, max(1, math.ceil(len(live) / LIST_PAGE_SIZE))
+
+    async def with_retry[T](self, name: str, fn: Callable[[], Awaitable[T]], item: SchedulePlanItem | None = None) -> T:
+        """Call `fn` until it succeeds or fails with a non-retryable error"""
+        attempt = 1
+        while True:
+            await self.rate_limiter.acquire()
+            if item is not None:
+                item.attempts = attempt
+            try:
+                return await fn()
+            except RPCError as exc:
+                if exc.status not in RETRYABLE_STATUSES or attempt >= self.max_attempts:
+                    raise
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+                logger.warning(
+                    "[%s] %s, retrying in %.2fs (attempt %s/%s)",
+                    name,
+                    exc.status.name,
+                    delay,
+                    attempt,
+                    self.max_attempts,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def plan_schedule(
+        self, wid: str, definition: ScheduleDefinition, live: ScheduleListDescription | None
+    ) -> SchedulePlanItem:
+        naive_rpcs = NAIVE_RPCS[(definition.state, live is not None)]
+        if definition.state == "deleted":
+            action, reason = ("delete", "deleted in the config") if live is not None else ("noop", "absent")
+            return SchedulePlanItem(wid, action, reason, naive_rpcs)
+        if definition.schedule is None:
+            raise ValueError(f"Schedule {wid} is not defined.")
+        if live is None:
+            return SchedulePlanItem(wid, "create", "absent", naive_rpcs)
+        if live.schedule is None:
+            # servers without advanced visibility do not list the schedule details
+            return SchedulePlanItem(wid, "update", "no listed details", naive_rpcs)
+        if reason := schedule_change(definition, live.schedule):
+            return SchedulePlanItem(wid, "update", reason, naive_rpcs)
+        paused = definition.state == "paused"
+        if live.schedule.state.paused != paused:
+            return SchedulePlanItem(wid, "pause" if paused else "unpause", "state changed", naive_rpcs)
+        return SchedulePlanItem(wid, "noop", "up to date", naive_rpcs)
+
+    def plan(self, live: dict[str, ScheduleListDescription], list_rpcs: int = 1) -> SchedulePlan:
+        return SchedulePlan(
+            items=[self.plan_schedule(wid, d, live.get(wid)) for wid, d in self.schedules.items()],
+            list_rpcs=list_rpcs,
+        )
+
+    async def apply_item(self, item: SchedulePlanItem) -> None:
+        definition = self.schedules[item.wid]
+        handle = self.client.get_schedule_handle(item.wid)
+        if item.action == "create":
+            logger.info("[%s] Creating schedule", item.wid)
+            try:
+                await self.client.create_schedule(id=item.wid, schedule=definition.schedule)
+                return
+            except ScheduleAlreadyRunningError:
+                # the list is eventually consistent, the schedule was just created
+                logger.info("[%s] Schedule already exists, updating it", item.wid)
+        if item.action in ("create", "update"):
+            logger.info("[%s] Updating schedule", item.wid)
+            await handle.update(lambda _: ScheduleUpdate(schedule=definition.schedule))
+        elif item.action == "pause":
+            logger.info("[%s] Pausing schedule", item.wid)
+            await handle.pause(note=definition.note)
+        elif item.action == "unpause":
+            logger.info("[%s] Unpausing schedule", item.wid)
+            await handle.unpause(note=definition.note)
+        elif item.action == "delete":
+            logger.info("[%s] Deleting schedule", item.wid)
             await handle.delete()
-            return True
-        logger.info("[%s] Schedule is already deleted", wid)
-        return False
-
-    async def sync_schedules(self):
-        handlers = []
-        for wid, schedule in self.schedules.items():
-            if schedule.state == "deleted":
-                coro = self.deleted_schedule(wid)
-            elif schedule.state == "paused":
-                coro = self.paused_schedule(wid, schedule.schedule)
-            elif schedule.state == "created":
-                if schedule.schedule is None:
-                    raise ValueError(f"Schedule {wid} is not defined.")
-                coro = self.created_schedule(wid, schedule.schedule)
-            else:
-                raise ValueError(f"Unknown state {schedule.state} for schedule {wid}")
-            handlers.append(coro)
-        return await asyncio.gather(*handlers)
+
+    async def apply_with_retry(self, item: SchedulePlanItem) -> SchedulePlanItem:
+        """Apply one change, recording its outcome instead of raising"""
+        try:
+            await self.with_retry(item.wid, lambda: self.apply_item(item), item)
+            item.outcome = "ok"
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            item.outcome = "failed"
+            item.error = f"{type(exc).__name__}: {exc}"
+            logger.error("[%s] Failed to %s the schedule: %s", item.wid, item.action, exc)
+        return item
+
+    async def apply(self, plan: SchedulePlan) -> list[SchedulePlanItem]:
+        return await gather_with_concurrency(self.concurrency, *[self.apply_with_retry(i) for i in plan.changes])
+
+    async def sync_schedules(self) -> SchedulePlan:
+        """Create, update, pause or delete only the schedules differing from the config.
+
+        Failed operations do not stop the others, see `SchedulePlan.failed`.
+        """
+        live, list_rpcs = await self.live_schedules()
+        plan = self.plan(live, list_rpcs)
+        await self.apply(plan)
+        logger.info("Schedules sync:\n%s", plan.table())
+        return plan
@@ -0,0 +1,168 @@
+"""Offline forecast of the workflow starts of the schedules.
+
+The schedules of the config are expanded over a time window, without a server:
+the starts are counted per task queue and per bucket, then compared with the
+slots of the workers polling each queue.
+"""
+
+import math
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from temporalloop.config import Config
+from temporalloop.config_loader import TemporalScheduleSchema
+from temporalloop.cron import CronExpression
+from temporalloop.schedule import interval_spec
+from temporalloop.utils import time_interval
+
+
+def expand_interval(wid: str, schedule: TemporalScheduleSchema, start: datetime, end: datetime) -> Iterator[datetime]:
+    """Interval starts are aligned on the Unix epoch, shifted by the offset"""
+    epoch = datetime(1970, 1, 1, tzinfo=UTC)
+    for interval in schedule.intervals():
+        spec = interval_spec(wid, interval)
+        every = spec.every.total_seconds()
+        if every <= 0:
+            raise ValueError(f"Invalid interval {interval.every}, must be positive")
+        offset = (spec.offset or timedelta()).total_seconds()
+        k = math.ceil(((start - epoch).total_seconds() - offset) / every)
+        when = epoch + timedelta(seconds=k * every + offset)
+        while when < end:
+            yield when
+            when += spec.every
+
+
+def expand_cron(schedule: TemporalScheduleSchema, start: datetime, end: datetime) -> Iterator[datetime]:
+    crons = [CronExpression(c) for c in schedule.cron]
+    try:
+        tz = ZoneInfo(schedule.time_zone) if schedule.time_zone else UTC
+    except ZoneInfoNotFoundError as exc:
+        raise ValueError(f"Unknown time zone {schedule.time_zone}") from exc
+    when = start.replace(second=0, microsecond=0)
+    if when < start:
+        when += timedelta(minutes=1)
+    while when < end:
+        local = when.astimezone(tz)
+        if any(c.match(local) for c in crons):
+            yield when
+        when += timedelta(minutes=1)
+
+
+def schedule_starts(schedule: TemporalScheduleSchema, start: datetime, end: datetime) -> list[datetime]:
+    starts = set(expand_interval(schedule.workflow_id, schedule, start, end))
+    starts.update(expand_cron(schedule, start, end))
+    return sorted(starts)
+
+
+@dataclass
+class QueueForecast:
+    queue: str
+    schedules: int = 0
+    starts: float = 0
+    # starts per bucket, jittered starts are spread over the buckets they may fall in
+    buckets: dict[int, float] = field(default_factory=lambda: defaultdict(float))
+    workers: list[str] = field(default_factory=list)
+    workflow_slots: int = 0
+    activity_slots: int = 0
+
+    @property
+    def peak(self) -> tuple[int, float]:
+        return max(self.buckets.items(), key=lambda kv: (kv[1], -kv[0]), default=(0, 0.0))
+
+    @property
+    def status(self) -> str:
+        """`saturated` is a heuristic: each started workflow is assumed to hold an
+        activity slot for a whole bucket, so more starts in a bucket than activity
+        slots queue up. Workflow task slots are not compared, workflow tasks are short.
+        """
+        if not self.workers:
+            return "unserved"
+        if self.peak[1] > self.activity_slots:
+            return "saturated"
+        return "ok"
+
+
+@dataclass
+class Forecast:
+    start: datetime
+    window: timedelta
+    bucket: timedelta
+    queues: dict[str, QueueForecast] = field(default_factory=dict)
+    skipped: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def issues(self) -> list[QueueForecast]:
+        return [q for q in self.queues.values() if q.schedules and q.status != "ok"]
+
+    def table(self) -> str:
+        minutes = self.window.total_seconds() / 60
+        width = max([len(q) for q in self.queues] + [10])
+        lines = [
+            f"Forecast from {self.start.isoformat()} over {self.window}, buckets of {self.bucket}",
+            f"{'task queue':<{width}}  {'schedules':>9}  {'starts':>8}  {'avg/min':>8}  {'peak':>7}  "
+            f"{'peak at':<20}  {'wf slots':>8}  {'act slots':>9}  status",
+        ]
+        for q in sorted(self.queues.values(), key=lambda q: q.queue):
+            index, peak = q.peak
+            at = (self.start + index * self.bucket).strftime("%Y-%m-%d %H:%M:%S") if peak else "-"
+            lines.append(
+                f"{q.queue:<{width}}  {q.schedules:>9}  {q.starts:>8.0f}  {q.starts / minutes:>8.2f}  {peak:>7.1f}  "
+                f"{at:<20}  {q.workflow_slots:>8}  {q.activity_slots:>9}  {q.status}"
+            )
+        lines.extend(f"{wid}: not forecast, {reason}" for wid, reason in self.skipped.items())
+        lines.append(
+            f"{len(self.issues)} queue(s) unserved or saturated; saturated: the peak starts of a bucket exceed"
+            " the activity slots of the workers (heuristic: each started workflow holds an activity slot"
+            " for a bucket)"
+        )
+        return "\n".join(lines)
+
+
+def forecast(
+    config: Config,
+    window: timedelta = timedelta(days=1),
+    bucket: timedelta = timedelta(minutes=1),
+    start: datetime | None = None,
+) -> Forecast:
+    """Expand the active schedules of `config` over `window` from `start` (now by default)"""
+    if start is None:
+        now = datetime.now(UTC).timestamp()
+        start = datetime.fromtimestamp(now - now % bucket.total_seconds(), UTC)
+    end = start + window
+    result = Forecast(start=start, window=window, bucket=bucket)
+
+    for worker in config.build_workers():
+        worker.resolve(config)
+        queue = result.queues.setdefault(worker.queue, QueueForecast(worker.queue))
+        processes = max(worker.processes or 1, 1)
+        queue.workers.append(worker.name)
+        queue.workflow_slots += worker.max_concurrent_workflow_tasks * processes
+        queue.activity_slots += worker.max_activity_slots * processes
+
+    size = bucket.total_seconds()
+    for wid, schedule in config.schedules.items():
+        if schedule.state != "created":
+            continue
+        try:
+            starts = schedule_starts(schedule, start, end)
+        except ValueError as exc:
+            result.skipped[wid] = str(exc)
+            continue
+        queue = result.queues.setdefault(schedule.task_queue, QueueForecast(schedule.task_queue))
+        queue.schedules += 1
+        queue.starts += len(starts)
+        jitter = time_interval(schedule.jitter).total_seconds() if schedule.jitter else 0.0
+        for when in starts:
+            offset = (when - start).total_seconds()
+            first, last = int(offset // size), int((offset + jitter) // size)
+            if jitter == 0 or first == last:
+                queue.buckets[first] += 1
+                continue
+            # uniform over [offset, offset + jitter)
+            for index in range(first, last + 1):
+                overlap = min(offset + jitter, (index + 1) * size) - max(offset, index * size)
+                queue.buckets[index] += overlap / jitter
+    return result
@@ -0,0 +1,157 @@
+import asyncio
+import contextlib
+import hashlib
+import logging
+import time
+from typing import Any
+
+import yaml
+from temporalio.common import MetricMeter
+from temporalio.service import RPCError
+
+from temporalloop.config_loader import TemporalScheduleSchema
+from temporalloop.importer import ImportFromStringError
+from temporalloop.schedule import SchedulePlan, TemporalScheduler, schedule_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def load_schedules(data: bytes) -> dict[str, TemporalScheduleSchema]:
+    """Parse the `schedules` section of a config or schedules file"""
+    content = yaml.safe_load(data) or {}
+    return {key: TemporalScheduleSchema.model_validate(val) for key, val in (content.get("schedules") or {}).items()}
+
+
+def schedule_key(schedule: TemporalScheduleSchema) -> str:
+    return f"{schedule_fingerprint(schedule)}:{schedule.state}"
+
+
+# pylint: disable=too-many-instance-attributes
+class ScheduleWatcher:
+    """Keep the schedules of a file reconciled with the server.
+
+    The file is polled every `poll_interval` seconds; when its content changes,
+    only the entries whose definition or state changed are synced. Every
+    `resync_interval` seconds all the entries are synced, the changes then made
+    are drift (schedules edited or deleted outside of the config).
+    Entries removed from the file are left untouched, mark them `deleted`.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        path: str,
+        *,
+        poll_interval: float = 5.0,
+        resync_interval: float = 300.0,
+        metric_meter: MetricMeter | None = None,
+        **scheduler_kwargs: Any,
+    ) -> None:
+        self.client = client
+        self.path = path
+        self.poll_interval = poll_interval
+        self.resync_interval = resync_interval
+        self.scheduler_kwargs = scheduler_kwargs
+        self.digest = ""
+        self.keys: dict[str, str] = {}
+        self.schedules: dict[str, TemporalScheduleSchema] = {}
+        self.last_resync = 0.0
+        # changed entries not reconciled yet
+        self.dirty = False
+        self.should_exit = asyncio.Event()
+        self.latency = self.drift = self.failures = None
+        if metric_meter is not None:
+            self.latency = metric_meter.create_histogram_float(
+                "temporalloop_schedule_reconcile_latency", "Duration of a schedule reconciliation", "ms"
+            )
+            self.drift = metric_meter.create_counter(
+                "temporalloop_schedule_drift", "Schedules found out of sync with the config on resync"
+            )
+            self.failures = metric_meter.create_counter(
+                "temporalloop_schedule_reconcile_failures", "Schedule operations that failed"
+            )
+
+    def read(self) -> bool:
+        """Load the file if its content changed, return True if it did"""
+        with open(self.path, "rb") as file:
+            data = file.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if digest == self.digest:
+            return False
+        schedules = load_schedules(data)
+        # imports, inputs and duplicates are checked before replacing the last valid definitions
+        TemporalScheduler(self.client, schedules, **self.scheduler_kwargs)
+        self.schedules = schedules
+        self.digest = digest
+        self.dirty = True
+        return True
+
+    async def reconcile(self, schedules: dict[str, TemporalScheduleSchema], trigger: str) -> SchedulePlan:
+        start = time.perf_counter()
+        plan = await TemporalScheduler(self.client, schedules, **self.scheduler_kwargs).sync_schedules()
+        if self.latency is not None and self.failures is not None:
+            self.latency.record((time.perf_counter() - start) * 1000, {"trigger": trigger})
+            self.failures.add(len(plan.failed), {"trigger": trigger})
+        return plan
+
+    def update_keys(self, plan: SchedulePlan) -> None:
+        """Remember the reconciled definitions, failed ones are retried on the next poll"""
+        failed = {item.wid for item in plan.failed}
+        for wid, schedule in self.schedules.items():
+            if wid not in failed:
+                self.keys[wid] = schedule_key(schedule)
+        self.dirty = bool(failed)
+
+    async def on_change(self) -> None:
+        changed = {wid: s for wid, s in self.schedules.items() if self.keys.get(wid) != schedule_key(s)}
+        logger.info("[Watch] %s changed, %s schedule(s) to reconcile", self.path, len(changed))
+        plan = await self.reconcile(changed, "change") if changed else SchedulePlan()
+        self.update_keys(plan)
+
+    async def resync(self) -> None:
+        plan = await self.reconcile(self.schedules, "resync")
+        # changes of entries already reconciled are drift, not the pending edits of the file
+        drifted = [i for i in plan.changes if self.keys.get(i.wid) == schedule_key(self.schedules[i.wid])]
+        self.update_keys(plan)
+        self.last_resync = time.monotonic()
+        if drifted:
+            logger.warning("[Watch] %s schedule(s) drifted from the config", len(drifted))
+        if self.drift is not None:
+            for item in drifted:
+                self.drift.add(1, {"action": item.action})
+
+    async def tick(self) -> None:
+        try:
+            self.read()
+        except (OSError, yaml.YAMLError, ValueError, ImportFromStringError) as exc:
+            # keep the last valid definitions until the file is fixed
+            logger.error("[Watch] Failed to load %s: %s", self.path, exc)
+            self.count_failure("load")
+        resync = time.monotonic() - self.last_resync >= self.resync_interval
+        try:
+            if resync:
+                await self.resync()
+            elif self.dirty:
+                await self.on_change()
+        except RPCError as exc:
+            logger.error("[Watch] Reconciliation failed: %s %s", exc.status.name, exc)
+        except (ImportFromStringError, ValueError) as exc:
+            logger.error("[Watch] Failed to prepare the schedules: %s", exc)
+            self.count_failure("resync" if resync else "change")
+
+    def count_failure(self, trigger: str) -> None:
+        if self.failures is not None:
+            self.failures.add(1, {"trigger": trigger})
+
+    async def run(self) -> None:
+        logger.info(
+            "[Watch] Watching %s every %ss, resync every %ss", self.path, self.poll_interval, self.resync_interval
+        )
+        while not self.should_exit.is_set():
+            await self.tick()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self.should_exit.wait(), self.poll_interval)
+        logger.info("[Watch] Stopped")
+
+    def stop(self) -> None:
+        self.should_exit.set()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+import asyncio
+import logging
+import math
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.process import BaseProcess
+from types import FrameType
+from typing import TYPE_CHECKING
+
+from temporalloop.worker import HANDLED_SIGNALS, Looper
+
+if TYPE_CHECKING:
+    from temporalloop.config import Config
+
+logger = logging.getLogger("temporalloop.info")
+
+# Children are forked: the config (and every imported activity/workflow module)
+# is shared copy-on-write and nothing has to be pickled.
+MP_CONTEXT = multiprocessing.get_context("fork")
+
+
+def split_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "0.0.0.0", int(port)
+
+
+def child_metric_address(address: str, index: int) -> str:
+    """Children only listen on the loopback, next to the supervisor port"""
+    _, port = split_address(address)
+    return f"127.0.0.1:{port + 1 + index}"
+
+
+def sample_value(line: str) -> tuple[str, str]:
+    """Split a sample line into its series (name and labels) and its value"""
+    brace, space = line.find("{"), line.find(" ")
+    end = line.rfind("}") + 1 if brace != -1 and (space == -1 or brace < space) else space
+    return line[:end], line[end:].split(maxsplit=1)[0]
+
+
+def format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def merge_prometheus(texts: list[str]) -> str:
+    """Merge several Prometheus text expositions into one.
+
+    Children export the same metric families, distinguished by their `process`
+    label. HELP/TYPE headers must appear once per family, followed by all samples.
+    Identical series (same name and labels, e.g. without `process` label) are
+    summed: counters, histogram buckets, sums and counts add up across children.
+    """
+    headers: dict[str, list[str]] = {}
+    samples: dict[str, dict[str, list[str]]] = {}
+    for text in texts:
+        family = ""
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            if line.startswith("#"):
+                parts = line.split(" ", 3)
+                if len(parts) >= 3 and parts[1] in ("HELP", "TYPE"):
+                    family = parts[2]
+                    headers.setdefault(family, [])
+                    samples.setdefault(family, {})
+                    if not any(h.split(" ", 2)[1] == parts[1] for h in headers[family]):
+                        headers[family].append(line)
+                continue
+            series, _ = sample_value(line)
+            samples.setdefault(family, {}).setdefault(series, []).append(line)
+    lines: list[str] = []
+    for family, family_samples in samples.items():
+        lines.extend(headers.get(family, []))
+        for series, series_lines in family_samples.items():
+            if len(series_lines) == 1:
+                lines.append(series_lines[0])
+            else:
+                total = sum(float(sample_value(line)[1]) for line in series_lines)
+                lines.append(f"{series} {format_value(total)}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsAggregator:
+    """Serve the combined metrics of all children on the configured bind address"""
+
+    def __init__(self, bind_address: str, child_addresses: list[str], timeout: float = 5.0) -> None:
+        self.bind_address = bind_address
+        self.child_addresses = child_addresses
+        self.timeout = timeout
+        self._server: ThreadingHTTPServer | None = None
+
+    def scrape(self) -> str:
+        texts = []
+        for address in self.child_addresses:
+            try:
+                with urllib.request.urlopen(f"http://{address}/metrics", timeout=self.timeout) as resp:
+                    texts.append(resp.read().decode())
+            except OSError as exc:
+                # a child can be restarting, serve what is available
+                logger.debug("Failed to scrape %s: %s", address, exc)
+        return merge_prometheus(texts)
+
+    def start(self) -> None:
+        aggregator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                body = aggregator.scrape().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:  # pylint: disable=redefined-builtin
+                _ = format, args
+
+        self._server = ThreadingHTTPServer(split_address(self.bind_address), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info("[Supervisor] Serving merged metrics on %s", self.bind_address)
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+@dataclass
+class ChildProcess:
+    index: int
+    process: BaseProcess | None = None
+    started_at: float = 0.0
+    restart_delay: float = 0.0
+    restart_at: float = 0.0
+    restarts: int = field(default=0)
+
+
+def run_child(config: "Config", index: int, metric_bind_address: str) -> None:
+    """Entrypoint of a forked child: run the workers assigned to the slot `index`"""
+    # Out of the terminal process group: a Ctrl+C reaches the supervisor only, which
+    # then signals each child once. A second signal would abort the drain.
+    os.setpgrp()
+    for sig in HANDLED_SIGNALS:
+        signal.signal(sig, signal.SIG_DFL)
+    config.workers = [w for w in config.workers if max(w.processes, 1) > index]
+    config.process_index = index
+    if metric_bind_address:
+        config.metric_bind_address = metric_bind_address
+        for worker in config.workers:
+            worker.metric_bind_address = metric_bind_address
+    asyncio.run(Looper(config).run())
+
+
+# pylint: disable=too-many-instance-attributes
+class Supervisor:
+    """Pre-fork the workers in `config.max_processes` child processes.
+
+    The child `i` runs every worker configured with more than `i` processes.
+    Crashed children are restarted with an exponential backoff, SIGINT/SIGTERM
+    are forwarded to all children which then drain their workers. A second
+    signal is forwarded as well: the children exit without waiting for the drain.
+    """
+
+    def __init__(
+        self,
+        config: "Config",
+        shutdown_timeout: float | None = None,
+        max_restart_delay: float = 30.0,
+        stable_uptime: float = 60.0,
+    ) -> None:
+        self.config = config
+        # children drain their workers first
+        self.shutdown_timeout = shutdown_timeout
+        self.max_restart_delay = max_restart_delay
+        self.stable_uptime = stable_uptime
+        self.children: list[ChildProcess] = []
+        self.should_exit = False
+        self.metrics: MetricsAggregator | None = None
+
+    @property
+    def enable_metrics(self) -> bool:
+        return bool(self.config.metric_bind_address) and (
+            self.config.enable_metrics or any(w.enable_metrics for w in self.config.workers)
+        )
+
+    def child_metric_address(self, index: int) -> str:
+        if not self.enable_metrics:
+            return ""
+        return child_metric_address(self.config.metric_bind_address, index)
+
+    def spawn(self, child: ChildProcess) -> None:
+        child.process = MP_CONTEXT.Process(
+            target=run_child,
+            args=(self.config, child.index, self.child_metric_address(child.index)),
+            name=f"temporalloop-worker-{child.index}",
+        )
+        child.process.start()
+        child.started_at = time.monotonic()
+        logger.info("[Supervisor] Started child %s [pid:%s]", child.index, child.process.pid)
+
+    def reap(self, child: ChildProcess) -> None:
+        """Schedule the restart of a dead child"""
+        assert child.process is not None
+        exitcode = child.process.exitcode
+        child.process.close()
+        child.process = None
+        if time.monotonic() - child.started_at > self.stable_uptime:
+            child.restart_delay = 0.0
+        child.restart_at = time.monotonic() + child.restart_delay
+        logger.warning(
+            "[Supervisor] Child %s exited with code %s, restarting in %.1fs", child.index, exitcode, child.restart_delay
+        )
+        child.restart_delay = min(max(child.restart_delay * 2, 1.0), self.max_restart_delay)
+        child.restarts += 1
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        _ = frame
+        if self.should_exit:
+            logger.warning("[Supervisor] Received signal %s again: children exit without waiting for the drain", sig)
+            for child in self.children:
+                if child.process is not None and child.process.is_alive():
+                    child.process.terminate()
+            return
+        logger.warning("[Supervisor] Received signal %s: stopping the children", sig)
+        self.should_exit = True
+
+    def install_signal_handlers(self) -> None:
+        for sig in HANDLED_SIGNALS:
+            signal.signal(sig, self.handle_exit)
+
+    def run(self) -> None:
+        if not self.config.loaded:
+            self.config.load()
+        self.install_signal_handlers()
+        if self.enable_metrics:
+            self.metrics = MetricsAggregator(
+                self.config.metric_bind_address,
+                [self.child_metric_address(i) for i in range(self.config.max_processes)],
+            )
+            self.metrics.start()
+        self.children = [ChildProcess(index=i) for i in range(self.config.max_processes)]
+        for child in self.children:
+            self.spawn(child)
+        try:
+            self.watch()
+        finally:
+            self.stop()
+
+    def watch(self) -> None:
+        while not self.should_exit:
+            sentinels = [c.process.sentinel for c in self.children if c.process is not None]
+            multiprocessing.connection.wait(sentinels, timeout=0.5)
+            now = time.monotonic()
+            for child in self.children:
+                if self.should_exit:
+                    break
+                if child.process is not None and not child.process.is_alive():
+                    self.reap(child)
+                if child.process is None and now >= child.restart_at:
+                    self.spawn(child)
+
+    def stop(self) -> None:
+        alive = [c.process for c in self.children if c.process is not None and c.process.is_alive()]
+        for process in alive:
+            process.terminate()
+        shutdown_timeout = self.shutdown_timeout or self.config.drain_deadline + 5
+        deadline = time.monotonic() + shutdown_timeout
+        for process in alive:
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning("[Supervisor] Child %s did not drain in time, killing it", process.pid)
+                process.kill()
+                process.join()
+        if self.metrics is not None:
+            self.metrics.stop()
+        logger.info("[Supervisor] All children stopped")
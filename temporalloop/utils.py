@@ -2,15 +2,22 @@ import asyncio
 import contextlib
 import logging
 import re
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
 from datetime import timedelta
 from typing import Any
 
 import temporalio.client
-from ant31box.importer import import_from_string
+from pydantic import TypeAdapter
 from temporalio import activity
-from temporalio.client import WorkflowHandle
+from temporalio.client import WorkflowExecutionStatus, WorkflowHandle
+from temporalio.exceptions import CancelledError
 from temporalio.service import RPCError, RPCStatusCode
 
+from temporalloop.importer import cached_import_from_string
+
 logger = logging.getLogger(__name__)
 
 TIMEINTERVAL_REGEX = re.compile(r"((?P<hours>\d+?)h)?((?P<minutes>\d+?)m)?((?P<seconds>\d+?)s)?")
@@ -35,6 +42,77 @@ async def heartbeat_every(delay: int = 30):
             await heartbeat_task
 
 
+class HeartbeatCheckpoint:
+    """Heartbeat carrying a progress cursor, to resume a retried activity.
+
+    `cursor` starts from the details of the last heartbeat of the previous
+    attempt, validated as `cursor_type` when given, else `default`. `update`
+    records the new cursor and heartbeats at most every `interval` seconds: the
+    updates in between are coalesced, only the latest cursor is sent. It raises
+    CancelledError as soon as the activity is cancelled.
+    """
+
+    def __init__(self, interval: float = 30, default: Any = None, cursor_type: Any = None) -> None:
+        info = activity.info()
+        if info.heartbeat_timeout:
+            # heartbeat well within the timeout
+            interval = min(interval, info.heartbeat_timeout.total_seconds() / 2)
+        self.interval = interval
+        self.resumed = bool(info.heartbeat_details)
+        self.cursor = info.heartbeat_details[0] if self.resumed else default
+        if self.resumed and cursor_type is not None:
+            self.cursor = TypeAdapter(cursor_type).validate_python(self.cursor)
+        self._sent = time.monotonic()
+        self.dirty = False
+
+    def update(self, cursor: Any) -> None:
+        # cancelled: the cursor is not recorded, nor flushed on exit
+        if activity.is_cancelled():
+            raise CancelledError("Activity cancelled")
+        self.cursor = cursor
+        self.dirty = True
+        if time.monotonic() - self._sent >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._sent = time.monotonic()
+        self.dirty = False
+        if self.cursor is None:
+            activity.heartbeat()
+        else:
+            activity.heartbeat(self.cursor)
+
+    async def keepalive(self) -> None:
+        """Heartbeat while the cursor does not move, the cancellation is delivered on heartbeats"""
+        while True:
+            await asyncio.sleep(max(self.interval - (time.monotonic() - self._sent), 0))
+            if time.monotonic() - self._sent >= self.interval:
+                self.flush()
+
+
+@contextlib.asynccontextmanager
+async def heartbeat_checkpoint(interval: float = 30, default: Any = None, cursor_type: Any = None):
+    """Async activities: a :py:class:`HeartbeatCheckpoint` kept alive in the background.
+
+    The last cursor is sent on exit, also on failure: the next attempt resumes from it.
+
+        async with heartbeat_checkpoint(default=0) as checkpoint:
+            for index in range(checkpoint.cursor, len(items)):
+                await process(items[index])
+                checkpoint.update(index + 1)
+    """
+    checkpoint = HeartbeatCheckpoint(interval, default, cursor_type)
+    task = asyncio.create_task(checkpoint.keepalive())
+    try:
+        yield checkpoint
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        if checkpoint.dirty:
+            checkpoint.flush()
+
+
 def time_interval(time_str: str) -> timedelta:
     parts = TIMEINTERVAL_REGEX.match(time_str)
     if not parts:
@@ -48,6 +126,7 @@ def time_interval(time_str: str) -> timedelta:
 
 
 async def gather_with_concurrency(n, *coros):
+    """Await `coros`, `n` at a time. For large inputs use :py:func:`map_with_concurrency`"""
     semaphore = asyncio.Semaphore(n)
 
     async def sem_coro(coro):
@@ -57,6 +136,100 @@ async def gather_with_concurrency(n, *coros):
     return await asyncio.gather(*(sem_coro(c) for c in coros))
 
 
+class RateLimiter:
+    """Space the calls to `acquire` to at most `rate` per second, 0 disables the limit"""
+
+    def __init__(self, rate: float = 0) -> None:
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        wait = self._next - now
+        self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+async def _aiter[T](items: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+# pylint: disable=too-many-arguments,too-many-locals,too-many-branches
+async def map_with_concurrency[T, R](
+    fn: Callable[[T], Awaitable[R]],
+    items: Iterable[T] | AsyncIterable[T],
+    n: int = 10,
+    *,
+    ordered: bool = True,
+    fail_fast: bool = True,
+    timeout: float | None = None,
+    rate_limit: float = 0,
+) -> AsyncIterator[R | BaseException]:
+    """Yield `fn(item)` for each item, with at most `n` calls in flight.
+
+    Items are pulled from the (sync or async) iterable only when a slot is
+    free, so memory stays bounded whatever the input size. With `ordered`,
+    results come in input order; a slow item then holds back the following
+    ones, the `n` slots counting the results waiting to be yielded. With
+    `fail_fast` the first error is raised and the calls in flight are
+    cancelled, otherwise errors are yielded in place of the results. Each call
+    is limited to `timeout` seconds (TimeoutError) and at most `rate_limit`
+    calls are started per second. Consumers breaking early should wrap it in
+    `contextlib.aclosing` so the calls in flight are cancelled right away.
+    """
+    source = _aiter(items)
+    limiter = RateLimiter(rate_limit)
+    pending: dict[asyncio.Task, int] = {}
+    buffered: dict[int, R | BaseException] = {}
+    started = yielded = 0
+    exhausted = False
+
+    async def call(item: T) -> R:
+        await limiter.acquire()
+        if timeout is None:
+            return await fn(item)
+        return await asyncio.wait_for(fn(item), timeout)
+
+    try:
+        while True:
+            while not exhausted and len(pending) + len(buffered) < n:
+                try:
+                    item = await anext(source)
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending[asyncio.create_task(call(item))] = started
+                started += 1
+            if not pending:
+                break
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                error = task.exception()
+                if error is not None and fail_fast:
+                    raise error
+                result = task.result() if error is None else error
+                if not ordered:
+                    yield result
+                    continue
+                buffered[index] = result
+            while yielded in buffered:
+                yield buffered.pop(yielded)
+                yielded += 1
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 async def as_completed_with_concurrency(n, workflow, *coros):
     semaphore = asyncio.Semaphore(n)
 
@@ -79,7 +252,7 @@ async def get_handler(
     workflow_id: str,
     workflow_name: str,
 ) -> tuple[temporalio.client.WorkflowHandle[Any, Any], Any]:
-    workflow = import_from_string(workflow_name)
+    workflow = cached_import_from_string(workflow_name)
     # Retrieve running workflow handler
     return (
         client.get_workflow_handle_for(workflow_id=workflow_id, workflow=workflow.run),
@@ -100,3 +273,134 @@ async def find_workflow(client: temporalio.client.Client, jid: str, workflow: st
         logger.info("Workflow not found; %s", exc)
         return None
     return handler
+
+
+@dataclass
+class WorkflowLookup:
+    """Latest run of a workflow id, `handle` is None when it does not exist"""
+
+    handle: WorkflowHandle[Any, Any] | None
+    status: WorkflowExecutionStatus | None = None
+
+
+class WorkflowLookupCache:
+    """Lookups of :py:func:`find_workflows` by (namespace, workflow id), for `ttl` seconds.
+
+    Misses are kept `miss_ttl` seconds, not at all by default: a workflow may be
+    started right after it was not found.
+    """
+
+    def __init__(self, ttl: float = 5.0, max_size: int = 10_000, miss_ttl: float = 0.0) -> None:
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[str, str], tuple[float, WorkflowLookup]] = OrderedDict()
+
+    def get(self, namespace: str, wid: str) -> WorkflowLookup | None:
+        entry = self._entries.get((namespace, wid))
+        if entry is None:
+            return None
+        stored, lookup = entry
+        if time.monotonic() - stored > (self.ttl if lookup.handle is not None else self.miss_ttl):
+            del self._entries[(namespace, wid)]
+            return None
+        return lookup
+
+    def put(self, namespace: str, wid: str, lookup: WorkflowLookup) -> None:
+        if lookup.handle is None and self.miss_ttl <= 0:
+            self._entries.pop((namespace, wid), None)
+            return
+        self._entries[(namespace, wid)] = (time.monotonic(), lookup)
+        self._entries.move_to_end((namespace, wid))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+WORKFLOW_LOOKUPS = WorkflowLookupCache()
+# Namespaces whose visibility store rejects `WorkflowId IN (...)` (standard visibility)
+_NO_LIST_QUERY: set[str] = set()
+
+
+async def _list_workflows(
+    client: temporalio.client.Client, workflow: Any, wids: list[str], batch_size: int
+) -> dict[str, WorkflowLookup]:
+    """Latest run of each id found by visibility list queries, `batch_size` ids per query"""
+    found: dict[str, tuple[Any, WorkflowLookup]] = {}
+    for start in range(0, len(wids), batch_size):
+        batch = ", ".join(f"'{wid}'" for wid in wids[start : start + batch_size])
+        async for execution in client.list_workflows(f"WorkflowId IN ({batch})"):
+            previous = found.get(execution.id)
+            if previous is None or execution.start_time > previous[0]:
+                handle = client.get_workflow_handle_for(workflow.run, execution.id)
+                found[execution.id] = (execution.start_time, WorkflowLookup(handle, execution.status))
+    return {wid: lookup for wid, (_, lookup) in found.items()}
+
+
+async def _describe_workflow(client: temporalio.client.Client, workflow: Any, wid: str) -> WorkflowLookup:
+    handle = client.get_workflow_handle_for(workflow.run, wid)
+    try:
+        description = await handle.describe()
+    except RPCError as exc:
+        if exc.status != RPCStatusCode.NOT_FOUND:
+            raise exc
+        return WorkflowLookup(None)
+    return WorkflowLookup(handle, description.status)
+
+
+# pylint: disable=too-many-arguments
+async def find_workflows(
+    client: temporalio.client.Client,
+    wids: Iterable[str],
+    workflow: str,
+    *,
+    batch_size: int = 100,
+    concurrency: int = 20,
+    cache: WorkflowLookupCache | None = WORKFLOW_LOOKUPS,
+) -> dict[str, WorkflowLookup]:
+    """Bulk :py:func:`find_workflow`: the latest run of each id, with its status.
+
+    The ids are looked up with visibility list queries of `batch_size` ids. The
+    ids absent from the results, visibility being eventually consistent, and
+    all of them when the namespace does not support the query, are described,
+    `concurrency` at a time. Lookups are cached for `cache.ttl` seconds, misses
+    for `cache.miss_ttl`, pass `cache=None` to bypass it.
+    """
+    namespace = client.namespace
+    workflow_cls = cached_import_from_string(workflow)
+    result: dict[str, WorkflowLookup] = {}
+    missing: list[str] = []
+    for wid in dict.fromkeys(wids):
+        lookup = cache.get(namespace, wid) if cache is not None else None
+        if lookup is None:
+            missing.append(wid)
+        elif lookup.handle is None:
+            result[wid] = lookup
+        else:
+            # the cached handle may come from another client or workflow class
+            result[wid] = WorkflowLookup(client.get_workflow_handle_for(workflow_cls.run, wid), lookup.status)
+
+    # quoted ids cannot be embedded in the query
+    listable = [wid for wid in missing if "'" not in wid and "\\" not in wid]
+    if listable and namespace not in _NO_LIST_QUERY:
+        try:
+            result.update(await _list_workflows(client, workflow_cls, listable, batch_size))
+        except RPCError as exc:
+            if exc.status not in (RPCStatusCode.INVALID_ARGUMENT, RPCStatusCode.UNIMPLEMENTED):
+                raise exc
+            logger.info("Visibility list queries unavailable in %s, describing the workflows: %s", namespace, exc)
+            _NO_LIST_QUERY.add(namespace)
+
+    async def describe(wid: str) -> tuple[str, WorkflowLookup]:
+        return wid, await _describe_workflow(client, workflow_cls, wid)
+
+    async for wid, lookup in map_with_concurrency(  # type: ignore[misc]
+        describe, [wid for wid in missing if wid not in result], concurrency
+    ):
+        result[wid] = lookup
+    if cache is not None:
+        for wid in missing:
+            cache.put(namespace, wid, result[wid])
+    return result
@@ -1,25 +1,39 @@
 #!/usr/bin/env python3
 import asyncio
 import dataclasses
+import functools
+import inspect
 import logging
+import multiprocessing
+import os
 import signal
 import threading
+import time
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import timedelta
 from types import FrameType
 from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 from temporalio import workflow
 from temporalio.client import Client
-from temporalio.runtime import PrometheusConfig, Runtime, TelemetryConfig
-from temporalio.worker import Worker
+from temporalio.common import MetricMeter
+from temporalio.worker import (
+    ResourceBasedSlotConfig,
+    SharedStateManager,
+    Worker,
+    WorkerTuner,
+)
 from temporalio.worker.workflow_sandbox import (
     SandboxedWorkflowRunner,
     SandboxRestrictions,
 )
 
+from temporalloop.client import CLIENT_POOL, LOCAL_WORKERS
 from temporalloop.importer import import_from_string
+from temporalloop.interceptors.inflight import InflightInterceptor, InflightTracker
+from temporalloop.profiling import STARTUP_PROFILER
+from temporalloop.runtime import metrics_runtime, worker_metric_meter
 
 if TYPE_CHECKING:
     from temporalloop.config import Config, WorkerConfig
@@ -33,15 +47,24 @@ HANDLED_SIGNALS = (
     signal.SIGTERM,  # Unix signal 15. Sent by `kill <pid>`.
 )
 
-# We always want to pass through external modules to the sandbox that we know
-# are safe for workflow use
-with workflow.unsafe.imports_passed_through():
-    # import are not used, but listed
-    _ = import_from_string("pydantic:BaseModel")
-    _ = import_from_string("temporalloop.converters.pydantic:pydantic_data_converter")
+# TunerConfigSchema defaults, for tuner dicts set without the schema
+DEFAULT_TARGET_USAGE = 0.8
+
+
+@functools.cache
+def passthrough_imports() -> None:
+    """We always want to pass through external modules to the sandbox that we know
+    are safe for workflow use. Imported on the first worker creation rather than
+    when this module is imported, to keep the CLI startup light.
+    """
+    with workflow.unsafe.imports_passed_through():
+        # import are not used, but listed
+        _ = import_from_string("pydantic:BaseModel")
+        _ = import_from_string("temporalloop.converters.pydantic:pydantic_data_converter")
 
 
 def new_sandbox_runner() -> SandboxedWorkflowRunner:
+    passthrough_imports()
     # TODO(cretz): Use with_child_unrestricted when https://github.com/temporalio/sdk-python/issues/254
     # is fixed and released
     invalid_module_member_children = dict(SandboxRestrictions.invalid_module_members_default.children)
@@ -57,39 +80,184 @@ def new_sandbox_runner() -> SandboxedWorkflowRunner:
     )
 
 
+def new_resource_slot_config(slot: dict[str, Any] | None) -> ResourceBasedSlotConfig | None:
+    if not slot:
+        return None
+    ramp_throttle_ms = slot.get("ramp_throttle_ms")
+    return ResourceBasedSlotConfig(
+        minimum_slots=slot.get("minimum_slots"),
+        maximum_slots=slot.get("maximum_slots"),
+        ramp_throttle=timedelta(milliseconds=ramp_throttle_ms) if ramp_throttle_ms is not None else None,
+    )
+
+
+def new_tuner(tuner: dict[str, Any] | None) -> WorkerTuner | None:
+    """Resource-based tuner sizing the task slots after the CPU and memory usage.
+
+    Returns None in `fixed` mode, the worker then uses max_concurrent_* slots.
+    """
+    if not tuner or tuner.get("mode", "fixed") != "resource_based":
+        return None
+    return WorkerTuner.create_resource_based(
+        target_memory_usage=tuner.get("target_memory_usage", DEFAULT_TARGET_USAGE),
+        target_cpu_usage=tuner.get("target_cpu_usage", DEFAULT_TARGET_USAGE),
+        workflow_config=new_resource_slot_config(tuner.get("workflow")),
+        activity_config=new_resource_slot_config(tuner.get("activity")),
+        local_activity_config=new_resource_slot_config(tuner.get("local_activity")),
+    )
+
+
+class PreInitHooks:
+    """Run each pre_init hook once per process.
+
+    Workers listing the same hook wait for its single execution. Coroutine
+    functions are awaited, sync hooks run in the event loop or, with
+    `in_thread`, in a thread so they don't block the other workers startup.
+    """
+
+    def __init__(self) -> None:
+        self._runs: dict[Callable[..., Any], asyncio.Future[None]] = {}
+
+    async def run(self, hook: Callable[..., Any], in_thread: bool = False) -> None:
+        future = self._runs.get(hook)
+        if future is None:
+            future = asyncio.ensure_future(self._execute(hook, in_thread))
+            self._runs[hook] = future
+        else:
+            logger.debug("[Pre-init][%s] already executed", hook)
+        await asyncio.shield(future)
+
+    async def _execute(self, hook: Callable[..., Any], in_thread: bool) -> None:
+        name = getattr(hook, "__qualname__", str(hook))
+        logger.info("[Execute][Pre-init][%s]", name)
+        start = time.perf_counter()
+        with STARTUP_PROFILER.measure("pre_init", name):
+            if inspect.iscoroutinefunction(hook):
+                await hook()
+            elif in_thread:
+                await asyncio.to_thread(hook)
+            else:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await result
+        logger.info("[Pre-init][%s] done in %.3fs", name, time.perf_counter() - start)
+
+    def clear(self) -> None:
+        self._runs.clear()
+
+
+PRE_INIT_HOOKS = PreInitHooks()
+
+
 class WorkerFactory:
     def __init__(self, config: "Config"):
         self.config = config
         self.new_runtime = None
+        self.shared_state_manager: SharedStateManager | None = None
+        self.inflight: InflightTracker | None = None
 
     async def client(self, config):
-        if self.config.metric_bind_address and self.config.enable_metrics:
-            self.new_runtime = Runtime(
-                telemetry=TelemetryConfig(metrics=PrometheusConfig(bind_address=self.config.metric_bind_address))
+        if config.metric_bind_address and config.enable_metrics:
+            self.new_runtime = metrics_runtime(self.config, config.metric_bind_address)
+
+        with STARTUP_PROFILER.measure("connect", f"{config.name}:{config.host}/{config.namespace}"):
+            return await CLIENT_POOL.get(
+                config.host,
+                config.namespace,
+                data_converter=config.converter,
+                runtime=self.new_runtime,
+                channels=config.client_channels,
             )
 
-        kwargs: dict[str, Any] = {"namespace": config.namespace}
-        if self.new_runtime is not None:
-            kwargs["runtime"] = self.new_runtime
+    def metric_meter(self, config: "WorkerConfig") -> MetricMeter:
+        return worker_metric_meter(self.new_runtime, config)
+
+    def activity_executor(self, config: "WorkerConfig") -> Executor:
+        """Build the executor running the sync activities of the worker.
 
-        if config.converter is not None:
-            kwargs["data_converter"] = config.converter
+        - thread: a ThreadPoolExecutor, sized after the activity slots by default:
+          max_concurrent_activities, or the tuner maximum slots in resource_based mode
+        - process: a ProcessPoolExecutor (one process per CPU by default) for CPU-bound
+          activities, they must be picklable module-level functions
+        - "module:callable": a user factory called with the worker config
+        """
+        kind = config.activity_executor or "thread"
+        if kind == "thread":
+            return ThreadPoolExecutor(config.activity_executor_workers or max(config.max_activity_slots + 1, 10))
+        if kind == "process":
+            # The Core runtime threads are not fork-safe, start fresh interpreters
+            self.shared_state_manager = SharedStateManager.create_from_multiprocessing(
+                multiprocessing.get_context("spawn").Manager()
+            )
+            return ProcessPoolExecutor(
+                config.activity_executor_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        executor = import_from_string(kind)(config)
+        if not isinstance(executor, ThreadPoolExecutor):
+            self.shared_state_manager = SharedStateManager.create_from_multiprocessing(
+                multiprocessing.get_context("spawn").Manager()
+            )
+        return executor
 
-        return await Client.connect(config.host, **kwargs)
+    def record_slots(self, config: "WorkerConfig") -> None:
+        """Export the slot settings, the live usage is reported by the Core
+        `worker_task_slots_used`/`worker_task_slots_available` metrics.
+        """
+        meter = self.metric_meter(config)
+        tuner = config.tuner or {}
+        mode = tuner.get("mode", "fixed")
+        slots = meter.create_gauge("temporalloop_worker_slots", "Task slots bounds of the worker")
+        if mode != "resource_based":
+            slots.set(config.max_concurrent_workflow_tasks, {"slot_type": "workflow", "bound": "max", "mode": mode})
+            slots.set(config.max_concurrent_activities, {"slot_type": "activity", "bound": "max", "mode": mode})
+            return
+        targets = meter.create_gauge_float("temporalloop_worker_tuner_target", "Resource usage targeted by the tuner")
+        targets.set(tuner.get("target_cpu_usage", DEFAULT_TARGET_USAGE), {"resource": "cpu"})
+        targets.set(tuner.get("target_memory_usage", DEFAULT_TARGET_USAGE), {"resource": "memory"})
+        for slot_type in ("workflow", "activity", "local_activity"):
+            for bound in ("minimum", "maximum"):
+                value = (tuner.get(slot_type) or {}).get(f"{bound}_slots")
+                if value is not None:
+                    slots.set(value, {"slot_type": slot_type, "bound": bound[:3], "mode": mode})
+
+    def worker_options(self, config: "WorkerConfig") -> dict[str, Any]:
+        graceful_shutdown_timeout = None
+        if config.graceful_shutdown_timeout is not None:
+            graceful_shutdown_timeout = timedelta(seconds=config.graceful_shutdown_timeout)
+        return {
+            "max_cached_workflows": config.max_cached_workflows,
+            "max_concurrent_workflow_task_polls": config.max_concurrent_workflow_task_polls,
+            "max_concurrent_activity_task_polls": config.max_concurrent_activity_task_polls,
+            "nonsticky_to_sticky_poll_ratio": config.nonsticky_to_sticky_poll_ratio,
+            "max_activities_per_second": config.max_activities_per_second,
+            "max_task_queue_activities_per_second": config.max_task_queue_activities_per_second,
+            "graceful_shutdown_timeout": graceful_shutdown_timeout,
+        }
 
-    async def execute_preinit(self, fn: list[Callable[..., Any]]) -> None:
+    async def execute_preinit(
+        self, fn: list[Callable[..., Any]], concurrent: bool = False, in_thread: bool = False
+    ) -> None:
+        if concurrent:
+            await asyncio.gather(*[PRE_INIT_HOOKS.run(x, in_thread) for x in fn])
+            return
         for x in fn:
-            logger.info("[Execute][Pre-init][%s]", x)
-            x()
+            await PRE_INIT_HOOKS.run(x, in_thread)
 
     async def new_worker(self, worker_config: "WorkerConfig") -> Worker:
         config = worker_config
-        await self.execute_preinit(worker_config.pre_init)
+        await self.execute_preinit(
+            worker_config.pre_init,
+            concurrent=worker_config.pre_init_concurrent,
+            in_thread=worker_config.pre_init_in_thread,
+        )
         logger.info(
             (
                 "[Start worker][%s][queue:%s][workflows:%s]"
                 "[activities:%s][max_concurrent_workflow_tasks:%s]"
                 "[max_concurrent_activities:%s][metric_bind_address:%s]"
+                "[activity_executor:%s][tuner:%s][profile:%s]"
+                "[disable_eager_activity_execution:%s]"
             ),
             config.name,
             config.queue,
@@ -98,49 +266,139 @@ class WorkerFactory:
             config.max_concurrent_workflow_tasks,
             config.max_concurrent_activities,
             config.metric_bind_address,
+            config.activity_executor,
+            config.tuner,
+            config.profile,
+            config.disable_eager_activity_execution,
         )
         client = await self.client(config)
+        LOCAL_WORKERS.register(client, config.queue)
+        self.inflight = InflightTracker(config.name)
+        tuner = new_tuner(config.tuner)
+        slots: dict[str, Any] = {"tuner": tuner}
+        if tuner is None:
+            slots = {
+                "max_concurrent_workflow_tasks": config.max_concurrent_workflow_tasks,
+                "max_concurrent_activities": config.max_concurrent_activities,
+                "max_concurrent_local_activities": config.max_concurrent_local_activities,
+            }
+        # Unset settings are left to the SDK defaults
+        options = {k: v for k, v in {**slots, **self.worker_options(config)}.items() if v is not None}
+        self.record_slots(config)
         # Run a worker for the workflow
+        with STARTUP_PROFILER.measure("worker", config.name):
+            return self._new_worker(client, config, options)
+
+    def _new_worker(self, client: Client, config: "WorkerConfig", options: dict[str, Any]) -> Worker:
         return Worker(
             client,
             task_queue=config.queue,
             workflows=config.workflows,
             activities=config.activities,
-            disable_eager_activity_execution=False,
-            max_concurrent_workflow_tasks=config.max_concurrent_workflow_tasks,
-            max_concurrent_activities=config.max_concurrent_activities,
-            interceptors=[x() for x in config.interceptors],
-            activity_executor=ThreadPoolExecutor(max(config.max_concurrent_activities + 1, 10)),
+            disable_eager_activity_execution=config.disable_eager_activity_execution,
+            **options,
+            interceptors=[InflightInterceptor(self.inflight)] + [x() for x in config.interceptors],
+            activity_executor=self.activity_executor(config),
+            shared_state_manager=self.shared_state_manager,
             workflow_runner=new_sandbox_runner(),
-            graceful_shutdown_timeout=timedelta(seconds=10),
         )
 
 
 class Looper:
     def __init__(self, config: "Config"):
         self.config = config
-        self.workers: list[Worker] = []
+        # workers recorded as they are built, a drain during the startup only sees these
+        self.workers: list[tuple[Worker, WorkerConfig]] = []
+        self.factories: list[WorkerFactory] = []
+        self.running = False
         self.should_exit = False
+        self._run_task: asyncio.Task | None = None
+        self._drain_task: asyncio.Task | None = None
 
     async def stop(self) -> None:
-        logger.info("Worker shutdown requested")
-        group = [asyncio.wait_for(x.shutdown(), 3) for x in self.workers]
-        await asyncio.gather(*group)
+        """Stop polling and wait for the in-flight tasks, up to the drain deadline.
+
+        Each worker cancels its remaining activities after its
+        graceful_shutdown_timeout, the whole drain is bounded by `drain_deadline`.
+        """
+        self.unregister_workers()
+        if not self.running:
+            # Not polling yet: Worker.shutdown would wait for a run that never starts
+            logger.info("Worker shutdown requested before the workers started")
+            return
+        logger.info("Worker shutdown requested, draining up to %ss", self.config.drain_deadline)
+        workers = list(self.workers)
+        group = [asyncio.wait_for(worker.shutdown(), self.config.drain_deadline) for worker, _ in workers]
+        for (_, worker_config), res in zip(workers, await asyncio.gather(*group, return_exceptions=True), strict=True):
+            if isinstance(res, BaseException):
+                logger.warning("[Drain][%s] shutdown did not complete: %r", worker_config.name, res)
+
+    def unregister_workers(self) -> None:
+        """Stop requesting eager starts on the task queues of the workers"""
+        for worker, worker_config in self.workers:
+            LOCAL_WORKERS.unregister(worker.client, worker_config.queue)
+
+    async def drain(self) -> None:
+        trackers = [factory.inflight for factory in self.factories if factory.inflight is not None]
+        for tracker in trackers:
+            tracker.start_drain()
+        await self.stop()
+        # factories are created in the order of the workers, all at once, or not yet
+        for factory, worker_config in zip(self.factories, self.config.workers, strict=False):
+            self.report_drain(factory, worker_config)
+
+    def report_drain(self, factory: WorkerFactory, worker_config: "WorkerConfig") -> None:
+        tracker = factory.inflight
+        if tracker is None:
+            return
+        # Still running after the deadline: abandoned as well
+        abandoned = tracker.abandoned + tracker.in_flight
+        logger.info(
+            "[Drain][%s] activities in-flight:%s finished:%s abandoned:%s %s",
+            worker_config.name,
+            tracker.at_drain,
+            tracker.finished,
+            abandoned,
+            tracker.activity_types or "",
+        )
+        counter = factory.metric_meter(worker_config).create_counter(
+            "temporalloop_drain_activities", "Activities in-flight when the worker was drained, by outcome"
+        )
+        counter.add(tracker.finished, {"outcome": "finished"})
+        counter.add(abandoned, {"outcome": "abandoned"})
 
     async def run(self):
+        self._run_task = asyncio.current_task()
         self.install_signal_handlers()
         if not self.config.loaded:
             self.config.load()
         logger.info("Config loaded %s", self.config.workers[0].converter)
         logger.info("Connecting %s workers", len(self.config.workers))
-        self.workers = await self.prepare_workers()
-        logger.info("Starting %s workers", len(self.config.workers))
-        await asyncio.gather(*[x.run() for x in self.workers])
+        workers = await self.prepare_workers()
+        STARTUP_PROFILER.log_report()
+        if self.should_exit:
+            logger.info("Shutdown requested during startup, not starting the workers")
+        else:
+            logger.info("Starting %s workers", len(workers))
+            self.running = True
+            try:
+                await asyncio.gather(*[x.run() for x in workers])
+            finally:
+                self.unregister_workers()
+        if self._drain_task is not None:
+            await self._drain_task
 
     async def prepare_workers(self) -> list[Worker]:
+        self.factories = [worker_config.factory(self.config) for worker_config in self.config.workers]
+
+        async def prepare(factory: WorkerFactory, worker_config: "WorkerConfig") -> Worker:
+            worker = await factory.new_worker(worker_config)
+            self.workers.append((worker, worker_config))
+            return worker
+
         group = []
-        for worker_config in self.config.workers:
-            group.append(worker_config.factory(self.config).new_worker(worker_config))
+        for factory, worker_config in zip(self.factories, self.config.workers, strict=True):
+            group.append(prepare(factory, worker_config))
         res: list[Worker] = cast(list[Worker], await asyncio.gather(*group))
         return res
 
@@ -154,9 +412,16 @@ class Looper:
             asyncio.get_running_loop().add_signal_handler(sig, self.handle_exit, sig, None)
 
     def handle_exit(self, sig: int, frame: FrameType | None) -> None:
-        """Handle exit signals by setting the interrupt event."""
+        """Handle exit signals: drain the workers, a second signal forces the exit."""
         _ = frame
-        if sig in (signal.SIGTERM, signal.SIGINT):
-            logger.warning("Received signal %s: stopping the workers", sig)
-            raise SystemExit(0)
-        logger.info("Received Signal %s: ignored", sig)
+        if sig not in (signal.SIGTERM, signal.SIGINT):
+            logger.info("Received Signal %s: ignored", sig)
+            return
+        if self.should_exit:
+            logger.warning("Received signal %s again: exiting without waiting for the drain", sig)
+            if self._run_task is not None:
+                self._run_task.cancel()
+            return
+        logger.warning("Received signal %s: draining the workers", sig)
+        self.should_exit = True
+        self._drain_task = asyncio.get_running_loop().create_task(self.drain())
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from datetime import timedelta
+
+from temporalio import activity, workflow
+
+with workflow.unsafe.imports_passed_through():
+    from temporalloop.fanout import FanOut, FanOutState
+
+
+@dataclass
+class FanOutJob:
+    count: int
+    window: int = 3
+    max_history_length: int = 10_000
+    state: FanOutState | None = None
+    total: int = 0
+
+
+@activity.defn
+async def double(item: int) -> int:
+    return item * 2
+
+
+@workflow.defn
+class FanOutWorkflow:
+    def __init__(self) -> None:
+        self.total = 0
+
+    @workflow.run
+    async def run(self, job: FanOutJob) -> int:
+        self.total = job.total
+
+        def on_result(_index: int, result: int) -> None:
+            self.total += result
+
+        fan = FanOut(
+            lambda item: workflow.execute_activity(double, item, start_to_close_timeout=timedelta(seconds=10)),
+            window=job.window,
+            next_run=lambda state: FanOutJob(
+                count=job.count,
+                window=job.window,
+                max_history_length=job.max_history_length,
+                state=state,
+                total=self.total,
+            ),
+            max_history_length=job.max_history_length,
+        )
+        await fan.run(range(job.count), job.state, on_result)
+        return self.total
+
+
+@workflow.defn(name="FanOutWorkflow")
+class SerialFanOutWorkflow(FanOutWorkflow):
+    """FanOutWorkflow changed incompatibly: one outstanding activity at a time"""
+
+    @workflow.run
+    async def run(self, job: FanOutJob) -> int:
+        job.window = 1
+        return await super().run(job)
@@ -0,0 +1,281 @@
+"""Record workflow histories without a Temporal server.
+
+The recorder plays the server: each workflow task is replayed with
+:py:class:`temporalio.worker.Replayer` over the history built so far, the
+commands of the last (new) workflow task are captured and turned into history
+events, then the chosen activities are completed. The histories are written
+with :py:meth:`WorkflowHistory.to_json` and replayed by the tests.
+
+Regenerate the recorded histories with `python -m tests.history_recorder`.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from google.protobuf.timestamp_pb2 import Timestamp
+from temporalio.api.common.v1 import ActivityType, Payloads, WorkflowType
+from temporalio.api.enums.v1 import EventType
+from temporalio.api.history.v1 import HistoryEvent
+from temporalio.api.taskqueue.v1 import TaskQueue
+from temporalio.client import WorkflowHistory
+from temporalio.converter import DataConverter
+from temporalio.worker import Replayer, WorkflowInstance, WorkflowRunner
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner
+
+from tests.fanout_workflows import FanOutJob, FanOutWorkflow
+
+HISTORIES = Path(__file__).parent / "histories"
+IDENTITY = "history-recorder"
+
+
+class _RecordingInstance(WorkflowInstance):
+    def __init__(self, instance: WorkflowInstance, completions: list) -> None:
+        self.instance = instance
+        self.completions = completions
+
+    def activate(self, act):
+        completion = self.instance.activate(act)
+        self.completions.append((act, completion))
+        return completion
+
+    def get_serialization_context(self, command_info):
+        return self.instance.get_serialization_context(command_info)
+
+    def get_external_store_context(self, command_info):
+        return self.instance.get_external_store_context(command_info)
+
+    def get_info(self):
+        return self.instance.get_info()
+
+    def get_thread_id(self):
+        return self.instance.get_thread_id()
+
+
+class _RecordingRunner(WorkflowRunner):
+    def __init__(self, runner: WorkflowRunner) -> None:
+        self.runner = runner
+        self.completions: list = []
+
+    def prepare_workflow(self, defn) -> None:
+        self.runner.prepare_workflow(defn)
+
+    def create_instance(self, det):
+        return _RecordingInstance(self.runner.create_instance(det), self.completions)
+
+
+# pylint: disable=too-many-instance-attributes
+class HistoryRecorder:
+    """History of one workflow run, built one workflow task at a time"""
+
+    def __init__(self, workflow: type, workflow_id: str = "fanout", task_queue: str = "fanout-queue") -> None:
+        self.workflow = workflow
+        self.workflow_type = getattr(workflow, "__temporal_workflow_definition").name
+        self.workflow_id = workflow_id
+        self.task_queue = task_queue
+        self.converter = DataConverter.default.payload_converter
+        self.events: list[HistoryEvent] = []
+        self.time = datetime(2026, 1, 1, tzinfo=UTC)
+        # activity id -> (scheduled event id, input) of the activities not completed yet
+        self.scheduled: dict[str, tuple[int, Any]] = {}
+        self.result: Any = None
+        self.continued_as_new: Payloads | None = None
+        self.run_id = str(uuid.uuid5(uuid.NAMESPACE_URL, workflow_id))
+
+    @property
+    def closed(self) -> bool:
+        return self.result is not None or self.continued_as_new is not None
+
+    def history(self) -> WorkflowHistory:
+        return WorkflowHistory(self.workflow_id, list(self.events))
+
+    def _add(self, event_type: EventType.ValueType, **attributes: Any) -> int:
+        self.time += timedelta(milliseconds=10)
+        timestamp = Timestamp()
+        timestamp.FromDatetime(self.time)
+        event = HistoryEvent(event_id=len(self.events) + 1, event_time=timestamp, event_type=event_type, **attributes)
+        self.events.append(event)
+        return event.event_id
+
+    def start(self, *args: Any, input_payloads: Payloads | None = None, continued_run_id: str = "") -> None:
+        if continued_run_id:
+            self.run_id = str(uuid.uuid5(uuid.NAMESPACE_URL, continued_run_id))
+        self._add(
+            EventType.EVENT_TYPE_WORKFLOW_EXECUTION_STARTED,
+            workflow_execution_started_event_attributes={
+                "workflow_type": WorkflowType(name=self.workflow_type),
+                "task_queue": TaskQueue(name=self.task_queue),
+                "input": input_payloads or Payloads(payloads=self.converter.to_payloads(args)),
+                "workflow_task_timeout": timedelta(seconds=10),
+                "continued_execution_run_id": continued_run_id,
+                "original_execution_run_id": self.run_id,
+                "first_execution_run_id": self.run_id,
+                "attempt": 1,
+                "identity": IDENTITY,
+                "workflow_id": self.workflow_id,
+            },
+        )
+
+    async def workflow_task(self) -> None:
+        """Run a workflow task and append its commands to the history"""
+        scheduled = self._add(
+            EventType.EVENT_TYPE_WORKFLOW_TASK_SCHEDULED,
+            workflow_task_scheduled_event_attributes={
+                "task_queue": TaskQueue(name=self.task_queue),
+                "start_to_close_timeout": timedelta(seconds=10),
+                "attempt": 1,
+            },
+        )
+        started = self._add(
+            EventType.EVENT_TYPE_WORKFLOW_TASK_STARTED,
+            workflow_task_started_event_attributes={
+                "scheduled_event_id": scheduled,
+                "identity": IDENTITY,
+                "request_id": str(uuid.uuid4()),
+                "history_size_bytes": sum(e.ByteSize() for e in self.events),
+            },
+        )
+        runner = _RecordingRunner(SandboxedWorkflowRunner())
+        await Replayer(workflows=[self.workflow], workflow_runner=runner).replay_workflow(self.history())
+        # activations of the new workflow task, the replayed ones were checked against the history
+        commands = []
+        flags: list[int] = []
+        for act, completion in runner.completions:
+            if act.history_length == started and completion.HasField("successful"):
+                commands.extend(completion.successful.commands)
+                flags.extend(completion.successful.used_internal_flags)
+        completed = self._add(
+            EventType.EVENT_TYPE_WORKFLOW_TASK_COMPLETED,
+            workflow_task_completed_event_attributes={
+                "scheduled_event_id": scheduled,
+                "started_event_id": started,
+                "identity": IDENTITY,
+                "sdk_metadata": {"lang_used_flags": sorted(set(flags))},
+            },
+        )
+        for command in commands:
+            self._command(command, completed)
+
+    def _command(self, command: Any, completed: int) -> None:
+        kind = command.WhichOneof("variant")
+        if kind == "schedule_activity":
+            attrs = command.schedule_activity
+            event_id = self._add(
+                EventType.EVENT_TYPE_ACTIVITY_TASK_SCHEDULED,
+                activity_task_scheduled_event_attributes={
+                    "activity_id": attrs.activity_id,
+                    "activity_type": ActivityType(name=attrs.activity_type),
+                    "task_queue": TaskQueue(name=attrs.task_queue or self.task_queue),
+                    "input": Payloads(payloads=attrs.arguments),
+                    "start_to_close_timeout": attrs.start_to_close_timeout,
+                    "workflow_task_completed_event_id": completed,
+                },
+            )
+            self.scheduled[attrs.activity_id] = (event_id, self.converter.from_payloads(attrs.arguments)[0])
+        elif kind == "complete_workflow_execution":
+            self._add(
+                EventType.EVENT_TYPE_WORKFLOW_EXECUTION_COMPLETED,
+                workflow_execution_completed_event_attributes={
+                    "result": Payloads(payloads=[command.complete_workflow_execution.result]),
+                    "workflow_task_completed_event_id": completed,
+                },
+            )
+            self.result = self.converter.from_payloads([command.complete_workflow_execution.result])[0]
+        elif kind == "continue_as_new_workflow_execution":
+            attrs = command.continue_as_new_workflow_execution
+            self.continued_as_new = Payloads(payloads=attrs.arguments)
+            self._add(
+                EventType.EVENT_TYPE_WORKFLOW_EXECUTION_CONTINUED_AS_NEW,
+                workflow_execution_continued_as_new_event_attributes={
+                    "new_execution_run_id": str(uuid.uuid5(uuid.NAMESPACE_URL, self.run_id)),
+                    "workflow_type": WorkflowType(name=attrs.workflow_type or self.workflow_type),
+                    "task_queue": TaskQueue(name=attrs.task_queue or self.task_queue),
+                    "input": self.continued_as_new,
+                    "workflow_task_timeout": timedelta(seconds=10),
+                    "workflow_task_completed_event_id": completed,
+                },
+            )
+        else:
+            raise NotImplementedError(f"Command {kind} is not recorded")
+
+    def complete_activity(self, activity_id: str, result: Any) -> None:
+        scheduled, _ = self.scheduled.pop(activity_id)
+        started = self._add(
+            EventType.EVENT_TYPE_ACTIVITY_TASK_STARTED,
+            activity_task_started_event_attributes={
+                "scheduled_event_id": scheduled,
+                "identity": IDENTITY,
+                "request_id": str(uuid.uuid4()),
+                "attempt": 1,
+            },
+        )
+        self._add(
+            EventType.EVENT_TYPE_ACTIVITY_TASK_COMPLETED,
+            activity_task_completed_event_attributes={
+                "result": Payloads(payloads=self.converter.to_payloads([result])),
+                "scheduled_event_id": scheduled,
+                "started_event_id": started,
+                "identity": IDENTITY,
+            },
+        )
+
+
+def out_of_order(step: int, pending: Sequence[str]) -> list[str]:
+    """Activities completed before the workflow task `step`: the latest scheduled
+    first, and two at once every third task"""
+    if step % 3 == 2 and len(pending) > 1:
+        return [pending[-1], pending[0]]
+    return [pending[-1]]
+
+
+async def record_runs(
+    workflow: type,
+    *args: Any,
+    activity: Callable[[Any], Any],
+    completions: Callable[[int, Sequence[str]], list[str]] = out_of_order,
+    workflow_id: str = "fanout",
+) -> list[HistoryRecorder]:
+    """Record the runs of a workflow until it completes, following its continue-as-new"""
+    runs: list[HistoryRecorder] = []
+    recorder = HistoryRecorder(workflow, workflow_id)
+    recorder.start(*args)
+    step = 0
+    while True:
+        await recorder.workflow_task()
+        if recorder.continued_as_new is not None:
+            runs.append(recorder)
+            previous = recorder
+            recorder = HistoryRecorder(workflow, workflow_id)
+            recorder.start(input_payloads=previous.continued_as_new, continued_run_id=previous.run_id)
+            continue
+        if recorder.closed:
+            runs.append(recorder)
+            return runs
+        for activity_id in completions(step, list(recorder.scheduled)):
+            recorder.complete_activity(activity_id, activity(recorder.scheduled[activity_id][1]))
+        step += 1
+
+
+def history_path(name: str) -> Path:
+    return HISTORIES / f"{name}.json"
+
+
+async def record_fanout_histories() -> None:
+    def double(item: int) -> int:
+        return item * 2
+
+    HISTORIES.mkdir(exist_ok=True)
+    (window,) = await record_runs(FanOutWorkflow, FanOutJob(count=12, window=4), activity=double)
+    history_path("fanout_window").write_text(window.history().to_json())
+    runs = await record_runs(
+        FanOutWorkflow, FanOutJob(count=12, window=3, max_history_length=40), activity=double, workflow_id="fanout-can"
+    )
+    for index, run in enumerate(runs, start=1):
+        history_path(f"fanout_continue_as_new_{index}").write_text(run.history().to_json())
+
+
+if __name__ == "__main__":
+    asyncio.run(record_fanout_histories())
@@ -0,0 +1,79 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+from temporalio.api.common.v1 import Payload
+from temporalloop.converters.claimcheck import (
+    CLAIM_CHECK_ENCODING,
+    BlobStore,
+    ClaimCheckCodec,
+    FileSystemBlobStore,
+    S3BlobStore,
+    new_blob_store,
+)
+
+SMALL = Payload(metadata={"encoding": b"json/plain"}, data=b'"small"')
+LARGE = Payload(metadata={"encoding": b"json/plain"}, data=json.dumps("x" * 4096).encode())
+
+
+async def round_trip(store: BlobStore) -> None:
+    codec = ClaimCheckCodec(store, threshold=1024)
+    encoded = await codec.encode([SMALL, LARGE])
+    assert encoded[0] == SMALL
+    assert encoded[1].metadata["encoding"] == CLAIM_CHECK_ENCODING
+    key = json.loads(encoded[1].data)["key"]
+    assert key == hashlib.sha256(LARGE.SerializeToString()).hexdigest()
+    # a fresh codec has nothing cached: the blob comes from the store
+    assert await ClaimCheckCodec(store, threshold=1024).decode(encoded) == [SMALL, LARGE]
+    assert store.put(key, LARGE.SerializeToString()) is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mmap_threshold", [1, 1024 * 1024], ids=["mmap", "read"])
+async def test_file_store_round_trip(tmp_path: Path, mmap_threshold: int) -> None:
+    await round_trip(FileSystemBlobStore(str(tmp_path), mmap_threshold=mmap_threshold))
+
+
+@pytest.mark.parametrize("key", ["../../etc/passwd", "ab/../../x", "", "A" * 64, "0" * 63, "0" * 64 + "/x"])
+def test_file_store_rejects_invalid_keys(tmp_path: Path, key: str) -> None:
+    store = FileSystemBlobStore(str(tmp_path))
+    with pytest.raises(ValueError, match="Invalid claim-check blob key"):
+        store.put(key, b"data")
+    with pytest.raises(ValueError, match="Invalid claim-check blob key"):
+        store.get(key)
+
+
+@pytest.mark.asyncio
+async def test_decode_rejects_invalid_keys(tmp_path: Path) -> None:
+    codec = ClaimCheckCodec(FileSystemBlobStore(str(tmp_path)))
+    payload = Payload(metadata={"encoding": CLAIM_CHECK_ENCODING}, data=b'{"key": "../../etc/passwd"}')
+    with pytest.raises(ValueError, match="Invalid claim-check blob key"):
+        await codec.decode([payload])
+
+
+def test_file_store_needs_a_path() -> None:
+    with pytest.raises(ValueError, match="needs a path"):
+        new_blob_store({"store": "file", "path": ""})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mmap_threshold", [1, 1024 * 1024], ids=["mmap", "read"])
+async def test_s3_store_round_trip(monkeypatch: pytest.MonkeyPatch, mmap_threshold: int) -> None:
+    moto = pytest.importorskip("moto")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        store = S3BlobStore("blobs", prefix="/claims/", region_name="us-east-1", mmap_threshold=mmap_threshold)
+        store.client.create_bucket(Bucket="blobs")
+        await round_trip(store)
+        (obj,) = store.client.list_objects_v2(Bucket="blobs")["Contents"]
+        assert obj["Key"].startswith("claims/")
+        with pytest.raises(ValueError, match="Invalid claim-check blob key"):
+            store.get("../" + obj["Key"])
+
+
+def test_s3_store_needs_a_bucket() -> None:
+    pytest.importorskip("boto3")
+    with pytest.raises(ValueError, match="needs a bucket"):
+        S3BlobStore("")
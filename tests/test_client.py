@@ -0,0 +1,32 @@
+import pytest
+from temporalloop.client import TClient, client_converter
+from temporalloop.converters.codecs import CODEC_CONVERTERS
+from temporalloop.converters.compression import CompressionCodec
+from temporalloop.converters.pydantic import pydantic_data_converter, pydantic_msgpack_data_converter
+
+CODEC = {"compression": "zlib", "compression_threshold": 64}
+RESULT = {"items": ["x" * 32] * 32}
+
+
+def test_plain_client_converter() -> None:
+    assert client_converter() is pydantic_data_converter
+    assert client_converter(codec={"compression": "none"}) is pydantic_data_converter
+
+
+def test_client_converter_from_import_string() -> None:
+    converter = client_converter("temporalloop.converters.pydantic:pydantic_msgpack_data_converter", CODEC)
+    assert converter.payload_converter_class is pydantic_msgpack_data_converter.payload_converter_class
+    assert isinstance(converter.payload_codec, CompressionCodec)
+
+
+@pytest.mark.asyncio
+async def test_client_reads_worker_payloads() -> None:
+    # as built by WorkerConfig.load
+    worker = CODEC_CONVERTERS.get(pydantic_data_converter, CODEC)
+    assert worker is not None
+    client = await TClient("localhost:7233", "default", codec=CODEC).client()
+    # same settings: the very same converter, hence the same pooled connection
+    assert client.data_converter is worker
+    payloads = await worker.encode([RESULT])
+    assert payloads[0].metadata["encoding"] != b"json/plain"
+    assert await client.data_converter.decode(payloads) == [RESULT]
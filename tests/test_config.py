@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+from temporalloop.config import WORKER_PROFILES, WorkerConfig
+from temporalloop.config_loader import config_from_dict, load_config_from_yaml
+
+ROOT = Path(__file__).parent.parent
+
+
+def resolved(temporalio: dict, **worker) -> WorkerConfig:
+    config = config_from_dict({"temporalio": {**temporalio, "workers": [{"name": "w", **worker}]}})
+    (w,) = config.build_workers()
+    w.resolve(config)
+    return w
+
+
+def test_worker_profile_beats_global_settings() -> None:
+    config = load_config_from_yaml(str(ROOT / "config.yaml"))
+    (a,) = config.build_workers()
+    a.resolve(config)
+    low_memory = WORKER_PROFILES["low-memory"]
+    assert a.max_cached_workflows == 200
+    assert a.max_concurrent_activities == low_memory["max_concurrent_activities"]
+    assert a.max_concurrent_workflow_task_polls == low_memory["max_concurrent_workflow_task_polls"]
+    # not in the low-memory profile: global setting
+    assert a.nonsticky_to_sticky_poll_ratio == 0.2
+
+
+def test_global_settings_beat_global_profile() -> None:
+    w = resolved({"profile": "throughput", "max_concurrent_activities": 50})
+    assert w.profile == "throughput"
+    assert w.max_concurrent_activities == 50
+    assert w.max_concurrent_workflow_tasks == WORKER_PROFILES["throughput"]["max_concurrent_workflow_tasks"]
+
+
+def test_explicit_zero_is_kept() -> None:
+    w = resolved(
+        {"max_cached_workflows": 1000, "graceful_shutdown_timeout": 30},
+        max_cached_workflows=0,
+        graceful_shutdown_timeout=0,
+        profile="latency",
+    )
+    assert w.max_cached_workflows == 0
+    assert w.graceful_shutdown_timeout == 0
+
+
+def test_defaults() -> None:
+    w = resolved({})
+    assert w.max_concurrent_activities == 100
+    assert w.max_concurrent_workflow_tasks == 100
+    assert w.graceful_shutdown_timeout == 10.0
+    assert w.max_cached_workflows is None
+
+
+def test_unknown_profile() -> None:
+    w = WorkerConfig(profile="fastest")
+    with pytest.raises(ValueError, match="Unknown worker profile"):
+        w.resolve()
+
+
+RESOURCE_BASED = {"mode": "resource_based", "target_cpu_usage": 0.8, "target_memory_usage": 0.8}
+
+
+def test_resource_based_tuner_needs_maximum_slots() -> None:
+    with pytest.raises(ValueError, match="maximum_slots"):
+        resolved({"tuner": RESOURCE_BASED})
+    w = resolved({"tuner": {**RESOURCE_BASED, "activity": {"maximum_slots": 40}}})
+    assert w.max_activity_slots == 40
+    # the pool is sized explicitly, or not a thread pool
+    resolved({"tuner": RESOURCE_BASED, "activity_executor_workers": 8})
+    resolved({"tuner": RESOURCE_BASED, "activity_executor": "process"})
@@ -0,0 +1,79 @@
+import json
+import uuid
+
+import pytest
+from temporalio.client import WorkflowHistory
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Replayer, Worker
+from temporalio.workflow import NondeterminismError
+
+from tests.fanout_workflows import FanOutJob, FanOutWorkflow, SerialFanOutWorkflow, double
+from tests.history_recorder import history_path, record_runs
+
+RECORDED = ["fanout_window", "fanout_continue_as_new_1", "fanout_continue_as_new_2"]
+
+
+def load_history(name: str) -> WorkflowHistory:
+    return WorkflowHistory.from_json(name, history_path(name).read_text())
+
+
+def started_input(history: WorkflowHistory) -> dict:
+    return json.loads(history.events[0].workflow_execution_started_event_attributes.input.payloads[0].data)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", RECORDED)
+async def test_replay_recorded_history(name: str) -> None:
+    await Replayer(workflows=[FanOutWorkflow]).replay_workflow(load_history(name))
+
+
+@pytest.mark.asyncio
+async def test_replay_across_continue_as_new() -> None:
+    first, second = load_history("fanout_continue_as_new_1"), load_history("fanout_continue_as_new_2")
+    assert first.events[-1].HasField("workflow_execution_continued_as_new_event_attributes")
+    assert started_input(first)["state"] is None
+    state = started_input(second)["state"]
+    assert state["cursor"] == 9
+    assert state["runs"] == 2
+    for history in (first, second):
+        await Replayer(workflows=[FanOutWorkflow]).replay_workflow(history)
+
+
+@pytest.mark.asyncio
+async def test_replay_detects_a_narrower_window() -> None:
+    with pytest.raises(NondeterminismError):
+        await Replayer(workflows=[SerialFanOutWorkflow]).replay_workflow(load_history("fanout_window"))
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay_in_order_completions() -> None:
+    runs = await record_runs(
+        FanOutWorkflow,
+        FanOutJob(count=10, window=2, max_history_length=30),
+        activity=lambda item: item * 2,
+        completions=lambda _step, pending: [pending[0]],
+    )
+    assert len(runs) > 1
+    assert runs[-1].result == 90
+    for run in runs:
+        await Replayer(workflows=[FanOutWorkflow]).replay_workflow(run.history())
+
+
+@pytest.mark.asyncio
+async def test_time_skipping_run_replays() -> None:
+    try:
+        env = await WorkflowEnvironment.start_time_skipping()
+    except RuntimeError as exc:
+        pytest.skip(f"Temporal test server unavailable: {exc}")
+    async with env:
+        async with Worker(env.client, task_queue="fanout", workflows=[FanOutWorkflow], activities=[double]):
+            handle = await env.client.start_workflow(
+                FanOutWorkflow.run,
+                FanOutJob(count=12, window=3, max_history_length=40),
+                id=f"fanout-{uuid.uuid4()}",
+                task_queue="fanout",
+            )
+            assert await handle.result() == 132
+            history = await handle.fetch_history()
+        assert started_input(history)["state"]["cursor"] > 0
+        await Replayer(workflows=[FanOutWorkflow]).replay_workflow(history)
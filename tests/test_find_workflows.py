@@ -0,0 +1,146 @@
+import re
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from temporalio.client import WorkflowExecutionStatus
+from temporalio.service import RPCError, RPCStatusCode
+from temporalloop import utils
+from temporalloop.utils import WorkflowLookup, WorkflowLookupCache, find_workflows
+
+WORKFLOW = "tests.fanout_workflows:FanOutWorkflow"
+RUNNING = WorkflowExecutionStatus.RUNNING
+COMPLETED = WorkflowExecutionStatus.COMPLETED
+QUOTED = re.compile(r"'([^']*)'")
+
+
+class FakeHandle:
+    def __init__(self, client: "FakeClient", wid: str) -> None:
+        self.client = client
+        self.id = wid
+
+    async def describe(self) -> SimpleNamespace:
+        self.client.described.append(self.id)
+        if self.id not in self.client.runs:
+            raise RPCError("workflow not found", RPCStatusCode.NOT_FOUND, b"")
+        return SimpleNamespace(status=self.client.runs[self.id][-1])
+
+
+class FakeClient:
+    """`runs`: statuses of the runs of each id, oldest first"""
+
+    def __init__(
+        self,
+        runs: dict[str, list[WorkflowExecutionStatus]],
+        *,
+        namespace: str = "default",
+        invisible: set[str] = frozenset(),  # type: ignore[assignment]
+        reject: RPCStatusCode | None = None,
+    ) -> None:
+        self.runs = runs
+        self.namespace = namespace
+        self.invisible = invisible
+        self.reject = reject
+        self.queries: list[str] = []
+        self.described: list[str] = []
+
+    async def list_workflows(self, query: str):
+        self.queries.append(query)
+        if self.reject is not None:
+            raise RPCError("unsupported query", self.reject, b"")
+        start = datetime(2026, 1, 1, tzinfo=UTC)
+        for wid in QUOTED.findall(query):
+            if wid in self.invisible:
+                continue
+            # newest run first, as visibility returns them
+            for index, status in reversed(list(enumerate(self.runs.get(wid, [])))):
+                yield SimpleNamespace(id=wid, start_time=start + timedelta(minutes=index), status=status)
+
+    def get_workflow_handle_for(self, _run, wid: str) -> FakeHandle:
+        return FakeHandle(self, wid)
+
+
+@pytest.fixture(autouse=True)
+def fixture_no_list_query(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(utils, "_NO_LIST_QUERY", set())
+
+
+def statuses(result: dict[str, WorkflowLookup]) -> dict[str, WorkflowExecutionStatus | None]:
+    return {wid: lookup.status for wid, lookup in result.items()}
+
+
+@pytest.mark.asyncio
+async def test_batched_list_queries() -> None:
+    runs = {f"wf-{i}": [RUNNING] for i in range(5)}
+    runs["wf-0"] = [COMPLETED, RUNNING]
+    client = FakeClient(runs)
+    result = await find_workflows(client, [*runs, "wf-0", "unknown"], WORKFLOW, batch_size=2, cache=None)  # type: ignore[arg-type]
+    assert client.queries == [
+        "WorkflowId IN ('wf-0', 'wf-1')",
+        "WorkflowId IN ('wf-2', 'wf-3')",
+        "WorkflowId IN ('wf-4', 'unknown')",
+    ]
+    # latest run of each id, the id absent from visibility is described
+    assert statuses(result) == {**dict.fromkeys(runs, RUNNING), "unknown": None}
+    assert result["unknown"].handle is None
+    assert client.described == ["unknown"]
+
+
+@pytest.mark.asyncio
+async def test_quoted_ids_are_described() -> None:
+    runs = {"it's": [RUNNING], "back\\slash": [COMPLETED], "plain": [RUNNING]}
+    client = FakeClient(runs)
+    result = await find_workflows(client, runs, WORKFLOW, cache=None)  # type: ignore[arg-type]
+    assert client.queries == ["WorkflowId IN ('plain')"]
+    assert sorted(client.described) == sorted(["it's", "back\\slash"])
+    assert statuses(result) == {"it's": RUNNING, "back\\slash": COMPLETED, "plain": RUNNING}
+
+
+@pytest.mark.asyncio
+async def test_not_yet_visible_ids_are_described() -> None:
+    client = FakeClient({"a": [RUNNING], "b": [RUNNING]}, invisible={"b"})
+    result = await find_workflows(client, ["a", "b"], WORKFLOW, cache=None)  # type: ignore[arg-type]
+    assert client.described == ["b"]
+    assert statuses(result) == {"a": RUNNING, "b": RUNNING}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [RPCStatusCode.INVALID_ARGUMENT, RPCStatusCode.UNIMPLEMENTED])
+async def test_fallback_when_the_query_is_rejected(status: RPCStatusCode) -> None:
+    client = FakeClient({"a": [RUNNING], "b": [COMPLETED]}, namespace="standard", reject=status)
+    result = await find_workflows(client, ["a", "b", "c"], WORKFLOW, cache=None)  # type: ignore[arg-type]
+    assert statuses(result) == {"a": RUNNING, "b": COMPLETED, "c": None}
+    assert sorted(client.described) == ["a", "b", "c"]
+    # the namespace is not queried again
+    await find_workflows(client, ["a"], WORKFLOW, cache=None)  # type: ignore[arg-type]
+    assert len(client.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_other_list_errors_are_raised() -> None:
+    client = FakeClient({"a": [RUNNING]}, reject=RPCStatusCode.UNAVAILABLE)
+    with pytest.raises(RPCError):
+        await find_workflows(client, ["a"], WORKFLOW, cache=None)  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_cache_rebinds_handles_and_skips_misses() -> None:
+    cache = WorkflowLookupCache(ttl=60)
+    first = FakeClient({"a": [RUNNING]})
+    await find_workflows(first, ["a", "b"], WORKFLOW, cache=cache)  # type: ignore[arg-type]
+    second = FakeClient({"a": [RUNNING], "b": [RUNNING]})
+    result = await find_workflows(second, ["a", "b"], WORKFLOW, cache=cache)  # type: ignore[arg-type]
+    # "a" from the cache, with a handle of the current client; the miss "b" looked up again
+    assert second.queries == ["WorkflowId IN ('b')"]
+    assert result["a"].handle.client is second  # type: ignore[union-attr]
+    assert statuses(result) == {"a": RUNNING, "b": RUNNING}
+
+
+@pytest.mark.asyncio
+async def test_cache_misses_with_miss_ttl() -> None:
+    cache = WorkflowLookupCache(ttl=60, miss_ttl=60)
+    await find_workflows(FakeClient({}), ["a"], WORKFLOW, cache=cache)  # type: ignore[arg-type]
+    client = FakeClient({"a": [RUNNING]})
+    result = await find_workflows(client, ["a"], WORKFLOW, cache=cache)  # type: ignore[arg-type]
+    assert not client.queries
+    assert result["a"].handle is None
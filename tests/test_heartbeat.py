@@ -0,0 +1,105 @@
+import asyncio
+import dataclasses
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel, ValidationError
+from temporalio import activity
+from temporalio.exceptions import CancelledError
+from temporalio.testing import ActivityEnvironment
+from temporalloop import utils
+from temporalloop.utils import HeartbeatCheckpoint, heartbeat_checkpoint
+
+
+class Cursor(BaseModel):
+    page: int
+    token: str
+
+
+@pytest.fixture(name="env")
+def fixture_env() -> ActivityEnvironment:
+    env = ActivityEnvironment()
+    env.heartbeats = []  # type: ignore[attr-defined]
+    env.on_heartbeat = lambda *details: env.heartbeats.append(details)  # type: ignore[attr-defined]
+    return env
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(utils, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_updates_are_throttled_and_coalesced(env: ActivityEnvironment, clock: SimpleNamespace) -> None:
+    def process() -> HeartbeatCheckpoint:
+        checkpoint = HeartbeatCheckpoint(interval=10, default=0)
+        for index in range(1, 26):
+            clock.now = index
+            checkpoint.update(index)
+        return checkpoint
+
+    checkpoint = env.run(process)
+    assert env.heartbeats == [(10,), (20,)]  # type: ignore[attr-defined]
+    assert checkpoint.dirty
+    assert checkpoint.cursor == 25
+
+
+def test_interval_within_heartbeat_timeout(env: ActivityEnvironment) -> None:
+    env.info = dataclasses.replace(env.info, heartbeat_timeout=timedelta(seconds=4))
+    assert env.run(lambda: HeartbeatCheckpoint(interval=30).interval) == 2
+
+
+def test_resume_from_heartbeat_details(env: ActivityEnvironment) -> None:
+    assert not env.run(lambda: HeartbeatCheckpoint(default=0).resumed)
+    env.info = dataclasses.replace(env.info, heartbeat_details=[{"page": "3", "token": "abc"}])
+    checkpoint = env.run(lambda: HeartbeatCheckpoint(default=None, cursor_type=Cursor))
+    assert checkpoint.resumed
+    assert checkpoint.cursor == Cursor(page=3, token="abc")
+
+
+def test_resume_validates_cursor_type(env: ActivityEnvironment) -> None:
+    env.info = dataclasses.replace(env.info, heartbeat_details=["not a number"])
+    with pytest.raises(ValidationError):
+        env.run(lambda: HeartbeatCheckpoint(cursor_type=int))
+
+
+@pytest.mark.asyncio
+async def test_last_cursor_flushed_on_exit(env: ActivityEnvironment) -> None:
+    async def process(fail: bool) -> None:
+        async with heartbeat_checkpoint(interval=60, default=0) as checkpoint:
+            checkpoint.update(3)
+            checkpoint.update(4)
+            if fail:
+                raise RuntimeError("boom")
+
+    await env.run(process, False)
+    with pytest.raises(RuntimeError, match="boom"):
+        await env.run(process, True)
+    assert env.heartbeats == [(4,), (4,)]  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_keepalive_while_the_cursor_does_not_move(env: ActivityEnvironment) -> None:
+    async def process() -> None:
+        async with heartbeat_checkpoint(interval=0.01, default=0):
+            await asyncio.sleep(0.1)
+
+    await env.run(process)
+    assert len(env.heartbeats) >= 3  # type: ignore[attr-defined]
+    assert set(env.heartbeats) == {(0,)}  # type: ignore[attr-defined]
+
+
+def test_cancelled_update_raises_before_recording(env: ActivityEnvironment) -> None:
+    @activity.defn(no_thread_cancel_exception=True)
+    def process() -> HeartbeatCheckpoint:
+        checkpoint = HeartbeatCheckpoint(interval=60, default=0)
+        checkpoint.update(1)
+        env.cancel()
+        with pytest.raises(CancelledError):
+            checkpoint.update(2)
+        return checkpoint
+
+    checkpoint = env.run(process)
+    assert checkpoint.cursor == 1
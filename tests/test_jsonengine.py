@@ -0,0 +1,101 @@
+import dataclasses
+import datetime
+import json
+import math
+import uuid
+
+import pytest
+from temporalloop.converters.jsonengine import JSON_ENGINES, JSONEngine, get_json_engine
+from temporalloop.converters.pydantic import PydanticJSONPayloadConverter
+
+
+def engines() -> list[JSONEngine]:
+    found = []
+    for engine_class in JSON_ENGINES.values():
+        try:
+            found.append(engine_class())
+        except ImportError:
+            continue
+    return found
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: float
+
+
+VALUES = [
+    {"b": 1, "a": [1, 2.5, None, True], "c": {"z": "x", "y": ""}},
+    "é, ü: 中文 \u2028 😀",
+    [1e16, 1e-7, 0.1, -0.0, 123456789.123456789],
+    2**63 - 1,
+    2**70,
+    -(2**64),
+    {1: "int key", "2": "str key"},
+    [float("inf"), float("-inf")],
+    {"nested": [[[{"deep": [1, [2, [3]]]}]]]},
+]
+UNKNOWN = [
+    datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.UTC),
+    uuid.UUID(int=7),
+    Point(1, 2.5),
+]
+
+
+@pytest.mark.parametrize("engine", engines(), ids=lambda e: e.name)
+@pytest.mark.parametrize("value", VALUES)
+def test_dumps_matches_stdlib(engine: JSONEngine, value) -> None:
+    assert engine.dumps(value) == json.dumps(value).encode()
+
+
+@pytest.mark.parametrize("engine", engines(), ids=lambda e: e.name)
+def test_dumps_nan(engine: JSONEngine) -> None:
+    assert engine.dumps([math.nan]) == b"[NaN]"
+
+
+@pytest.mark.parametrize("engine", engines(), ids=lambda e: e.name)
+@pytest.mark.parametrize("value", UNKNOWN, ids=lambda v: type(v).__name__)
+def test_dumps_unknown_values_identical(engine: JSONEngine, value) -> None:
+    assert engine.dumps(value) == JSON_ENGINES["json"]().dumps(value)
+
+
+@pytest.mark.parametrize("engine", engines(), ids=lambda e: e.name)
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'{"b": 1, "a": [1, 2.5, null, true]}',
+        b'"\\u00e9\\ud83d\\ude00"',
+        b"[NaN, Infinity, -Infinity]",
+        b"[1180591620717411303424, -18446744073709551616, 9223372036854775807]",
+        b'{"big": 12345678901234567890123}',
+        b"1e400",
+        b'"12345678901234567890123"',
+    ],
+)
+def test_loads_matches_stdlib(engine: JSONEngine, data: bytes) -> None:
+    expected = json.loads(data)
+    result = engine.loads(data)
+    assert repr(result) == repr(expected)
+    assert type(result) is type(expected)
+
+
+@pytest.mark.parametrize("engine", engines(), ids=lambda e: e.name)
+def test_loads_invalid(engine: JSONEngine) -> None:
+    with pytest.raises(ValueError):
+        engine.loads(b"{not json")
+
+
+@pytest.mark.parametrize("engine", engines(), ids=lambda e: e.name)
+@pytest.mark.parametrize("value", VALUES)
+def test_payload_bytes_identical_to_baseline(engine: JSONEngine, value) -> None:
+    converter = PydanticJSONPayloadConverter(engine)
+    payload = converter.to_payload(value)
+    assert payload is not None
+    assert payload.data == json.dumps(value).encode()
+    assert repr(converter.from_payload(payload)) == repr(json.loads(json.dumps(value)))
+
+
+def test_unknown_engine() -> None:
+    with pytest.raises(ValueError, match="Unknown JSON engine"):
+        get_json_engine("simdjson")
@@ -0,0 +1,82 @@
+import asyncio
+import signal
+from types import SimpleNamespace
+
+import pytest
+from temporalloop.client import LOCAL_WORKERS
+from temporalloop.worker import Looper
+
+
+class FakeWorker:
+    def __init__(self, queue: str) -> None:
+        self.stopped = asyncio.Event()
+        self.ran = False
+        self.client = SimpleNamespace(namespace="default")
+        LOCAL_WORKERS.register(self.client, queue)  # type: ignore[arg-type]
+
+    async def run(self) -> None:
+        self.ran = True
+        await self.stopped.wait()
+
+    async def shutdown(self) -> None:
+        self.stopped.set()
+
+
+class FakeFactory:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.inflight = None
+
+    async def new_worker(self, worker_config) -> FakeWorker:
+        await asyncio.sleep(self.delay)
+        return FakeWorker(worker_config.queue)
+
+
+def fake_config(*delays: float) -> SimpleNamespace:
+    workers = [
+        SimpleNamespace(name=f"w{i}", queue=f"q{i}", converter=None, factory=lambda _config, d=d: FakeFactory(d))
+        for i, d in enumerate(delays)
+    ]
+    return SimpleNamespace(loaded=True, workers=workers, drain_deadline=5)
+
+
+def looper(config: SimpleNamespace, monkeypatch: pytest.MonkeyPatch) -> Looper:
+    monkeypatch.setattr(Looper, "install_signal_handlers", lambda _self: None)
+    return Looper(config)  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("at", [0, 0.02], ids=["no-worker-built", "partly-built"])
+async def test_signal_during_startup(monkeypatch: pytest.MonkeyPatch, at: float) -> None:
+    loop = looper(fake_config(0.01, 0.05), monkeypatch)
+    run = asyncio.create_task(loop.run())
+    await asyncio.sleep(at)
+    loop.handle_exit(signal.SIGTERM, None)
+    await asyncio.wait_for(run, 1)
+    assert loop._drain_task is not None and loop._drain_task.done()
+    assert loop._drain_task.exception() is None
+    assert not any(worker.ran for worker, _ in loop.workers)
+
+
+@pytest.mark.asyncio
+async def test_signal_while_running_drains(monkeypatch: pytest.MonkeyPatch) -> None:
+    loop = looper(fake_config(0, 0.01), monkeypatch)
+    run = asyncio.create_task(loop.run())
+    await asyncio.sleep(0.05)
+    assert all(worker.ran for worker, _ in loop.workers)
+    loop.handle_exit(signal.SIGINT, None)
+    await asyncio.wait_for(run, 1)
+    assert all(worker.stopped.is_set() for worker, _ in loop.workers)
+    assert {config.name for _, config in loop.workers} == {"w0", "w1"}
+
+
+@pytest.mark.asyncio
+async def test_stopped_workers_are_unregistered(monkeypatch: pytest.MonkeyPatch) -> None:
+    loop = looper(fake_config(0, 0.01), monkeypatch)
+    run = asyncio.create_task(loop.run())
+    await asyncio.sleep(0.05)
+    assert all(LOCAL_WORKERS.client_for("default", config.queue) is w.client for w, config in loop.workers)
+    loop.handle_exit(signal.SIGTERM, None)
+    await asyncio.wait_for(run, 1)
+    assert LOCAL_WORKERS.client_for("default", "q0") is None
+    assert LOCAL_WORKERS.client_for("default", "q1") is None
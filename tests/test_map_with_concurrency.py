@@ -0,0 +1,101 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+from temporalloop.utils import map_with_concurrency
+
+
+class Calls:
+    """Record the calls in flight, the cancelled ones and the failures"""
+
+    def __init__(self, fail: int | None = None, block: bool = False) -> None:
+        self.fail = fail
+        self.block = block
+        self.running = self.max_running = 0
+        self.cancelled: list[int] = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, item: int) -> int:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            if item == self.fail:
+                raise ValueError(item)
+            if self.block and item:
+                await self.release.wait()
+            await asyncio.sleep(item / 100)
+            return item
+        except asyncio.CancelledError:
+            self.cancelled.append(item)
+            raise
+        finally:
+            self.running -= 1
+
+
+async def collect(*args, **kw) -> list:
+    return [r async for r in map_with_concurrency(*args, **kw)]
+
+
+@pytest.mark.asyncio
+async def test_ordered_and_unordered_results() -> None:
+    calls = Calls()
+    assert await collect(calls, [3, 2, 1, 0], 4) == [3, 2, 1, 0]
+    assert await collect(calls, [3, 2, 1, 0], 4, ordered=False) == [0, 1, 2, 3]
+    assert await collect(calls, range(10), 2) == list(range(10))
+    assert calls.max_running == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_for_async_sources() -> None:
+    async def source():
+        for i in range(6):
+            yield i
+
+    calls = Calls()
+    assert await collect(calls, source(), 2, ordered=False) == list(range(6))
+    assert calls.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_fail_fast_cancels_the_calls_in_flight() -> None:
+    calls = Calls(fail=0, block=True)
+    with pytest.raises(ValueError):
+        await collect(calls, [1, 2, 0], 3)
+    assert sorted(calls.cancelled) == [1, 2]
+    assert calls.running == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_yielded_without_fail_fast() -> None:
+    results = await collect(Calls(fail=2), [1, 2, 3], 3, fail_fast=False)
+    assert results[0] == 1 and results[2] == 3
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_timeout() -> None:
+    calls = Calls(block=True)
+    results = await collect(calls, [0, 1], 2, fail_fast=False, timeout=0.05)
+    assert results[0] == 0
+    assert isinstance(results[1], TimeoutError)
+    with pytest.raises(TimeoutError):
+        await collect(calls, [1], timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_early_break_cancels_the_pending_calls() -> None:
+    pulled: list[int] = []
+
+    def source():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    calls = Calls(block=True)
+    async with aclosing(map_with_concurrency(calls, source(), 3)) as results:
+        async for result in results:
+            assert result == 0
+            break
+    assert sorted(calls.cancelled) == [1, 2]
+    assert calls.running == 0
+    assert pulled == [0, 1, 2]
@@ -0,0 +1,58 @@
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+from temporalio.converter import DataConverter
+from temporalloop.converters.binary import MSGPACK_ENCODING, msgpack_encoded
+from temporalloop.converters.pydantic import pydantic_data_converter, pydantic_msgpack_data_converter
+
+pytest.importorskip("msgpack")
+
+
+class Series(BaseModel):
+    name: str
+    values: list[float]
+
+
+@msgpack_encoded
+class PackedSeries(Series):
+    pass
+
+
+async def encoding(converter: DataConverter, value: Any) -> bytes:
+    return (await converter.encode([value]))[0].metadata["encoding"]
+
+
+async def round_trip(converter: DataConverter, value: Any, hint: Any) -> Any:
+    payloads = await converter.encode([value])
+    return (await converter.decode(payloads, [hint]))[0]
+
+
+@pytest.mark.asyncio
+async def test_marked_models_are_packed() -> None:
+    packed = PackedSeries(name="a", values=[1.5, 2.0])
+    assert await encoding(pydantic_data_converter, packed) == MSGPACK_ENCODING.encode()
+    assert await round_trip(pydantic_data_converter, packed, PackedSeries) == packed
+    # unmarked models and other values stay JSON
+    assert await encoding(pydantic_data_converter, Series(name="a", values=[])) == b"json/plain"
+    assert await encoding(pydantic_data_converter, {"a": 1}) == b"json/plain"
+
+
+@pytest.mark.asyncio
+async def test_msgpack_converter_packs_all_models() -> None:
+    series = Series(name="a", values=[1.5, 2.0])
+    assert await encoding(pydantic_msgpack_data_converter, series) == MSGPACK_ENCODING.encode()
+    assert await round_trip(pydantic_msgpack_data_converter, series, Series) == series
+    assert await round_trip(pydantic_msgpack_data_converter, [series], list[Series]) == [series]
+    assert await encoding(pydantic_msgpack_data_converter, {"a": 1}) == b"json/plain"
+
+
+@pytest.mark.asyncio
+async def test_json_payloads_still_decode() -> None:
+    series = Series(name="a", values=[1.5, 2.0])
+    payloads = await pydantic_data_converter.encode([series])
+    assert payloads[0].metadata["encoding"] == b"json/plain"
+    assert (await pydantic_msgpack_data_converter.decode(payloads, [Series]))[0] == series
+    assert (await pydantic_msgpack_data_converter.decode(payloads, [PackedSeries]))[0] == PackedSeries(
+        name="a", values=[1.5, 2.0]
+    )
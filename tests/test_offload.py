@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+from temporalio.api.common.v1 import Payload
+from temporalloop.converters.compression import CompressionCodec
+
+
+class RecordingCodec(CompressionCodec):
+    """zlib codec recording the thread of each payload, by size"""
+
+    def __init__(self, offload_threshold: int | None) -> None:
+        super().__init__("zlib", threshold=0, offload_threshold=offload_threshold)
+        self.threads: dict[int, str] = {}
+
+    def encode_payload(self, payload: Payload) -> Payload:
+        self.threads[len(payload.data)] = threading.current_thread().name
+        return super().encode_payload(payload)
+
+    def decode_payload(self, payload: Payload) -> Payload:
+        self.threads[len(payload.data)] = threading.current_thread().name
+        return super().decode_payload(payload)
+
+
+def payloads(*sizes: int) -> list[Payload]:
+    return [Payload(metadata={"encoding": b"json/plain"}, data=b"1" * size) for size in sizes]
+
+
+@pytest.mark.asyncio
+async def test_payloads_from_the_threshold_are_offloaded() -> None:
+    codec = RecordingCodec(offload_threshold=1000)
+    encoded = await codec.encode(payloads(999, 1000, 5000))
+    main = threading.current_thread().name
+    assert codec.threads[999] == main
+    assert codec.threads[1000].startswith("temporalloop-codec")
+    assert codec.threads[5000].startswith("temporalloop-codec")
+    assert [p.metadata["encoding"] for p in encoded] == [b"binary/zlib"] * 3
+
+
+@pytest.mark.asyncio
+async def test_offloading_does_not_change_the_payloads() -> None:
+    inline = RecordingCodec(offload_threshold=None)
+    offloaded = RecordingCodec(offload_threshold=1)
+    original = payloads(10, 2000, 50_000)
+    encoded = await inline.encode(original)
+    assert await offloaded.encode(original) == encoded
+    assert set(inline.threads.values()) == {threading.current_thread().name}
+    assert all(t.startswith("temporalloop-codec") for t in offloaded.threads.values())
+    assert await offloaded.decode(encoded) == original
+    assert await inline.decode(encoded) == original
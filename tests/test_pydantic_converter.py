@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+import pytest
+from pydantic import BaseModel
+from temporalloop.converters.pydantic import pydantic_data_converter
+
+
+class Model(BaseModel):
+    name: str
+    at: datetime
+
+
+@dataclass
+class Holder:
+    model: Model
+    count: int
+
+
+MODEL = Model(name="a", at=datetime(2026, 1, 5, 12, tzinfo=UTC))
+
+
+async def round_trip(value: Any, hint: Any) -> Any:
+    payloads = await pydantic_data_converter.encode([value])
+    assert payloads[0].metadata["encoding"] == (b"binary/null" if value is None else b"json/plain")
+    return (await pydantic_data_converter.decode(payloads, [hint]))[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("value", "hint"),
+    [
+        (MODEL, Model),
+        ([MODEL, MODEL.model_copy(update={"name": "b"})], list[Model]),
+        ({"a": MODEL}, dict[str, Model]),
+        (MODEL, Optional[Model]),  # noqa: UP045
+        (None, Optional[Model]),  # noqa: UP045
+        (MODEL, Model | None),
+        (Holder(MODEL, 2), Holder),
+        ([Holder(MODEL, 2)], list[Holder]),
+    ],
+)
+async def test_pydantic_values_round_trip(value: Any, hint: Any) -> None:
+    assert await round_trip(value, hint) == value
+
+
+@pytest.mark.asyncio
+async def test_plain_values_round_trip() -> None:
+    assert await round_trip({"a": [1, 2]}, dict[str, list[int]]) == {"a": [1, 2]}
+    assert await round_trip([MODEL], None) == [MODEL.model_dump(mode="json")]
@@ -0,0 +1,107 @@
+from dataclasses import replace
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any
+
+from temporalio.client import (
+    ScheduleCalendarSpec,
+    ScheduleIntervalSpec,
+    ScheduleListActionStartWorkflow,
+    ScheduleListSchedule,
+    ScheduleListState,
+    ScheduleRange,
+)
+from temporalloop.config_loader import TemporalScheduleSchema
+from temporalloop.schedule import TemporalScheduler
+
+
+def scheduler(**kw: Any) -> TemporalScheduler:
+    schedule = TemporalScheduleSchema(
+        **{"workflow_id": "fanout", "workflow": "tests.fanout_workflows:FanOutWorkflow", "interval": {"every": "1h"}}
+        | kw
+    )
+    return TemporalScheduler(None, {"fanout": schedule})
+
+
+def listed(sch: TemporalScheduler, *, paused: bool = False, note: str | None = None, **kw: Any) -> SimpleNamespace:
+    """The schedule as list_schedules returns it, once created from its definition"""
+    definition = sch.schedules["fanout"]
+    assert definition.schedule is not None
+    schedule = ScheduleListSchedule(
+        action=ScheduleListActionStartWorkflow(workflow=kw.pop("workflow", "FanOutWorkflow")),
+        spec=replace(definition.schedule.spec, **kw),
+        state=ScheduleListState(note=definition.note if note is None else note, paused=paused),
+    )
+    return SimpleNamespace(id="fanout", schedule=schedule)
+
+
+def action(sch: TemporalScheduler, live: SimpleNamespace | None) -> tuple[str, str]:
+    item = sch.plan({"fanout": live} if live else {}).items[0]  # type: ignore[dict-item]
+    return item.action, item.reason
+
+
+def test_plan_creates_absent_schedules() -> None:
+    assert action(scheduler(), None) == ("create", "absent")
+    assert action(scheduler(state="paused"), None) == ("create", "absent")
+
+
+def test_plan_keeps_up_to_date_schedules() -> None:
+    sch = scheduler()
+    assert action(sch, listed(sch)) == ("noop", "up to date")
+    paused = scheduler(state="paused")
+    assert action(paused, listed(paused, paused=True)) == ("noop", "up to date")
+
+
+def test_plan_updates_changed_definitions() -> None:
+    sch = scheduler()
+    assert action(sch, listed(sch, note="[temporalloop:0123456789abcdef]")) == ("update", "definition changed")
+    assert action(sch, listed(sch, note="")) == ("update", "definition changed")
+
+
+def test_plan_updates_schedules_edited_outside_of_the_config() -> None:
+    sch = scheduler()
+    intervals = [ScheduleIntervalSpec(every=timedelta(minutes=5))]
+    assert action(sch, listed(sch, intervals=intervals)) == ("update", "spec changed")
+    assert action(sch, listed(sch, jitter=timedelta(minutes=1))) == ("update", "spec changed")
+    assert action(sch, listed(sch, workflow="OtherWorkflow")) == ("update", "workflow changed")
+
+
+def test_plan_compares_crons_with_the_listed_calendars() -> None:
+    sch = scheduler(interval=None, cron=["0 3 * * MON-FRI"])
+    # the server lists the cron expressions as calendars, a missing offset as zero
+    calendar = ScheduleCalendarSpec(
+        second=[ScheduleRange(0)],
+        minute=[ScheduleRange(0)],
+        hour=[ScheduleRange(3)],
+        day_of_month=[ScheduleRange(1, 31)],
+        month=[ScheduleRange(1, 12)],
+        day_of_week=[ScheduleRange(1, 5)],
+    )
+    assert action(sch, listed(sch, cron_expressions=[], calendars=[calendar])) == ("noop", "up to date")
+    weekend = replace(calendar, day_of_week=[ScheduleRange(0), ScheduleRange(6)])
+    assert action(sch, listed(sch, cron_expressions=[], calendars=[weekend])) == ("update", "spec changed")
+    offset = scheduler(interval={"every": "1h", "offset": "0s"})
+    assert action(offset, listed(offset, intervals=[ScheduleIntervalSpec(every=timedelta(hours=1))])) == (
+        "noop",
+        "up to date",
+    )
+
+
+def test_plan_pauses_and_unpauses() -> None:
+    paused = scheduler(state="paused")
+    assert action(paused, listed(paused)) == ("pause", "state changed")
+    sch = scheduler()
+    assert action(sch, listed(sch, paused=True)) == ("unpause", "state changed")
+
+
+def test_plan_deletes_listed_schedules() -> None:
+    sch = scheduler()
+    live = listed(sch)
+    deleted = scheduler(state="deleted")
+    assert action(deleted, live) == ("delete", "deleted in the config")
+    assert action(deleted, None) == ("noop", "absent")
+
+
+def test_plan_updates_schedules_listed_without_details() -> None:
+    sch = scheduler()
+    assert action(sch, SimpleNamespace(id="fanout", schedule=None)) == ("update", "no listed details")
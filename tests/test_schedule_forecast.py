@@ -0,0 +1,60 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from temporalloop.config import Config
+from temporalloop.config_loader import TemporalScheduleSchema
+from temporalloop.schedule_forecast import CronExpression, forecast, schedule_starts
+
+START = datetime(2026, 1, 5, tzinfo=UTC)  # a Monday
+
+
+def schedule(**kwargs) -> TemporalScheduleSchema:
+    return TemporalScheduleSchema(workflow_id="wf", workflow="module:Workflow", task_queue="q", **kwargs)
+
+
+def test_interval_starts() -> None:
+    starts = schedule_starts(schedule(interval={"every": "15m", "offset": "5m"}), START, START + timedelta(hours=1))
+    assert [s.minute for s in starts] == [5, 20, 35, 50]
+
+
+def test_cron_in_time_zone() -> None:
+    starts = schedule_starts(
+        schedule(cron=["0 9 * * MON-FRI"], time_zone="Europe/Paris"), START, START + timedelta(days=7)
+    )
+    assert len(starts) == 5
+    assert {s.hour for s in starts} == {8}
+
+
+def test_cron_day_fields_are_both_required() -> None:
+    # Temporal ANDs day of month and day of week: the 1st of the month falling on a Monday
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    starts = schedule_starts(schedule(cron=["0 3 1 * MON"]), start, datetime(2025, 1, 1, tzinfo=UTC))
+    assert [(s.month, s.day, s.hour) for s in starts] == [(1, 1, 3), (4, 1, 3), (7, 1, 3)]
+
+
+def test_cron_aliases_and_ranges() -> None:
+    cron = CronExpression("@hourly")
+    assert cron.match(START) and not cron.match(START + timedelta(minutes=1))
+    with pytest.raises(ValueError, match="expected 5 fields"):
+        CronExpression("* * *")
+
+
+@pytest.mark.parametrize(
+    ("invalid", "reason"),
+    [
+        ({"interval": {"every": "0s"}}, "must be positive"),
+        ({"cron": ["0 3 * * *"], "time_zone": "Mars/Olympus_Mons"}, "Unknown time zone"),
+        ({"cron": ["61 * * * *"]}, "Invalid cron field"),
+    ],
+)
+def test_invalid_schedules_are_skipped(invalid: dict, reason: str) -> None:
+    config = Config(
+        config_logging=False,
+        workers=[{"name": "w", "queue": "q", "max_concurrent_activities": 5}],
+        schedules={"bad": schedule(**invalid), "good": schedule(interval={"every": "1h"})},
+    )
+    result = forecast(config, timedelta(hours=2), start=START)
+    assert reason in result.skipped["bad"]
+    assert result.queues["q"].schedules == 1
+    assert result.queues["q"].starts == 2
+    assert not result.issues
@@ -0,0 +1,79 @@
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+from temporalloop.importer import ImportFromStringError
+from temporalloop.schedule import SchedulePlan, TemporalScheduler
+from temporalloop.schedule_watch import ScheduleWatcher
+
+VALID = """
+schedules:
+  fanout:
+    workflow_id: fanout
+    workflow: tests.fanout_workflows:FanOutWorkflow
+    interval:
+      every: 1h
+"""
+UNKNOWN_WORKFLOW = VALID.replace("FanOutWorkflow", "MissingWorkflow")
+
+
+class FakeMetric:
+    def __init__(self) -> None:
+        self.values: dict[str, float] = defaultdict(float)
+
+    def add(self, value: float, attributes: dict[str, str]) -> None:
+        self.values[attributes["trigger"]] += value
+
+    record = add
+
+
+class FakeMeter:
+    def create_counter(self, *_args) -> FakeMetric:
+        return FakeMetric()
+
+    create_histogram_float = create_counter
+
+
+@pytest.fixture(name="watcher")
+def fixture_watcher(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ScheduleWatcher:
+    async def sync_schedules(_self) -> SchedulePlan:
+        return SchedulePlan()
+
+    monkeypatch.setattr(TemporalScheduler, "sync_schedules", sync_schedules)
+    path = tmp_path / "schedules.yaml"
+    path.write_text(VALID)
+    return ScheduleWatcher(None, str(path), metric_meter=FakeMeter())  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_invalid_file_keeps_last_valid_definitions(watcher: ScheduleWatcher) -> None:
+    await watcher.tick()
+    assert watcher.keys.keys() == {"fanout"}
+    valid = watcher.schedules
+    Path(watcher.path).write_text(UNKNOWN_WORKFLOW)
+    await watcher.tick()
+    assert watcher.schedules is valid
+    assert watcher.failures is not None
+    assert watcher.failures.values["load"] == 1
+    Path(watcher.path).write_text(VALID.replace("1h", "2h"))
+    assert watcher.read()
+    assert watcher.schedules["fanout"].interval.every == "2h"
+
+
+@pytest.mark.asyncio
+async def test_preparation_error_is_a_failure(watcher: ScheduleWatcher, monkeypatch: pytest.MonkeyPatch) -> None:
+    await watcher.tick()
+
+    def load_workflow(_self, name: str):
+        raise ImportFromStringError(f"cannot import {name}")
+
+    monkeypatch.setattr(TemporalScheduler, "load_workflow", load_workflow)
+    watcher.last_resync = 0
+    await watcher.tick()
+    assert watcher.failures is not None
+    assert watcher.failures.values["resync"] == 1
+    watcher.last_resync = float("inf")
+    watcher.dirty = True
+    watcher.keys.clear()
+    await watcher.tick()
+    assert watcher.failures.values["change"] == 1
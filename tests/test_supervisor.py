@@ -0,0 +1,184 @@
+import asyncio
+import os
+import signal
+import socket
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from temporalloop import supervisor as supervisor_module
+from temporalloop.supervisor import ChildProcess, MetricsAggregator, Supervisor, merge_prometheus, run_child
+
+
+class FakeProcess:
+    def __init__(self) -> None:
+        self.terminated = 0
+
+    def is_alive(self) -> bool:
+        return True
+
+    def terminate(self) -> None:
+        self.terminated += 1
+
+
+def supervisor(children: int = 2) -> Supervisor:
+    sup = Supervisor(SimpleNamespace(workers=[]))  # type: ignore[arg-type]
+    sup.children = [ChildProcess(index=i, process=FakeProcess()) for i in range(children)]  # type: ignore[arg-type]
+    return sup
+
+
+def test_first_signal_lets_the_children_drain() -> None:
+    sup = supervisor()
+    sup.handle_exit(signal.SIGINT, None)
+    assert sup.should_exit
+    # the children are signalled once, by stop()
+    assert all(c.process.terminated == 0 for c in sup.children)  # type: ignore[union-attr]
+
+
+def test_second_signal_is_forwarded() -> None:
+    sup = supervisor()
+    sup.handle_exit(signal.SIGINT, None)
+    sup.handle_exit(signal.SIGINT, None)
+    assert all(c.process.terminated == 1 for c in sup.children)  # type: ignore[union-attr]
+
+
+CHILD_0 = """# HELP temporal_request Client requests
+# TYPE temporal_request counter
+temporal_request{operation="PollActivityTaskQueue"} 3
+temporal_request{operation="StartWorkflowExecution"} 1
+# HELP temporal_activity_execution_latency Activity latencies
+# TYPE temporal_activity_execution_latency histogram
+temporal_activity_execution_latency_bucket{le="100"} 2
+temporal_activity_execution_latency_bucket{le="+Inf"} 3
+temporal_activity_execution_latency_sum 250.5
+temporal_activity_execution_latency_count 3
+"""
+CHILD_1 = """# HELP temporal_request Client requests
+# TYPE temporal_request counter
+temporal_request{operation="PollActivityTaskQueue"} 4
+# HELP temporal_activity_execution_latency Activity latencies
+# TYPE temporal_activity_execution_latency histogram
+temporal_activity_execution_latency_bucket{le="100"} 1
+temporal_activity_execution_latency_bucket{le="+Inf"} 1
+temporal_activity_execution_latency_sum 20
+temporal_activity_execution_latency_count 1
+"""
+
+
+def test_merge_sums_the_series_of_the_children() -> None:
+    merged = merge_prometheus([CHILD_0, CHILD_1])
+    assert merged.splitlines() == [
+        "# HELP temporal_request Client requests",
+        "# TYPE temporal_request counter",
+        'temporal_request{operation="PollActivityTaskQueue"} 7',
+        'temporal_request{operation="StartWorkflowExecution"} 1',
+        "# HELP temporal_activity_execution_latency Activity latencies",
+        "# TYPE temporal_activity_execution_latency histogram",
+        'temporal_activity_execution_latency_bucket{le="100"} 3',
+        'temporal_activity_execution_latency_bucket{le="+Inf"} 4',
+        "temporal_activity_execution_latency_sum 270.5",
+        "temporal_activity_execution_latency_count 4",
+    ]
+
+
+def test_merge_keeps_the_process_label_apart() -> None:
+    texts = [
+        f'# TYPE temporal_request counter\ntemporal_request{{process="{i}",operation="a b}}"}} {i + 1}\n'
+        for i in range(2)
+    ]
+    assert merge_prometheus(texts).splitlines() == [
+        "# TYPE temporal_request counter",
+        'temporal_request{process="0",operation="a b}"} 1',
+        'temporal_request{process="1",operation="a b}"} 2',
+    ]
+
+
+def serve(text: str) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # pylint: disable=invalid-name
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(text.encode())
+
+        def log_message(self, *args) -> None:
+            _ = args
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_aggregator_serves_the_merged_children_metrics() -> None:
+    children = [serve(CHILD_0), serve(CHILD_1)]
+    # a restarting child is skipped
+    closed = ThreadingHTTPServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+    addresses = [f"127.0.0.1:{s.server_address[1]}" for s in [*children, closed]]
+    closed.server_close()
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    aggregator = MetricsAggregator(f"127.0.0.1:{port}", addresses, timeout=1.0)
+    aggregator.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+            assert resp.read().decode() == merge_prometheus([CHILD_0, CHILD_1])
+    finally:
+        aggregator.stop()
+        for server in children:
+            server.shutdown()
+            server.server_close()
+
+
+class ExitedProcess:
+    exitcode = 1
+
+    def close(self) -> None:
+        pass
+
+
+def test_restart_backoff() -> None:
+    sup = Supervisor(SimpleNamespace(workers=[]), max_restart_delay=10.0, stable_uptime=60.0)  # type: ignore[arg-type]
+    child = ChildProcess(index=0)
+    delays = []
+    for _ in range(6):
+        child.process = ExitedProcess()  # type: ignore[assignment]
+        child.started_at = time.monotonic()
+        sup.reap(child)
+        delays.append(child.restart_at - time.monotonic())
+    assert [round(d) for d in delays] == [0, 1, 2, 4, 8, 10]
+    assert child.restarts == 6
+    # a child that ran long enough restarts right away
+    child.process = ExitedProcess()  # type: ignore[assignment]
+    child.started_at = time.monotonic() - 61
+    sup.reap(child)
+    assert child.restart_at <= time.monotonic()
+    assert child.restart_delay == 1.0
+
+
+def test_children_run_the_workers_of_their_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+    started: list[SimpleNamespace] = []
+    monkeypatch.setattr(os, "setpgrp", lambda: None)
+    monkeypatch.setattr(signal, "signal", lambda *_: None)
+    monkeypatch.setattr(supervisor_module, "Looper", lambda config: SimpleNamespace(run=lambda: config))
+    monkeypatch.setattr(asyncio, "run", started.append)
+    workers = [SimpleNamespace(name=name, processes=n, metric_bind_address="") for name, n in [("a", 1), ("b", 3)]]
+
+    def config() -> SimpleNamespace:
+        return SimpleNamespace(
+            workers=[SimpleNamespace(**vars(w)) for w in workers],
+            metric_bind_address="0.0.0.0:9000",
+            enable_metrics=True,
+            process_index=None,
+        )
+
+    sup = Supervisor(config())  # type: ignore[arg-type]
+    for index in range(3):
+        run_child(config(), index, sup.child_metric_address(index))  # type: ignore[arg-type]
+    assert [[w.name for w in c.workers] for c in started] == [["a", "b"], ["b"], ["b"]]
+    assert [c.process_index for c in started] == [0, 1, 2]
+    assert [c.metric_bind_address for c in started] == ["127.0.0.1:9001", "127.0.0.1:9002", "127.0.0.1:9003"]
+    assert all(w.metric_bind_address == c.metric_bind_address for c in started for w in c.workers)
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+from temporalloop.config import Config, WorkerConfig
+from temporalloop.worker import WorkerFactory, new_tuner
+
+RESOURCE_BASED = {"mode": "resource_based", "target_cpu_usage": 0.8, "target_memory_usage": 0.8}
+
+
+def thread_pool_size(**settings) -> int:
+    config = Config(config_logging=False)
+    worker = WorkerConfig(**settings)
+    worker.resolve(config)
+    executor = WorkerFactory(config).activity_executor(worker)
+    try:
+        return executor._max_workers  # type: ignore[attr-defined]
+    finally:
+        executor.shutdown()
+
+
+def test_thread_pool_sized_after_max_concurrent_activities() -> None:
+    assert thread_pool_size(max_concurrent_activities=50) == 51
+    assert thread_pool_size(max_concurrent_activities=2) == 10
+    assert thread_pool_size(activity_executor_workers=4) == 4
+
+
+def test_thread_pool_sized_after_tuner_maximum_slots() -> None:
+    tuner = {**RESOURCE_BASED, "activity": {"maximum_slots": 300}}
+    assert thread_pool_size(tuner=tuner, max_concurrent_activities=50) == 301
+
+
+class FakeGauge:
+    def __init__(self, values: dict) -> None:
+        self.values = values
+
+    def set(self, value: float, attributes: dict[str, str]) -> None:
+        self.values[tuple(attributes.values())] = value
+
+
+def test_resource_based_tuner_defaults_the_targets(monkeypatch: pytest.MonkeyPatch) -> None:
+    # a raw dict, not validated by the schema
+    tuner = {"mode": "resource_based", "activity": {"maximum_slots": 20}}
+    assert new_tuner(tuner) is not None
+    values: dict[tuple[str, ...], float] = {}
+    meter = SimpleNamespace(create_gauge=lambda *_: FakeGauge(values), create_gauge_float=lambda *_: FakeGauge(values))
+    config = Config(config_logging=False)
+    factory = WorkerFactory(config)
+    monkeypatch.setattr(factory, "metric_meter", lambda _: meter)
+    factory.record_slots(SimpleNamespace(tuner=tuner))  # type: ignore[arg-type]
+    assert values == {("cpu",): 0.8, ("memory",): 0.8, ("activity", "max", "resource_based"): 20}